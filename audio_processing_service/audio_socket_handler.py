@@ -10,7 +10,6 @@ import os
 
 if TYPE_CHECKING:
     from .audio_socket_server import AudioSocketServer
-import wave # For saving WAV files
 
 # --- Path Setup ---
 _project_root = Path(__file__).resolve().parent.parent
@@ -21,9 +20,16 @@ if str(_project_root) not in sys.path:
 from config.app_config import app_config
 from common.logger_setup import setup_logger
 from common.redis_client import RedisClient
-from common.data_models import RedisEndCallCommand, RedisAIHandshakeCommand
+from common.data_models import RedisEndCallCommand, RedisAIHandshakeCommand, RedisDTMFCommand
 from database import db_manager
+from database.db_writer import db_writer
 from database.models import CallStatus
+from common.call_context_registry import call_context_registry
+from audio_processing_service.playback_buffer import AudioRingBuffer
+from audio_processing_service.call_recorder import CallRecorder
+from audio_processing_service.audio_resampler import PolyphaseResampler
+from audio_processing_service.g711 import ulaw_encode, ulaw_decode_table
+from audio_processing_service.dtmf_generator import DtmfGenerator, dtmf_generator
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
@@ -40,24 +46,14 @@ TYPE_DTMF = 0x03
 TYPE_AUDIO = 0x10
 TYPE_ERROR = 0xff
 
-# Audio utility functions
-def resample_audio(audio_np: np.ndarray, src_sr: int, dst_sr: int) -> np.ndarray:
-    """Resample audio from source sample rate to destination sample rate."""
-    if src_sr == dst_sr or audio_np.size == 0:
-        return audio_np.astype(np.int16)
-    
-    num_samples_dst = int(audio_np.size * dst_sr / src_sr)
-    if num_samples_dst == 0:
-        return np.array([], dtype=np.int16)
-    
-    if audio_np.size == 1:
-        return np.full(num_samples_dst, audio_np[0], dtype=np.int16)
-    
-    x_src_indices = np.arange(audio_np.size)
-    x_dst_indices = np.linspace(0, audio_np.size - 1, num_samples_dst, endpoint=True)
-    resampled_audio = np.interp(x_dst_indices, x_src_indices, audio_np)
-    
-    return np.round(resampled_audio).astype(np.int16)
+# Stop queueing playout frames once this many bytes are waiting in the transport (Asterisk not reading)
+PLAYOUT_MAX_WRITE_BACKLOG_BYTES = 50 * (3 + TARGET_ASTERISK_CHUNK_SIZE_BYTES)
+
+# Gain applied to AI audio on its way to Asterisk (folded into the downsampler taps)
+AI_PLAYBACK_GAIN = 2.0
+
+# OpenAI Realtime session codec that keeps audio at 8kHz end to end (no resampling, LUT codec only)
+AUDIO_FORMAT_G711_ULAW = "g711_ulaw"
 
 class AudioSocketHandler:
     def __init__(self,
@@ -65,7 +61,8 @@ class AudioSocketHandler:
                  writer: asyncio.StreamWriter,
                  redis_client: RedisClient,
                  peername: tuple | str | None,
-                 server: 'AudioSocketServer'):
+                 server: 'AudioSocketServer',
+                 audio_format: Optional[str] = None):
         self.reader = reader
         self.writer = writer
         self.redis_client = redis_client
@@ -78,26 +75,51 @@ class AudioSocketHandler:
 
         self._stop_event = asyncio.Event()
         self._redis_listener_task: Optional[asyncio.Task] = None
-        self._incoming_audio_frames: List[bytes] = [] # Buffer for incoming audio
         self._openai_ready = False
         self.openai_client = None
         self.loop = asyncio.get_running_loop()
         
-        # Initialize playback buffer and lock
-        self.playback_buffer_8khz = bytearray()
-        self.playback_buffer_lock = asyncio.Lock()
+        # Bounded playback ring buffer (8kHz PCM16) drained one frame per tick by the server's playout clock;
+        # it starts small and only grows while a long AI response is queued
+        bytes_per_second = AST_SAMPLE_RATE * PCM_SAMPLE_WIDTH_BYTES
+        self.playback_buffer_8khz = AudioRingBuffer(
+            capacity_bytes=int(app_config.AUDIOSOCKET_PLAYBACK_BUFFER_S * bytes_per_second),
+            high_water_bytes=int(app_config.AUDIOSOCKET_PLAYBACK_HIGH_WATER_S * bytes_per_second),
+            initial_bytes=int(app_config.AUDIOSOCKET_PLAYBACK_INITIAL_S * bytes_per_second)
+        )
+        self._playback_below_high_water = asyncio.Event()
+        self._playback_below_high_water.set()
         
-        # Initialize audio buffers for recording
-        self.session_caller_audio_buffer = []  # Buffer for caller audio (24kHz)
-        self.session_ai_audio_buffer = []      # Buffer for AI audio (24kHz)
-        self.session_lock = asyncio.Lock()     # Lock for audio buffers
+        # Streaming stereo recorder (caller left, AI right); created once the call is identified
+        self.recorder: Optional[CallRecorder] = None
+        self._record_at_8khz = False  # True records both legs at the native Asterisk rate (CALL_RECORDING_FORMAT)
+
+        # Realtime session codec: "pcm16" resamples 8k<->24k here, "g711_ulaw" passes 8kHz mu-law straight through
+        self.audio_format: str = audio_format or app_config.OPENAI_REALTIME_AUDIO_FORMAT
+        self._ulaw_passthrough = self.audio_format == AUDIO_FORMAT_G711_ULAW
+        # mu-law -> PCM16 decode table with AI_PLAYBACK_GAIN folded in
+        self._ulaw_playback_table = ulaw_decode_table(AI_PLAYBACK_GAIN)
+
+        # Per-call streaming resamplers; they keep filter history across 20ms frames (pcm16 mode only)
+        self._inbound_resampler = PolyphaseResampler(AST_SAMPLE_RATE, OPENAI_SAMPLE_RATE)
+        self._outbound_resampler = PolyphaseResampler(OPENAI_SAMPLE_RATE, AST_SAMPLE_RATE, gain=AI_PLAYBACK_GAIN)
         
         # Pre-generate silent frame for keeping connection alive
         self.silent_frame = bytes([0] * TARGET_ASTERISK_CHUNK_SIZE_BYTES)
         self.silent_frame_header = struct.pack("!BH", TYPE_AUDIO, TARGET_ASTERISK_CHUNK_SIZE_BYTES)
+        self._silent_frame_packet = self.silent_frame_header + self.silent_frame
+        # Preallocated outbound frame with the header already in place; audio is copied straight into its payload
+        self._new_outbound_frame()
         
         # OpenAI receive task
         self._openai_receive_task = None
+
+        # DTMF tones at the 24kHz recording rate, created on first use (pcm16_24k recordings only)
+        self._dtmf_recording_generator: Optional[DtmfGenerator] = None
+
+        # Outbound frame counters (frames are written by AudioSocketServer's shared playout clock)
+        self.playout_frames_sent = 0
+        self.playout_frames_dropped = 0
         
         logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername}] Initialized with test tone buffer, awaiting initial UUID frame from Asterisk.")
 
@@ -107,10 +129,8 @@ class AudioSocketHandler:
             logger.error(f"[AudioSocketHandler-TCP:Peer={self.peername}] Cannot update DB status. CallID/AsteriskUUID not yet identified.")
             return
 
-        loop = asyncio.get_running_loop()
         try:
-            await loop.run_in_executor(
-                None,
+            await db_writer.submit(
                 db_manager.update_call_status,
                 self.call_id,                     # Use internal integer AppCallID for DB PK
                 status,
@@ -137,6 +157,29 @@ class AudioSocketHandler:
         elif command_type == RedisAIHandshakeCommand.model_fields['command_type'].default:
             logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Received TriggerAIResponse command via Redis.")
             await self.trigger_ai_response()
+        elif command_type == RedisDTMFCommand.model_fields['command_type'].default:
+            self.play_dtmf(RedisDTMFCommand(**command_data_dict).digits)
+
+    def play_dtmf(self, digits: str) -> str:
+        """Queues in-band DTMF tones for `digits` on the playback stream, after any audio already queued. Returns the digits queued."""
+        pcm, queued = dtmf_generator.generate(digits)
+        if queued != digits.upper():
+            logger.warning(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Skipping non-DTMF characters in '{digits}'.")
+        if not pcm:
+            return ""
+        if self.recorder:
+            if self._record_at_8khz:
+                recording_pcm = pcm
+            else:
+                if self._dtmf_recording_generator is None:
+                    self._dtmf_recording_generator = DtmfGenerator(sample_rate=OPENAI_SAMPLE_RATE)
+                recording_pcm, _ = self._dtmf_recording_generator.generate(queued)
+            self.recorder.add_ai_audio(np.frombuffer(recording_pcm, dtype=np.int16))
+        stored = self.playback_buffer_8khz.write(pcm)
+        if stored < len(pcm):
+            logger.warning(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Playback buffer full, dropped {len(pcm) - stored} bytes of DTMF audio")
+        logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Queued in-band DTMF '{queued}' ({len(queued) * dtmf_generator.digit_duration_s:.2f}s)")
+        return queued
         
     async def _listen_for_redis_commands(self):
         if self.call_id is None: # Should not happen if called correctly
@@ -162,30 +205,36 @@ class AudioSocketHandler:
         try:
             while not self._stop_event.is_set() and self.openai_client and self.openai_client.is_connected:
                 try:
-                    # Get audio from OpenAI (24kHz)
+                    # Get audio from OpenAI (24kHz PCM16, or 8kHz mu-law in passthrough mode)
                     audio_chunk = await self.openai_client.get_synthesized_audio_chunk()
                     if audio_chunk is None:
                         # End of stream or timeout
                         await asyncio.sleep(0.01)
                         continue
                     
-                    # Store original 24kHz audio for recording
-                    ai_audio_np_24khz = np.frombuffer(audio_chunk, dtype=np.int16)
-                    async with self.session_lock:
-                        self.session_ai_audio_buffer.append(ai_audio_np_24khz.copy())
-                    
-                    # Resample to 8kHz for Asterisk
-                    ai_audio_np_8khz = resample_audio(ai_audio_np_24khz, OPENAI_SAMPLE_RATE, AST_SAMPLE_RATE)
-                    
-                    # Apply gain
-                    gain_factor = 2.0  # Adjust as needed
-                    ai_audio_float = ai_audio_np_8khz.astype(np.float32) * gain_factor
-                    ai_audio_float = np.clip(ai_audio_float, -32768.0, 32767.0)
-                    ai_audio_8khz = ai_audio_float.astype(np.int16).tobytes()
+                    if self._ulaw_passthrough:
+                        # 8kHz mu-law from OpenAI: one table lookup decodes and applies the playback gain
+                        ai_audio_np_8khz = self._ulaw_playback_table[np.frombuffer(audio_chunk, dtype=np.uint8)]
+                        ai_audio_np_24khz = None
+                    else:
+                        ai_audio_np_24khz = np.frombuffer(audio_chunk, dtype=np.int16)
+                        # Resample to 8kHz for Asterisk (gain and clipping are applied by the resampler)
+                        ai_audio_np_8khz = self._outbound_resampler.process(ai_audio_np_24khz)
+                    ai_audio_8khz = ai_audio_np_8khz.tobytes()
+
+                    # Queue AI audio for the recording: what the caller hears in 8kHz mode, the original 24kHz otherwise
+                    if self.recorder:
+                        self.recorder.add_ai_audio(ai_audio_np_8khz if self._record_at_8khz else ai_audio_np_24khz)
                     
+                    # Hold off while the caller still has a long stretch of audio queued (bounded memory)
+                    if self.playback_buffer_8khz.is_above_high_water():
+                        self._playback_below_high_water.clear()
+                        await self._playback_below_high_water.wait()
+
                     # Add to playback buffer
-                    async with self.playback_buffer_lock:
-                        self.playback_buffer_8khz.extend(ai_audio_8khz)
+                    stored = self.playback_buffer_8khz.write(ai_audio_8khz)
+                    if stored < len(ai_audio_8khz):
+                        logger.warning(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Playback buffer full, dropped {len(ai_audio_8khz) - stored} bytes of AI audio")
                     
                     logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Added {len(ai_audio_8khz)} bytes of OpenAI audio to playback buffer")
                 except asyncio.TimeoutError:
@@ -200,89 +249,49 @@ class AudioSocketHandler:
         finally:
             logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] OpenAI response listener finished")
     
-    async def _save_incoming_audio_as_wav(self):
-        """Save collected audio frames as a WAV file.
-        Creates a stereo WAV with caller audio in left channel and AI audio in right channel."""
-        # Create recordings directory if it doesn't exist
-        recordings_dir = Path(_project_root) / "recordings"
-        recordings_dir.mkdir(exist_ok=True)
-
-        # Generate filename with call identification
-        timestamp = asyncio.get_running_loop().time()
-        filename = f"call_{self.call_id}_{self.asterisk_call_uuid}_{int(timestamp)}.wav"
-        wav_path = recordings_dir / filename
-
+    async def _finalize_recording(self):
+        """Finishes the streaming call recording; only the WAV header is rewritten at this point."""
+        if not self.recorder:
+            return
         try:
-            # Process caller and AI audio buffers
-            final_caller_audio = np.array([], dtype=np.int16)
-            final_ai_audio = np.array([], dtype=np.int16)
-            
-            async with self.session_lock:
-                if self.session_caller_audio_buffer:
-                    final_caller_audio = np.concatenate(self.session_caller_audio_buffer)
-                if self.session_ai_audio_buffer:
-                    final_ai_audio = np.concatenate(self.session_ai_audio_buffer)
-            
-            if final_caller_audio.size == 0 and final_ai_audio.size == 0:
-                logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] No audio data recorded for this session. Skipping WAV file generation.")
-                return
-            
-            # Create stereo audio (caller in left channel, AI in right channel)
-            maxlen = max(final_caller_audio.size, final_ai_audio.size)
-            if final_caller_audio.size < maxlen:
-                final_caller_audio = np.pad(final_caller_audio, (0, maxlen - final_caller_audio.size), 'constant', constant_values=0)
-            if final_ai_audio.size < maxlen:
-                final_ai_audio = np.pad(final_ai_audio, (0, maxlen - final_ai_audio.size), 'constant', constant_values=0)
-            
-            stereo_audio = np.stack((final_caller_audio, final_ai_audio), axis=-1).astype(np.int16)
-            
-            # Write stereo WAV file
-            with wave.open(str(wav_path), 'wb') as wav_file:
-                wav_file.setnchannels(2)  # Stereo audio
-                wav_file.setsampwidth(2)  # 2 bytes per sample (16-bit PCM)
-                wav_file.setframerate(OPENAI_SAMPLE_RATE)  # 24kHz sample rate
-                wav_file.writeframes(stereo_audio.tobytes())
-
-            logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Saved stereo call recording to {wav_path}")
+            wav_path = await self.recorder.close()
+            if wav_path:
+                logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Saved stereo call recording to {wav_path}")
+            else:
+                logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] No audio data recorded for this session. No WAV file kept.")
         except Exception as e:
             logger.error(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Error saving audio file: {e}", exc_info=True)
 
-    async def _send_audio_to_asterisk_task(self):
-        """Dedicated task to continuously send audio to Asterisk"""
-        logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Starting audio send task")
-        try:
-            while not self._stop_event.is_set():
-                if self.writer and not self.writer.is_closing():
-                    # Check playback buffer first
-                    chunk_to_send = None
-                    async with self.playback_buffer_lock:
-                        if len(self.playback_buffer_8khz) >= TARGET_ASTERISK_CHUNK_SIZE_BYTES:
-                            chunk_to_send = self.playback_buffer_8khz[:TARGET_ASTERISK_CHUNK_SIZE_BYTES]
-                            del self.playback_buffer_8khz[:TARGET_ASTERISK_CHUNK_SIZE_BYTES]
-                    
-                    if chunk_to_send:
-                        # Send buffered audio
-                        header = struct.pack("!BH", TYPE_AUDIO, len(chunk_to_send))
-                        self.writer.write(header + chunk_to_send)
-                        await self.writer.drain()
-                        # logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Sent buffered audio frame")
-                    else:
-                        # Send pre-generated silent frame to maintain connection
-                        self.writer.write(self.silent_frame_header + self.silent_frame)
-                        await self.writer.drain()
-                        # logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Sent silent frame")
-                    
-                    await asyncio.sleep(0.015)  # Crucial timing
-                else:
-                    break
-        except Exception as e:
-            logger.error(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Error in audio send task: {e}")
-        finally:
-            logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Audio send task finished")
+    def _new_outbound_frame(self):
+        self._outbound_frame = bytearray(self.silent_frame_header) + bytearray(TARGET_ASTERISK_CHUNK_SIZE_BYTES)
+        self._outbound_payload = memoryview(self._outbound_frame)[len(self.silent_frame_header):]
+
+    def write_playout_frame(self) -> bool:
+        """Writes one 20ms frame (buffered AI audio or silence) to Asterisk. Driven by the server's playout clock."""
+        if self._stop_event.is_set() or not self.writer or self.writer.is_closing():
+            return False
+        transport = self.writer.transport
+        if transport.get_write_buffer_size() > PLAYOUT_MAX_WRITE_BACKLOG_BYTES:
+            # Asterisk is not draining the socket; drop this frame rather than queue audio without bound
+            self.playout_frames_dropped += 1
+            return False
+
+        if len(self.playback_buffer_8khz) >= TARGET_ASTERISK_CHUNK_SIZE_BYTES:
+            self.playback_buffer_8khz.read_into(self._outbound_payload)
+            self.writer.write(self._outbound_frame)
+            if transport.get_write_buffer_size():
+                # The transport may still reference our frame until it flushes; use a fresh one next tick
+                self._new_outbound_frame()
+            if not self._playback_below_high_water.is_set() and not self.playback_buffer_8khz.is_above_high_water():
+                self._playback_below_high_water.set()
+        else:
+            # Send pre-generated silent frame to maintain connection
+            self.writer.write(self._silent_frame_packet)
+        self.playout_frames_sent += 1
+        return True
 
     async def handle_frames(self):
         """Main loop to handle incoming frames from Asterisk (TCP AudioSocket protocol)."""
-        audio_send_task = None
         try:
             # --- Stage 1: Read the initial TYPE_UUID frame from Asterisk ---
             logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername}] Awaiting initial UUID frame from Asterisk...")
@@ -308,37 +317,51 @@ class AudioSocketHandler:
 
             logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Received initial Asterisk Dialplan UUID from first frame.")
 
-            # --- Stage 2: Lookup internal call_id from database using the received Asterisk UUID ---
-            loop = asyncio.get_running_loop()
-            call_record = None
-            MAX_DB_LOOKUP_ATTEMPTS = 3 # Try up to 3 times
-            DB_LOOKUP_RETRY_DELAY_S = 0.2 # Wait 200ms between attempts
-            for attempt in range(MAX_DB_LOOKUP_ATTEMPTS):
-                logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Attempting DB lookup for Asterisk UUID (Attempt {attempt + 1}/{MAX_DB_LOOKUP_ATTEMPTS})...")
-                call_record = await loop.run_in_executor(None, db_manager.get_call_by_asterisk_uuid, self.asterisk_call_uuid)
-                if call_record:
-                    break # Found it
-                if attempt < MAX_DB_LOOKUP_ATTEMPTS - 1:
-                    logger.warning(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Call record not found, retrying in {DB_LOOKUP_RETRY_DELAY_S}s...")
-                    await asyncio.sleep(DB_LOOKUP_RETRY_DELAY_S)
-                else: # Last attempt failed
-                    logger.error(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] No active call record found for this Asterisk UUID after {MAX_DB_LOOKUP_ATTEMPTS} attempts. Terminating.")
-                    return # Exit handle_frames
-
-            if not call_record:
-                logger.error(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] No active call record found for this Asterisk UUID. Terminating.")
-                return
-
-            self.call_id = call_record.id
+            # --- Stage 2: Resolve the call from the context CallAttemptHandler published before Originate ---
+            call_prompt: Optional[str] = None
+            call_context = await call_context_registry.lookup(self.asterisk_call_uuid, self.redis_client)
+            if call_context:
+                self.call_id = call_context.call_id
+                call_task_id = call_context.task_id
+                call_prompt = call_context.prompt
+                logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Resolved AppCallID={self.call_id} from call context registry.")
+            else:
+                # Fallback: look the UUID up in the database (context expired, or published by a process we can't reach)
+                loop = asyncio.get_running_loop()
+                call_record = None
+                MAX_DB_LOOKUP_ATTEMPTS = 3 # Try up to 3 times
+                DB_LOOKUP_RETRY_DELAY_S = 0.2 # Wait 200ms between attempts
+                for attempt in range(MAX_DB_LOOKUP_ATTEMPTS):
+                    logger.info(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Attempting DB lookup for Asterisk UUID (Attempt {attempt + 1}/{MAX_DB_LOOKUP_ATTEMPTS})...")
+                    call_record = await loop.run_in_executor(None, db_manager.get_call_by_asterisk_uuid, self.asterisk_call_uuid)
+                    if call_record:
+                        break # Found it
+                    if attempt < MAX_DB_LOOKUP_ATTEMPTS - 1:
+                        logger.warning(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] Call record not found, retrying in {DB_LOOKUP_RETRY_DELAY_S}s...")
+                        await asyncio.sleep(DB_LOOKUP_RETRY_DELAY_S)
+                    else: # Last attempt failed
+                        logger.error(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] No active call record found for this Asterisk UUID after {MAX_DB_LOOKUP_ATTEMPTS} attempts. Terminating.")
+                        return # Exit handle_frames
+
+                if not call_record:
+                    logger.error(f"[AudioSocketHandler-TCP:Peer={self.peername},AstDialplanUUID={self.asterisk_call_uuid}] No active call record found for this Asterisk UUID. Terminating.")
+                    return
+
+                self.call_id = call_record.id
+                call_task_id = call_record.task_id
+
+            recording_format = app_config.CALL_RECORDING_FORMAT
+            if self._ulaw_passthrough and recording_format == "pcm16_24k":
+                # No 24kHz audio exists in passthrough mode; record at the native rate instead
+                recording_format = "pcm16_8k"
+            self.recorder = CallRecorder.for_call(self.call_id, self.asterisk_call_uuid, self.loop.time(), recording_format)
+            self._record_at_8khz = self.recorder.sample_rate == AST_SAMPLE_RATE
+            # Registering also enrols this handler with the server's playout clock, which starts sending frames to Asterisk
             self.server.register_handler(self)
             logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id},AstDialplanUUID={self.asterisk_call_uuid}] Successfully mapped Asterisk UUID to AppCallID and registered with server. Starting main processing.")
 
             # --- Stage 3: Start background tasks and OpenAI initialization ---
             if self.call_id: # Redundant check, but safe
-                # Start audio send task first to maintain connection
-                audio_send_task = asyncio.create_task(self._send_audio_to_asterisk_task())
-                logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Started audio send task")
-                
                 # Start Redis listener
                 self._redis_listener_task = asyncio.create_task(self._listen_for_redis_commands())
                 
@@ -347,28 +370,38 @@ class AudioSocketHandler:
                 retry_delay = 1.0
                 for attempt in range(max_retries):
                     try:
-                        call_specific_prompt = "Default prompt"
-                        if call_record.task_id:
-                            task_record = await self.loop.run_in_executor(None, db_manager.get_task_by_id, call_record.task_id)
-                            if task_record and task_record.generated_agent_prompt:
-                                call_specific_prompt = task_record.generated_agent_prompt
-                        
-                        from audio_processing_service.openai_realtime_client import OpenAIRealtimeClient
-                        if not app_config.OPENAI_API_KEY:
-                            logger.error(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] OpenAI API Key not configured. Cannot start AI client.")
-                            self._stop_event.set()
-                            return
-
-                        self.openai_client = OpenAIRealtimeClient(
-                            call_specific_prompt=call_specific_prompt,
-                            openai_api_key=app_config.OPENAI_API_KEY,
-                            loop=self.loop,
-                            redis_client=self.redis_client
-                        )
-                        # Set context for function calling and start injection listener
-                        self.openai_client.set_call_context(self.call_id)
-                        
-                        conn_success = await self.openai_client.connect_and_initialize()
+                        # Use the session CallAttemptHandler opened while the call was ringing, if there is one
+                        from audio_processing_service.realtime_session_pool import realtime_session_pool
+                        warm_client = await realtime_session_pool.adopt(self.call_id, audio_format=self.audio_format) if attempt == 0 else None
+                        if warm_client:
+                            self.openai_client = warm_client
+                            # Set context for function calling and start injection listener
+                            self.openai_client.set_call_context(self.call_id)
+                            conn_success = True
+                            logger.info(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Adopted pre-warmed OpenAI session.")
+                        else:
+                            call_specific_prompt = call_prompt or "Default prompt"
+                            if call_prompt is None and call_task_id:
+                                task_record = await self.loop.run_in_executor(None, db_manager.get_task_by_id, call_task_id)
+                                if task_record and task_record.generated_agent_prompt:
+                                    call_specific_prompt = task_record.generated_agent_prompt
+                            
+                            from audio_processing_service.openai_realtime_client import OpenAIRealtimeClient
+                            if not app_config.OPENAI_API_KEY:
+                                logger.error(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] OpenAI API Key not configured. Cannot start AI client.")
+                                self._stop_event.set()
+                                return
+
+                            self.openai_client = OpenAIRealtimeClient(
+                                call_specific_prompt=call_specific_prompt,
+                                openai_api_key=app_config.OPENAI_API_KEY,
+                                loop=self.loop,
+                                redis_client=self.redis_client
+                            )
+                            # Set context for function calling and start injection listener
+                            self.openai_client.set_call_context(self.call_id)
+                            
+                            conn_success = await self.openai_client.connect_and_initialize(audio_format=self.audio_format)
                         if conn_success:
                             self._openai_ready = True
                             await self._update_call_status_db(CallStatus.LIVE_AI_HANDLING)
@@ -407,20 +440,21 @@ class AudioSocketHandler:
                     if frame_msg_type == TYPE_AUDIO:
                         if frame_payload:
                             # logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id},AstDialplanUUID={self.asterisk_call_uuid}] Received AUDIO frame, len={frame_payload_len}")
-                            self._incoming_audio_frames.append(frame_payload) # Buffer the audio for saving
-                            
-                            # Store caller audio for recording (24kHz)
                             audio_np_8khz = np.frombuffer(frame_payload, dtype=np.int16)
-                            audio_np_24khz = resample_audio(audio_np_8khz, AST_SAMPLE_RATE, OPENAI_SAMPLE_RATE)
-                            
-                            # Store in caller buffer for recording
-                            async with self.session_lock:
-                                self.session_caller_audio_buffer.append(audio_np_24khz.copy())
+                            if self._ulaw_passthrough:
+                                # Encode to mu-law for OpenAI; the recording keeps the 8kHz PCM
+                                uplink_audio = ulaw_encode(audio_np_8khz)
+                                self.recorder.add_caller_audio(audio_np_8khz)
+                            else:
+                                # Upsample caller audio to 24kHz for OpenAI and the recording
+                                uplink_audio = self._inbound_resampler.process(audio_np_8khz)
+                                # Append to the on-disk recording (written by the recorder's writer thread)
+                                self.recorder.add_caller_audio(audio_np_8khz if self._record_at_8khz else uplink_audio)
                             
                             # Process audio for OpenAI if ready
                             if self._openai_ready and self.openai_client and self.openai_client.is_connected:
-                                if audio_np_24khz.size > 0:
-                                    await self.openai_client.send_audio_chunk(audio_np_24khz.tobytes())
+                                if uplink_audio.size > 0:
+                                    await self.openai_client.send_audio_chunk(uplink_audio.tobytes())
                                     # logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Sent audio to OpenAI, len={frame_payload_len}")
                         else:
                             logger.warning(f"[AudioSocketHandler-TCP:AppCallID={self.call_id},AstDialplanUUID={self.asterisk_call_uuid}] Received AUDIO frame with zero payload.")
@@ -446,7 +480,7 @@ class AudioSocketHandler:
                         logger.warning(f"[AudioSocketHandler-TCP:AppCallID={self.call_id},AstDialplanUUID={self.asterisk_call_uuid}] Received unknown frame type {frame_msg_type:#04x}, len={frame_payload_len}.")
 
                 except asyncio.TimeoutError:
-                    logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Frame read timeout, audio send task maintaining connection")
+                    logger.debug(f"[AudioSocketHandler-TCP:AppCallID={self.call_id}] Frame read timeout, playout clock maintaining connection")
                     if self._stop_event.is_set(): break
                     continue
                 except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError) as e:
@@ -467,8 +501,8 @@ class AudioSocketHandler:
             if not self._stop_event.is_set(): self._stop_event.set()
 
         finally:
-            # Save any buffered incoming audio before further cleanup
-            await self._save_incoming_audio_as_wav()
+            # Finalise the streaming recording before further cleanup
+            await self._finalize_recording()
 
             uuid_for_log = self.asterisk_call_uuid or "UUID_Unknown"
             app_id_for_log = self.call_id or "AppCallID_Unknown"
@@ -487,8 +521,6 @@ class AudioSocketHandler:
             tasks_to_cancel = []
             if self._redis_listener_task and not self._redis_listener_task.done():
                 tasks_to_cancel.append(('Redis listener', self._redis_listener_task))
-            if audio_send_task and not audio_send_task.done():
-                tasks_to_cancel.append(('Audio send', audio_send_task))
             if self._openai_receive_task and not self._openai_receive_task.done():
                 tasks_to_cancel.append(('OpenAI receive', self._openai_receive_task))
 
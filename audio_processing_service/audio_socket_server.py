@@ -16,6 +16,8 @@ from typing import Dict
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
+PLAYOUT_FRAME_INTERVAL_S = 0.020  # One 320-byte, 8kHz PCM16 frame per handler per tick
+
 class AudioSocketServer:
     def __init__(self, host: str, port: int, redis_client: RedisClient):
         self.host = host
@@ -25,6 +27,14 @@ class AudioSocketServer:
         self._server: asyncio.AbstractServer | None = None
         self.active_handlers: Dict[str, AudioSocketHandler] = {}
         self._redis_listener_task: asyncio.Task | None = None
+        self._playout_clock_task: asyncio.Task | None = None
+        self.playout_stats: Dict[str, float] = {
+            "ticks": 0,
+            "frames_written": 0,
+            "missed_deadlines": 0,   # 20ms slots the clock woke up too late for (caught up afterwards)
+            "skipped_frames": 0,     # Slots beyond AUDIOSOCKET_PLAYOUT_MAX_CATCHUP_FRAMES that were dropped
+            "max_lateness_ms": 0.0,
+        }
         logger.info(f"AudioSocketServer initialized to listen on {self.host}:{self.port}")
 
     def register_handler(self, handler: AudioSocketHandler):
@@ -37,6 +47,68 @@ class AudioSocketServer:
             del self.active_handlers[handler.asterisk_call_uuid]
             logger.info(f"[AudioSocketServer] Unregistered handler for UUID: {handler.asterisk_call_uuid}")
 
+    def _write_playout_tick(self) -> int:
+        """Writes one frame to every registered handler. Returns the number of frames written."""
+        written = 0
+        for handler in self.active_handlers.values():
+            try:
+                if handler.write_playout_frame():
+                    written += 1
+            except Exception as e:
+                logger.error(f"[AudioSocketServer] Playout write failed for UUID {handler.asterisk_call_uuid}: {e}")
+        return written
+
+    async def _run_playout_clock(self):
+        """Shared 20ms pacer for all calls, scheduled against absolute monotonic deadlines so it does not drift."""
+        loop = asyncio.get_running_loop()
+        stats = self.playout_stats
+        max_catchup = max(0, app_config.AUDIOSOCKET_PLAYOUT_MAX_CATCHUP_FRAMES)
+        report_interval = app_config.AUDIOSOCKET_PLAYOUT_STATS_INTERVAL_S
+        next_deadline = loop.time() + PLAYOUT_FRAME_INTERVAL_S
+        next_report = loop.time() + report_interval
+        missed_at_last_report = 0
+        logger.info("[AudioSocketServer] Playout clock started (20ms ticks).")
+        try:
+            while True:
+                delay = next_deadline - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                now = loop.time()
+                lateness = now - next_deadline
+                # Slots that have come due since the last tick; more than one means we woke up late.
+                due_slots = int(lateness // PLAYOUT_FRAME_INTERVAL_S) + 1
+                frames_this_tick = due_slots
+                if due_slots > 1:
+                    stats["missed_deadlines"] += due_slots - 1
+                    stats["max_lateness_ms"] = max(stats["max_lateness_ms"], lateness * 1000.0)
+                    if due_slots > max_catchup + 1:
+                        # Too far behind to catch up without flooding Asterisk; drop the oldest slots.
+                        stats["skipped_frames"] += due_slots - (max_catchup + 1)
+                        frames_this_tick = max_catchup + 1
+
+                for _ in range(frames_this_tick):
+                    stats["frames_written"] += self._write_playout_tick()
+                stats["ticks"] += 1
+                next_deadline += due_slots * PLAYOUT_FRAME_INTERVAL_S
+
+                if now >= next_report:
+                    missed = stats["missed_deadlines"] - missed_at_last_report
+                    missed_at_last_report = stats["missed_deadlines"]
+                    next_report = now + report_interval
+                    if missed:
+                        logger.warning(f"[AudioSocketServer] Playout clock missed {missed} deadlines in the last {report_interval:.0f}s "
+                                       f"({len(self.active_handlers)} active handlers, max lateness {stats['max_lateness_ms']:.1f}ms, "
+                                       f"skipped frames total {stats['skipped_frames']}).")
+                    else:
+                        logger.debug(f"[AudioSocketServer] Playout clock healthy: {len(self.active_handlers)} active handlers, {stats['ticks']} ticks.")
+        except asyncio.CancelledError:
+            logger.info("[AudioSocketServer] Playout clock cancelled.")
+            raise
+
+    def get_playout_stats(self) -> Dict[str, float]:
+        """Snapshot of playout clock counters."""
+        return {**self.playout_stats, "active_handlers": len(self.active_handlers)}
+
     async def _handle_server_redis_command(self, channel: str, command_data_dict: dict):
         logger.debug(f"[AudioSocketServer] Received Redis command on {channel}: {command_data_dict}")
         command_type = command_data_dict.get("command_type")
@@ -56,7 +128,8 @@ class AudioSocketServer:
         redis_channel_pattern = "audiosocket_server_commands:*"
         logger.info(f"[AudioSocketServer] Subscribing to Redis channel: {redis_channel_pattern}")
         try:
-            await self.redis_client.subscribe_to_channel(redis_channel_pattern, self._handle_server_redis_command)
+            # Server-wide pattern: one task per command, so calls don't share the ordered dispatcher's workers
+            await self.redis_client.subscribe_to_channel(redis_channel_pattern, self._handle_server_redis_command, ordered=False)
         except asyncio.CancelledError:
             logger.info("[AudioSocketServer] Redis listener task cancelled.")
         except Exception as e:
@@ -105,6 +178,7 @@ class AudioSocketServer:
             addr = self._server.sockets[0].getsockname()
             logger.info(f"[AudioSocketServer] Serving on {addr}")
             self._redis_listener_task = asyncio.create_task(self._listen_for_server_redis_commands())
+            self._playout_clock_task = asyncio.create_task(self._run_playout_clock())
         except Exception as e:
             logger.error(f"[AudioSocketServer] Failed to start server: {e}", exc_info=True)
             if self._server:
@@ -113,12 +187,13 @@ class AudioSocketServer:
             raise
 
     async def stop(self):
-        if self._redis_listener_task and not self._redis_listener_task.done():
-            self._redis_listener_task.cancel()
-            try:
-                await self._redis_listener_task
-            except asyncio.CancelledError:
-                pass
+        for task in (self._redis_listener_task, self._playout_clock_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         if self._server:
             logger.info("[AudioSocketServer] Stopping server...")
             self._server.close()
@@ -0,0 +1,316 @@
+# audio_processing_service/call_recorder.py
+import asyncio
+import argparse
+import queue
+import struct
+import threading
+import wave
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from audio_processing_service.g711 import ulaw_encode, ulaw_decode
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+RECORDINGS_DIR = Path(_project_root) / "recordings"
+# Max pending write operations across all calls before new audio is dropped (disk stalled)
+WRITER_QUEUE_MAX_ITEMS = 20000
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_MULAW = 0x0007
+
+# CALL_RECORDING_FORMAT values -> (sample_rate, encoding)
+RECORDING_FORMATS = {
+    "pcm16_24k": (24000, "pcm16"),  # Legacy: both legs at the OpenAI rate
+    "pcm16_8k": (8000, "pcm16"),    # Native telephony rate, 1/3 of the legacy size
+    "ulaw_8k": (8000, "ulaw"),      # G.711 μ-law archive, 1/6 of the legacy size
+}
+
+
+class _StreamingWavFile:
+    """Minimal WAV writer for PCM16 or μ-law data that rewrites only the size fields on close."""
+
+    def __init__(self, path: Path, channels: int, sample_rate: int, encoding: str):
+        self.channels = channels
+        self.encoding = encoding
+        self.frames_written = 0
+        self._file = open(path, 'wb')
+        if encoding == "ulaw":
+            bytes_per_sample = 1
+            fmt_chunk = struct.pack('<HHIIHHH', WAVE_FORMAT_MULAW, channels, sample_rate,
+                                    sample_rate * channels, channels, 8, 0)
+        else:
+            bytes_per_sample = 2
+            fmt_chunk = struct.pack('<HHIIHH', WAVE_FORMAT_PCM, channels, sample_rate,
+                                    sample_rate * channels * 2, channels * 2, 16)
+        self._frame_size = channels * bytes_per_sample
+        header = b'RIFF' + b'\0\0\0\0' + b'WAVE' + b'fmt ' + struct.pack('<I', len(fmt_chunk)) + fmt_chunk
+        self._fact_offset = None
+        if encoding == "ulaw":
+            # Non-PCM formats carry a 'fact' chunk with the number of sample frames
+            self._fact_offset = len(header) + 8
+            header += b'fact' + struct.pack('<I', 4) + b'\0\0\0\0'
+        self._data_size_offset = len(header) + 4
+        header += b'data' + b'\0\0\0\0'
+        self._file.write(header)
+        self._header_size = len(header)
+
+    def write_pcm16(self, interleaved_pcm16: bytes):
+        if self.encoding == "ulaw":
+            data = ulaw_encode(np.frombuffer(interleaved_pcm16, dtype=np.int16)).tobytes()
+        else:
+            data = interleaved_pcm16
+        self._file.write(data)
+        self.frames_written += len(data) // self._frame_size
+
+    def close(self):
+        data_size = self.frames_written * self._frame_size
+        pad = data_size & 1  # RIFF chunks are word aligned
+        if pad:
+            self._file.write(b'\0')
+        self._file.seek(4)
+        self._file.write(struct.pack('<I', self._header_size - 8 + data_size + pad))
+        if self._fact_offset is not None:
+            self._file.seek(self._fact_offset)
+            self._file.write(struct.pack('<I', self.frames_written))
+        self._file.seek(self._data_size_offset)
+        self._file.write(struct.pack('<I', data_size))
+        self._file.close()
+
+
+class _RecordingWriterThread:
+    """Single background thread that performs all recording file I/O for the process."""
+
+    def __init__(self):
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=WRITER_QUEUE_MAX_ITEMS)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="CallRecordingWriter", daemon=True)
+            self._thread.start()
+
+    def submit(self, func, *args, block: bool = False) -> bool:
+        """Queues `func(*args)` to run on the writer thread. Returns False if the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put((func, args), block=block)
+            return True
+        except queue.Full:
+            return False
+
+    def _run(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"[CallRecorder] Error in recording writer thread: {e}", exc_info=True)
+
+
+_writer_thread = _RecordingWriterThread()
+
+
+class CallRecorder:
+    """Streams a stereo call recording (caller left, AI right) to a WAV file while the call runs.
+
+    The caller leg is the clock: every caller frame is paired with the same number of AI samples
+    (or silence), interleaved, and handed to the shared writer thread. AI audio arrives in bursts
+    and waits in a small queue until the matching caller frames arrive, so memory per call is
+    bounded by how far the AI is ahead of playback. File writes never run on the event loop.
+    """
+
+    def __init__(self, wav_path: Path, sample_rate: int, encoding: str = "pcm16", log_prefix: str = "[CallRecorder]"):
+        if encoding not in ("pcm16", "ulaw"):
+            raise ValueError(f"Unsupported recording encoding: {encoding}")
+        self.wav_path = Path(wav_path)
+        self.sample_rate = sample_rate
+        self.encoding = encoding
+        self.log_prefix = log_prefix
+        self._wav_file: Optional[_StreamingWavFile] = None
+        self._pending_ai: deque = deque()  # int16 arrays of AI audio not yet paired with caller audio
+        self._pending_ai_offset = 0        # Samples already consumed from _pending_ai[0]
+        self._pending_ai_samples = 0
+        self._dropped_writes = 0
+        self._closed = False
+        if not _writer_thread.submit(self._open_file):
+            logger.error(f"{self.log_prefix} Recording writer queue full, recording disabled for {self.wav_path.name}")
+
+    @classmethod
+    def for_call(cls, call_id: int, asterisk_call_uuid: str, started_at: float,
+                 recording_format: Optional[str] = None) -> "CallRecorder":
+        """Creates the recorder for a call using CALL_RECORDING_FORMAT (or `recording_format`)."""
+        recording_format = recording_format or app_config.CALL_RECORDING_FORMAT
+        if recording_format not in RECORDING_FORMATS:
+            logger.warning(f"[CallRecorder:AppCallID={call_id}] Unknown recording format '{recording_format}', using pcm16_24k.")
+            recording_format = "pcm16_24k"
+        sample_rate, encoding = RECORDING_FORMATS[recording_format]
+        filename = f"call_{call_id}_{asterisk_call_uuid}_{int(started_at)}.wav"
+        return cls(RECORDINGS_DIR / filename, sample_rate, encoding, log_prefix=f"[CallRecorder:AppCallID={call_id}]")
+
+    # --- Event loop side ---
+
+    def add_ai_audio(self, samples: np.ndarray):
+        """Queues AI audio for the right channel; it is written as caller frames arrive."""
+        if self._closed or samples.size == 0:
+            return
+        self._pending_ai.append(samples)
+        self._pending_ai_samples += samples.size
+
+    def add_caller_audio(self, samples: np.ndarray):
+        """Writes one caller frame (left channel) together with the matching span of AI audio."""
+        if self._closed or samples.size == 0:
+            return
+        stereo = np.zeros((samples.size, 2), dtype=np.int16)
+        stereo[:, 0] = samples
+        self._take_ai_audio_into(stereo[:, 1])
+        self._enqueue_frames(stereo)
+
+    def _take_ai_audio_into(self, dest: np.ndarray):
+        filled = 0
+        while filled < dest.size and self._pending_ai:
+            head = self._pending_ai[0]
+            available = head.size - self._pending_ai_offset
+            count = min(available, dest.size - filled)
+            dest[filled:filled + count] = head[self._pending_ai_offset:self._pending_ai_offset + count]
+            filled += count
+            if count == available:
+                self._pending_ai.popleft()
+                self._pending_ai_offset = 0
+            else:
+                self._pending_ai_offset += count
+        self._pending_ai_samples -= filled
+
+    def _enqueue_frames(self, stereo: np.ndarray):
+        if not _writer_thread.submit(self._write_frames, stereo.tobytes()):
+            self._dropped_writes += 1
+            if self._dropped_writes == 1:
+                logger.error(f"{self.log_prefix} Recording writer queue full, dropping audio for {self.wav_path.name}")
+
+    async def close(self) -> Optional[Path]:
+        """Flushes queued AI audio, patches the WAV header and returns the path (None if nothing was recorded)."""
+        if self._closed:
+            return None
+        if self._pending_ai_samples:
+            tail = np.zeros((self._pending_ai_samples, 2), dtype=np.int16)
+            self._take_ai_audio_into(tail[:, 1])
+            self._enqueue_frames(tail)
+        self._closed = True
+
+        loop = asyncio.get_running_loop()
+        done: asyncio.Future = loop.create_future()
+
+        def _finish():
+            result = self._close_file()
+            loop.call_soon_threadsafe(lambda: done.done() or done.set_result(result))
+
+        # Blocking put so finalisation is never dropped; the wait itself runs off the event loop
+        await loop.run_in_executor(None, lambda: _writer_thread.submit(_finish, block=True))
+        return await done
+
+    # --- Writer thread side ---
+
+    def _open_file(self):
+        try:
+            self.wav_path.parent.mkdir(parents=True, exist_ok=True)
+            # Caller left, AI right
+            self._wav_file = _StreamingWavFile(self.wav_path, 2, self.sample_rate, self.encoding)
+        except Exception as e:
+            logger.error(f"{self.log_prefix} Could not open recording file {self.wav_path}: {e}", exc_info=True)
+
+    def _write_frames(self, data: bytes):
+        if self._wav_file is None:
+            return
+        # Appends without touching the header; close() patches the sizes once
+        self._wav_file.write_pcm16(data)
+
+    def _close_file(self) -> Optional[Path]:
+        if self._wav_file is None:
+            return None
+        frames_written = self._wav_file.frames_written
+        try:
+            self._wav_file.close()
+        except Exception as e:
+            logger.error(f"{self.log_prefix} Error finalising recording {self.wav_path}: {e}", exc_info=True)
+            return None
+        finally:
+            self._wav_file = None
+        if frames_written == 0:
+            self.wav_path.unlink(missing_ok=True)
+            return None
+        return self.wav_path
+
+
+def load_recording(path: Path) -> tuple[int, np.ndarray]:
+    """Reads a call recording (PCM16 or μ-law WAV) and returns (sample_rate, int16 array of shape (frames, channels))."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if data[:4] != b'RIFF' or data[8:12] != b'WAVE':
+        raise ValueError(f"{path} is not a WAV file")
+
+    format_tag = channels = sample_rate = bits = None
+    audio = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id = data[pos:pos + 4]
+        chunk_size = struct.unpack('<I', data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + chunk_size]
+        if chunk_id == b'fmt ':
+            format_tag, channels, sample_rate, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+        elif chunk_id == b'data':
+            audio = body
+        pos += 8 + chunk_size + (chunk_size & 1)
+
+    if format_tag is None or audio is None:
+        raise ValueError(f"{path} is missing a fmt or data chunk")
+    if format_tag == WAVE_FORMAT_MULAW:
+        samples = ulaw_decode(audio)
+    elif format_tag == WAVE_FORMAT_PCM and bits == 16:
+        samples = np.frombuffer(audio[:len(audio) - len(audio) % 2], dtype=np.int16)
+    else:
+        raise ValueError(f"{path}: unsupported WAV format tag {format_tag} ({bits} bits)")
+    usable = samples.size - samples.size % channels
+    return sample_rate, samples[:usable].reshape(-1, channels)
+
+
+def export_pcm16_wav(src: Path, dst: Path) -> Path:
+    """Decodes any call recording to a plain PCM16 WAV (e.g. for players without μ-law support)."""
+    sample_rate, samples = load_recording(src)
+    return write_pcm16_wav(dst, sample_rate, samples)
+
+
+def write_pcm16_wav(dst: Path, sample_rate: int, samples: np.ndarray) -> Path:
+    """Writes (frames, channels) int16 samples, as returned by load_recording(), to a PCM16 WAV."""
+    with wave.open(str(dst), 'wb') as wav_file:
+        wav_file.setnchannels(samples.shape[1])
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(samples.tobytes())
+    return Path(dst)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Decode a call recording to PCM16 WAV for playback or analysis")
+    parser.add_argument("source", type=Path)
+    parser.add_argument("destination", type=Path)
+    args = parser.parse_args()
+    rate, decoded = load_recording(args.source)
+    write_pcm16_wav(args.destination, rate, decoded)
+    print(f"Decoded {decoded.shape[0]} frames x {decoded.shape[1]} channels at {rate} Hz -> {args.destination}")
@@ -0,0 +1,69 @@
+# audio_processing_service/dtmf_generator.py
+"""In-band DTMF tones for the AudioSocket playback stream.
+
+Every digit's tone plus the following silence is rendered once, for all 16 digits in one numpy
+expression, as 8kHz PCM16 bytes ready for AudioSocketHandler's playback buffer. Sending a digit
+string is then a bytes join, with no per-digit AMI round trip.
+"""
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+
+# (row, column) frequencies in Hz of each DTMF digit
+DTMF_FREQUENCIES: Dict[str, Tuple[int, int]] = {
+    "1": (697, 1209), "2": (697, 1336), "3": (697, 1477), "A": (697, 1633),
+    "4": (770, 1209), "5": (770, 1336), "6": (770, 1477), "B": (770, 1633),
+    "7": (852, 1209), "8": (852, 1336), "9": (852, 1477), "C": (852, 1633),
+    "*": (941, 1209), "0": (941, 1336), "#": (941, 1477), "D": (941, 1633),
+}
+DTMF_TONE_LEVEL = 0.3 # Peak of each of the two sine waves, as a fraction of int16 full scale (about -10 dBFS)
+DTMF_RAMP_MS = 2.0 # Raised-cosine fade at both ends of a tone, so it starts and stops without a click
+
+
+class DtmfGenerator:
+    """Precomputed PCM16 DTMF digits: `tone_on_ms` of tone followed by `tone_off_ms` of silence each."""
+
+    def __init__(self, sample_rate: int = 8000, tone_on_ms: Optional[float] = None,
+                 tone_off_ms: Optional[float] = None, level: float = DTMF_TONE_LEVEL):
+        self.sample_rate = sample_rate
+        self.tone_on_ms = app_config.DTMF_TONE_ON_MS if tone_on_ms is None else tone_on_ms
+        self.tone_off_ms = app_config.DTMF_TONE_OFF_MS if tone_off_ms is None else tone_off_ms
+        on_samples = max(1, round(sample_rate * self.tone_on_ms / 1000.0))
+        off_samples = max(0, round(sample_rate * self.tone_off_ms / 1000.0))
+
+        digits = list(DTMF_FREQUENCIES)
+        freqs = np.array([DTMF_FREQUENCIES[digit] for digit in digits], dtype=np.float64) # (16, 2)
+        t = np.arange(on_samples) / sample_rate
+        tones = np.sin(2.0 * np.pi * freqs[:, :, None] * t).sum(axis=1) * (level * 32767.0) # (16, on_samples)
+
+        ramp = min(on_samples // 2, round(sample_rate * DTMF_RAMP_MS / 1000.0))
+        if ramp > 0:
+            fade = 0.5 - 0.5 * np.cos(np.pi * np.arange(ramp) / ramp)
+            tones[:, :ramp] *= fade
+            tones[:, on_samples - ramp:] *= fade[::-1]
+
+        pcm = np.zeros((len(digits), on_samples + off_samples), dtype=np.int16)
+        pcm[:, :on_samples] = np.clip(np.rint(tones), -32768, 32767)
+        self._digit_pcm: Dict[str, bytes] = {digit: pcm[index].tobytes() for index, digit in enumerate(digits)}
+        self.digit_duration_s = (on_samples + off_samples) / sample_rate
+
+    def generate(self, digits: str) -> Tuple[bytes, str]:
+        """PCM16 for `digits` (case-insensitive; characters that are not DTMF digits are skipped).
+
+        Returns the audio and the digits it contains.
+        """
+        valid = "".join(digit for digit in digits.upper() if digit in self._digit_pcm)
+        return b"".join(self._digit_pcm[digit] for digit in valid), valid
+
+
+dtmf_generator = DtmfGenerator()
@@ -0,0 +1,67 @@
+# audio_processing_service/g711.py
+"""Vectorised G.711 μ-law codec built on numpy lookup tables.
+
+Encoding indexes a 64K-entry table with the raw 16-bit sample values and decoding indexes a
+256-entry table, so a 20 ms frame is one fancy-indexing operation in each direction.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+ULAW_BIAS = 0x84
+ULAW_CLIP = 8159 # On the 14-bit magnitude, as in the G.711 reference encoder
+
+
+def _build_ulaw_decode_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = codes & 0x80
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + ULAW_BIAS) << exponent) - ULAW_BIAS
+    return np.where(sign != 0, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_ulaw_encode_table() -> np.ndarray:
+    # Index is the int16 sample reinterpreted as uint16, so arange(65536) covers every sample value.
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16).astype(np.int32)
+    # Like the reference (audioop.lin2ulaw), drop to 14 bits with an arithmetic shift before taking
+    # the magnitude, so negative samples round toward -inf rather than toward zero
+    pcm14 = samples >> 2
+    mask = np.where(pcm14 < 0, 0x7F, 0xFF)
+    # Capped at the top of segment 7; the reference encodes a larger biased value as that same code
+    magnitude = np.minimum(np.minimum(np.abs(pcm14), ULAW_CLIP) + (ULAW_BIAS >> 2), 0x1FFF)
+    # Segment is the position of the highest set bit above bit 5 (0..7).
+    segment = np.zeros_like(magnitude)
+    for seg in range(1, 8):
+        segment[magnitude >= (0x20 << seg)] = seg
+    mantissa = (magnitude >> (segment + 1)) & 0x0F
+    return (((segment << 4) | mantissa) ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE_TABLE = _build_ulaw_decode_table()
+ULAW_ENCODE_TABLE = _build_ulaw_encode_table()
+
+
+def ulaw_encode(pcm16: np.ndarray) -> np.ndarray:
+    """Encodes int16 PCM samples to μ-law bytes (uint8 array of the same length)."""
+    return ULAW_ENCODE_TABLE[np.ascontiguousarray(pcm16, dtype=np.int16).view(np.uint16)]
+
+
+def ulaw_decode(ulaw) -> np.ndarray:
+    """Decodes μ-law bytes (bytes-like or uint8 array) to int16 PCM."""
+    return ULAW_DECODE_TABLE[np.frombuffer(ulaw, dtype=np.uint8)]
+
+
+def ulaw_decode_table(gain: float = 1.0) -> np.ndarray:
+    """Decode table with a fixed output gain folded in (clipped to int16), for gain-scaled playback."""
+    if gain == 1.0:
+        return ULAW_DECODE_TABLE
+    scaled = np.rint(ULAW_DECODE_TABLE.astype(np.float64) * gain)
+    return np.clip(scaled, -32768, 32767).astype(np.int16)
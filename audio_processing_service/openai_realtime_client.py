@@ -2,6 +2,9 @@
 import asyncio
 import json
 import base64
+import binascii
+import logging
+import re
 import websockets.client
 import websockets.exceptions
 import time
@@ -25,6 +28,40 @@ from common.redis_client import RedisClient
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
+# orjson is optional; it decodes the non-audio events noticeably faster than the stdlib
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Server events put "type" first, so the event type can be read without parsing the whole message
+_EVENT_TYPE_PREFIX_RE = re.compile(r'\s*\{\s*"type"\s*:\s*"([^"\\]*)"')
+_AUDIO_DELTA_KEY = '"delta":"'
+
+def _extract_audio_delta(message_raw: str) -> Optional[str]:
+    """Slices the base64 "delta" value out of a raw response.audio.delta message; None if it can't."""
+    start = message_raw.find(_AUDIO_DELTA_KEY)
+    if start < 0:
+        return None
+    start += len(_AUDIO_DELTA_KEY)
+    end = message_raw.find('"', start)
+    if end < 0:
+        return None
+    delta = message_raw[start:end]
+    # Base64 never needs JSON escapes; a backslash means an escaped character, so take the slow path
+    if "\\" in delta:
+        return None
+    return delta
+
+# input_audio_buffer.append is built from a fixed template; base64 output never needs JSON escaping
+_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_AUDIO_APPEND_SUFFIX = '"}'
+AUDIO_FORMAT_PCM16 = "pcm16"            # 24kHz 16-bit PCM
+AUDIO_FORMAT_G711_ULAW = "g711_ulaw"    # 8kHz G.711 mu-law, same codec as the telephone leg
+# Bytes of audio per millisecond for each session audio format (sizes the uplink batches)
+UPLINK_BYTES_PER_MS = {AUDIO_FORMAT_PCM16: 48, AUDIO_FORMAT_G711_ULAW: 8}
+
 class OpenAIRealtimeClient:
     def __init__(self,
                  call_specific_prompt: str,
@@ -34,7 +71,9 @@ class OpenAIRealtimeClient:
                  model_name: str = app_config.OPENAI_REALTIME_LLM_MODEL,
                  connect_retries: int = 3,
                  connect_retry_delay_s: float = 2.0,
-                 session_inactivity_timeout_s: float = 180.0
+                 session_inactivity_timeout_s: float = 180.0,
+                 uplink_batch_ms: int = app_config.OPENAI_UPLINK_BATCH_MS,
+                 audio_format: str = app_config.OPENAI_REALTIME_AUDIO_FORMAT
                 ):
         self.call_specific_prompt: str = call_specific_prompt
         self.api_key: str = openai_api_key
@@ -62,18 +101,41 @@ class OpenAIRealtimeClient:
         self._base_connect_retry_delay_s: float = connect_retry_delay_s
         self._initial_connection_successful: bool = False # To differentiate initial connect vs. reconnect
         
+        # Uplink audio coalescing: caller frames are buffered and sent once `uplink_batch_ms` of audio is queued
+        self.uplink_batch_ms: int = max(0, uplink_batch_ms)
+        self._uplink_buffer = bytearray()
+        self.audio_format: str = AUDIO_FORMAT_PCM16
+        self._set_audio_format(audio_format)
+
         # Context for function calling (set by AudioSocketHandler)
         self.call_id: Optional[int] = None
         self.redis_client = redis_client
 
+        # Event type -> handler for the receive loop
+        self._event_handlers = self._build_event_handlers()
+
         logger.info(f"[OpenAIClient:{id(self)}] Initialized for prompt (first 50 chars): '{self.call_specific_prompt[:50]}...'")
 
-    async def connect_and_initialize(self) -> bool:
+    def _set_audio_format(self, audio_format: str):
+        if audio_format not in UPLINK_BYTES_PER_MS:
+            logger.warning(f"[OpenAIClient:{id(self)}] Unsupported audio format '{audio_format}', falling back to {AUDIO_FORMAT_PCM16}.")
+            audio_format = AUDIO_FORMAT_PCM16
+        self.audio_format = audio_format
+        self._uplink_flush_bytes = max(1, self.uplink_batch_ms * UPLINK_BYTES_PER_MS[audio_format])
+
+    async def connect_and_initialize(self, audio_format: Optional[str] = None) -> bool:
         """
         Establishes connection to OpenAI, sends session configuration, and starts listening.
         Includes retry logic for the initial connection.
+        `audio_format` ("pcm16" or "g711_ulaw") selects the codec for both directions of the session.
         """
         async with self._connect_lock: # Ensure only one connection attempt at a time
+            if audio_format and audio_format != self.audio_format:
+                if self.is_connected:
+                    logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] Already connected with {self.audio_format}; ignoring request for {audio_format}.")
+                else:
+                    self._set_audio_format(audio_format)
+
             if self.is_connected:
                 logger.warning(f"[OpenAIClient:{self.session_id_from_openai or id(self)}] Already connected.")
                 return True
@@ -84,7 +146,7 @@ class OpenAIRealtimeClient:
                 try:
                     logger.info(f"[OpenAIClient:{id(self)}] Attempting to connect to OpenAI (Attempt {attempt + 1}/{self._max_connect_retries})...")
                     headers = {"Authorization": f"Bearer {self.api_key}", "OpenAI-Beta": "realtime=v1"}
-                    endpoint = f"wss://api.openai.com/v1/realtime?model={self.model_name}"
+                    endpoint = f"{app_config.OPENAI_REALTIME_URL}?model={self.model_name}"
                     
                     # Set longer open_timeout, default is 10s, can be too short for first connect under load
                     self._websocket = await websockets.client.connect(endpoint, extra_headers=headers, open_timeout=20.0, ping_interval=20, ping_timeout=20)
@@ -97,8 +159,8 @@ class OpenAIRealtimeClient:
                             "instructions": self.call_specific_prompt,
                             "voice": "alloy",
                             #"temperature": 0.6,  # Minimum temperature allowed by OpenAI Realtime API (0.6-1.2)
-                            "input_audio_format": "pcm16",
-                            "output_audio_format": "pcm16",
+                            "input_audio_format": self.audio_format,
+                            "output_audio_format": self.audio_format,
                             "input_audio_transcription": {
                                 "model": "whisper-1",
                                 "language": "en"
@@ -210,7 +272,7 @@ class OpenAIRealtimeClient:
                         self.session_id_from_openai = response.get('session', {}).get('id', f"client_{id(self)}")
                         self.is_connected = True
                         self._initial_connection_successful = True
-                        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI session successfully started/acknowledged (Type: {response.get('type')}).")
+                        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI session successfully started/acknowledged (Type: {response.get('type')}, audio: {self.audio_format}).")
                         
                         # Start the receive loop task
                         if self._receive_task and not self._receive_task.done():
@@ -254,6 +316,7 @@ class OpenAIRealtimeClient:
 
 
     async def send_audio_chunk(self, audio_bytes_24khz_pcm16: bytes):
+        """Queues caller audio in the session's audio format (24kHz PCM16, or 8kHz mu-law in g711_ulaw mode)."""
         if self._is_terminating:
             logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] Call is terminating, ignoring further audio chunks.")
             return
@@ -262,11 +325,23 @@ class OpenAIRealtimeClient:
             logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] Cannot send audio, not connected.")
             return
  
+        self._uplink_buffer += audio_bytes_24khz_pcm16
+        if len(self._uplink_buffer) >= self._uplink_flush_bytes:
+            await self.flush_uplink_audio()
+
+    async def flush_uplink_audio(self):
+        """Sends any coalesced caller audio now as a single input_audio_buffer.append message."""
+        if not self._uplink_buffer:
+            return
+        if not self.is_connected or not self._websocket or self._websocket.closed:
+            self._uplink_buffer.clear()
+            return
+
+        # Encode and clear before awaiting so frames arriving during the send start a new batch
+        audio_b64 = base64.b64encode(self._uplink_buffer).decode('ascii')
+        self._uplink_buffer.clear()
         try:
-            audio_b64 = base64.b64encode(audio_bytes_24khz_pcm16).decode('ascii')
-            message = {"type": "input_audio_buffer.append", "audio": audio_b64}
-            await self._websocket.send(json.dumps(message))
-            #logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] Sent {len(audio_bytes_24khz_pcm16)} bytes (24kHz PCM16) to OpenAI.")
+            await self._websocket.send(_AUDIO_APPEND_PREFIX + audio_b64 + _AUDIO_APPEND_SUFFIX)
         except websockets.exceptions.ConnectionClosed as e:
             logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI connection closed while sending audio: {e}. Triggering reconnect.")
             self.is_connected = False # Mark as disconnected to allow reconnect logic
@@ -439,101 +514,150 @@ INSTRUCTIONS:
         except Exception as e:
             logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Error handling HITL event command: {e}", exc_info=True)
 
+    def _build_event_handlers(self) -> dict:
+        """Maps Realtime event types to their handlers; unknown types go to _on_unknown_event.
+
+        A handler returning True ends the receive loop right away (fatal session error).
+        """
+        handlers = {
+            "error": self._on_error_event,
+            "response.audio.delta": self._on_audio_delta_event,
+            "response.audio_transcript.delta": self._on_transcript_delta_event,
+            "response.audio_transcript.done": self._on_transcript_done_event,
+            "response.done": self._on_response_done_event,
+            "response.function_call_output": self._on_function_call_output_event,
+            "response.function_call_arguments.done": self._on_function_call_arguments_done_event,
+            "conversation.item.input_audio_transcription.completed": self._on_user_transcript_event,
+            "input_audio_buffer.speech_started": self._on_speech_boundary_event,
+            "input_audio_buffer.speech_stopped": self._on_speech_boundary_event,
+        }
+        for msg_type in ("session.updated", "session.created", "response.created", "response.audio.done"):
+            handlers[msg_type] = self._on_debug_event
+        for msg_type in ("input_audio_buffer.committed", "conversation.item.created",
+                         "response.output_item.added", "response.content_part.added",
+                         "response.content_part.done", "response.output_item.done",
+                         "rate_limits.updated"):
+            handlers[msg_type] = self._on_info_event
+        return handlers
+
+    async def _handle_raw_message(self, message_raw) -> bool:
+        """Decodes one websocket message and dispatches it by event type. Returns True if the receive loop must stop."""
+        if isinstance(message_raw, (bytes, bytearray)):
+            message_raw = message_raw.decode("utf-8")
+
+        # Fast path for audio deltas: peek the type and slice the base64 payload without building a dict
+        type_match = _EVENT_TYPE_PREFIX_RE.match(message_raw)
+        if type_match and type_match.group(1) == "response.audio.delta":
+            audio_data_b64 = _extract_audio_delta(message_raw)
+            if audio_data_b64 is not None:
+                await self._queue_audio_delta(audio_data_b64)
+                return False
+
+        data = _json_loads(message_raw)
+        msg_type = data.get("type") or ""
+        handler = self._event_handlers.get(msg_type, self._on_unknown_event)
+        return bool(await handler(msg_type, data, message_raw))
+
+    async def _queue_audio_delta(self, audio_data_b64: str):
+        if not audio_data_b64:
+            return
+        try:
+            # OpenAI sends audio in our `output_audio_format` (24kHz PCM16 or 8kHz mu-law)
+            ai_audio_bytes = binascii.a2b_base64(audio_data_b64)
+            if ai_audio_bytes:
+                await self.incoming_openai_audio_queue.put(ai_audio_bytes)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] Queued {len(ai_audio_bytes)} bytes of AI audio ({self.audio_format}). Queue size: {self.incoming_openai_audio_queue.qsize()}")
+        except Exception as e_audio_q:
+            logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Error processing/queuing AI audio delta: {e_audio_q}", exc_info=True)
+
+    async def _on_audio_delta_event(self, msg_type: str, data: dict, message_raw: str):
+        # Only reached when the fast path could not slice the payload (unusual key order or escaping)
+        await self._queue_audio_delta(data.get("delta"))
+
+    async def _on_error_event(self, msg_type: str, data: dict, message_raw: str) -> bool:
+        logger.error(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI API Error: {data.get('error', data)}")
+        # Depending on error, might need to close or attempt recovery
+        if "session" in str(data.get('error','')).lower() and "not found" in str(data.get('error','')).lower():
+            logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Fatal session error. Stopping client.")
+            self._stop_event.set() # Stop the client, session is invalid
+            return True # Exit the receive loop now instead of blocking in the next recv()
+        return False
+
+    async def _on_transcript_delta_event(self, msg_type: str, data: dict, message_raw: str):
+        delta_content = data.get('delta')
+        transcript_text = ""
+        if isinstance(delta_content, dict): transcript_text = delta_content.get('text', '')
+        elif isinstance(delta_content, str): transcript_text = delta_content
+        if transcript_text: logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Tx Delta: \"{transcript_text}\"")
+
+    async def _on_transcript_done_event(self, msg_type: str, data: dict, message_raw: str):
+        transcript_content = data.get('transcript')
+        full_transcript = "[No full transcript text provided]"
+        if isinstance(transcript_content, dict): full_transcript = transcript_content.get('text', '[No text in dict]')
+        elif isinstance(transcript_content, str): full_transcript = transcript_content
+        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Tx FINAL: \"{full_transcript}\"")
+        # Save assistant transcript to database
+        if full_transcript.strip() and full_transcript != "[No full transcript text provided]":
+            asyncio.create_task(self._save_transcript_to_db("agent", full_transcript))
+
+    async def _on_response_done_event(self, msg_type: str, data: dict, message_raw: str):
+        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Event: response.done (AI turn finished).")
+
+    async def _on_function_call_output_event(self, msg_type: str, data: dict, message_raw: str):
+        function_call_data = data.get("output")
+        if function_call_data:
+            logger.info(f"[OpenAIClient:{self.session_id_from_openai}] Function call received: {function_call_data}")
+            asyncio.create_task(self._execute_function_call(function_call_data, data.get("call_id")))
+
+    async def _on_function_call_arguments_done_event(self, msg_type: str, data: dict, message_raw: str):
+        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] Received function call arguments done event: {str(message_raw)[:500]}")
+        function_name = data.get("name")
+        arguments_str = data.get("arguments", "{}")
+        openai_func_call_id = data.get("call_id")
+
+        try:
+            arguments = json.loads(arguments_str)
+            function_call_data = {
+                "name": function_name,
+                "arguments": arguments
+            }
+            asyncio.create_task(self._execute_function_call(function_call_data, openai_func_call_id))
+        except json.JSONDecodeError:
+            logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Failed to parse function call arguments JSON: {arguments_str}")
+
+    async def _on_user_transcript_event(self, msg_type: str, data: dict, message_raw: str):
+        user_transcript = data.get('transcript', '')
+        if user_transcript.strip():
+            logger.info(f"[OpenAIClient:{self.session_id_from_openai}] User said: \"{user_transcript}\"")
+            asyncio.create_task(self._save_transcript_to_db("user", user_transcript))
+
+    async def _on_speech_boundary_event(self, msg_type: str, data: dict, message_raw: str):
+        # Speech boundary: push out any partially filled uplink batch so VAD sees it without waiting
+        await self.flush_uplink_audio()
+        logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Event: Type='{msg_type}', Snippet='{str(message_raw)[:120]}...'")
+
+    async def _on_debug_event(self, msg_type: str, data: dict, message_raw: str):
+        logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Event: Type='{msg_type}', Snippet='{str(message_raw)[:120]}...'")
+
+    async def _on_info_event(self, msg_type: str, data: dict, message_raw: str):
+        logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Info Event: '{msg_type}'")
+
+    async def _on_unknown_event(self, msg_type: str, data: dict, message_raw: str):
+        # Enhanced logging to catch function call events we might be missing
+        if "function" in msg_type.lower() or "call" in msg_type.lower():
+            logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] *** POTENTIAL FUNCTION CALL EVENT *** Type='{msg_type}': {str(message_raw)[:500]}...")
+        else:
+            logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Unknown Msg Type '{msg_type}': {str(message_raw)[:200]}...")
+
     async def _receive_loop(self):
         logger.info(f"[OpenAIClient:{self.session_id_from_openai}] Starting OpenAI receive loop.")
         try:
+            # No per-message timeout: close() cancels this task, so recv() can simply block
             while not self._stop_event.is_set() and self._websocket and not self._websocket.closed:
-                try:
-                    # Set a timeout for recv() to allow periodic check of _stop_event
-                    message_raw = await asyncio.wait_for(self._websocket.recv(), timeout=1.0)
-                except asyncio.TimeoutError:
-                    continue # Check _stop_event and loop again
-                
-                data = json.loads(message_raw)
-                msg_type = data.get("type")
-
-                if msg_type == "error":
-                    logger.error(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI API Error: {data.get('error', data)}")
-                    # Depending on error, might need to close or attempt recovery
-                    if "session" in str(data.get('error','')).lower() and "not found" in str(data.get('error','')).lower():
-                        logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Fatal session error. Stopping client.")
-                        self._stop_event.set() # Stop the client, session is invalid
-                        break
-                elif msg_type == "response.audio.delta":
-                    audio_data_b64 = data.get("delta")
-                    if audio_data_b64:
-                        try:
-                            # OpenAI sends PCM16 at 24kHz as per our `output_audio_format`
-                            ai_audio_bytes_24khz_pcm16 = base64.b64decode(audio_data_b64)
-                            if ai_audio_bytes_24khz_pcm16:
-                                await self.incoming_openai_audio_queue.put(ai_audio_bytes_24khz_pcm16)
-                                logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] Queued {len(ai_audio_bytes_24khz_pcm16)} bytes of AI audio (24kHz). Queue size: {self.incoming_openai_audio_queue.qsize()}")
-                        except Exception as e_audio_q:
-                            logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Error processing/queuing AI audio delta: {e_audio_q}", exc_info=True)
-                
-                elif msg_type == "response.audio_transcript.delta":
-                    delta_content = data.get('delta')
-                    transcript_text = ""
-                    if isinstance(delta_content, dict): transcript_text = delta_content.get('text', '')
-                    elif isinstance(delta_content, str): transcript_text = delta_content
-                    if transcript_text: logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Tx Delta: \"{transcript_text}\"")
-
-                elif msg_type == "response.audio_transcript.done":
-                    transcript_content = data.get('transcript')
-                    full_transcript = "[No full transcript text provided]"
-                    if isinstance(transcript_content, dict): full_transcript = transcript_content.get('text', '[No text in dict]')
-                    elif isinstance(transcript_content, str): full_transcript = transcript_content
-                    logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Tx FINAL: \"{full_transcript}\"")
-                    # Save assistant transcript to database
-                    if full_transcript.strip() and full_transcript != "[No full transcript text provided]":
-                        asyncio.create_task(self._save_transcript_to_db("agent", full_transcript))
-                
-                elif msg_type == "response.done":
-                    logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Event: response.done (AI turn finished).")
-                
-                elif msg_type == "response.function_call_output":
-                    function_call_data = data.get("output")
-                    if function_call_data:
-                        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] Function call received: {function_call_data}")
-                        asyncio.create_task(self._execute_function_call(function_call_data, data.get("call_id")))
-
-                elif msg_type == "response.function_call_arguments.done":
-                    logger.info(f"[OpenAIClient:{self.session_id_from_openai}] Received function call arguments done event: {str(message_raw)[:500]}")
-                    function_name = data.get("name")
-                    arguments_str = data.get("arguments", "{}")
-                    openai_func_call_id = data.get("call_id")
-                    
-                    try:
-                        arguments = json.loads(arguments_str)
-                        function_call_data = {
-                            "name": function_name,
-                            "arguments": arguments
-                        }
-                        asyncio.create_task(self._execute_function_call(function_call_data, openai_func_call_id))
-                    except json.JSONDecodeError:
-                        logger.error(f"[OpenAIClient:{self.session_id_from_openai}] Failed to parse function call arguments JSON: {arguments_str}")
-                
-                elif msg_type == "conversation.item.input_audio_transcription.completed":
-                    user_transcript = data.get('transcript', '')
-                    if user_transcript.strip():
-                        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] User said: \"{user_transcript}\"")
-                        asyncio.create_task(self._save_transcript_to_db("user", user_transcript))
-                
-                # Log other relevant messages for debugging, less verbosely for frequent ones
-                elif msg_type in ["input_audio_buffer.speech_started", "input_audio_buffer.speech_stopped", 
-                                  "session.updated", "session.created", "response.created", "response.audio.done"]:
-                    logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Event: Type='{msg_type}', Snippet='{str(message_raw)[:120]}...'")
-                elif msg_type in ["input_audio_buffer.committed", "conversation.item.created", 
-                                  "response.output_item.added", "response.content_part.added", 
-                                  "response.content_part.done", "response.output_item.done", 
-                                  "rate_limits.updated"]:
-                    logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Info Event: '{msg_type}'")
-                else:
-                    # Enhanced logging to catch function call events we might be missing
-                    if "function" in msg_type.lower() or "call" in msg_type.lower():
-                        logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] *** POTENTIAL FUNCTION CALL EVENT *** Type='{msg_type}': {str(message_raw)[:500]}...")
-                    else:
-                        logger.info(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI Unknown Msg Type '{msg_type}': {str(message_raw)[:200]}...")
+                message_raw = await self._websocket.recv()
+                if await self._handle_raw_message(message_raw):
+                    break
 
         except websockets.exceptions.ConnectionClosed as e:
             logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] OpenAI WebSocket closed in _receive_loop (Code: {e.code}, Reason: '{e.reason}').")
@@ -870,10 +994,9 @@ INSTRUCTIONS:
             if self.call_id:
                 # Import db_manager here to avoid circular imports
                 from database import db_manager
+                from database.db_writer import db_writer
                 
-                loop = asyncio.get_running_loop()
-                await loop.run_in_executor(None, db_manager.save_call_transcript,
-                                         self.call_id, speaker, message)
+                await db_writer.submit(db_manager.save_call_transcript, self.call_id, speaker, message)
                 logger.debug(f"[OpenAIClient:{self.session_id_from_openai}] Saved transcript: {speaker}: {message[:50]}...")
             else:
                 logger.warning(f"[OpenAIClient:{self.session_id_from_openai}] Cannot save transcript, no call_id available")
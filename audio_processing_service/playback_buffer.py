@@ -0,0 +1,100 @@
+# audio_processing_service/playback_buffer.py
+import sys
+from pathlib import Path
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+
+class AudioRingBuffer:
+    """Bounded byte ring buffer for streamed PCM audio.
+
+    Storage starts at `initial_bytes` (all of `capacity_bytes` if not given) and doubles when a
+    write needs more, up to `capacity_bytes`; a call only pays for the backlog it actually queues.
+    Writes and reads copy through memoryviews, so the per-frame cost does not depend on how much
+    audio is queued. Writes beyond capacity are dropped and counted in `overflow_bytes`. Not
+    thread-safe; meant to be used from a single event loop.
+    """
+
+    def __init__(self, capacity_bytes: int, high_water_bytes: int | None = None, initial_bytes: int | None = None):
+        if capacity_bytes <= 0:
+            raise ValueError(f"capacity_bytes must be positive, got {capacity_bytes}")
+        self._max_capacity = capacity_bytes
+        self._capacity = min(max(1, initial_bytes), capacity_bytes) if initial_bytes else capacity_bytes
+        self._buffer = bytearray(self._capacity)
+        self._view = memoryview(self._buffer)
+        self._read_pos = 0
+        self._size = 0
+        self.high_water_bytes = min(high_water_bytes or capacity_bytes, capacity_bytes)
+        self.overflow_bytes = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._max_capacity
+
+    @property
+    def allocated_bytes(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        return self._size
+
+    def free_space(self) -> int:
+        return self._max_capacity - self._size
+
+    def is_above_high_water(self) -> bool:
+        return self._size >= self.high_water_bytes
+
+    def clear(self):
+        self._read_pos = 0
+        self._size = 0
+
+    def write(self, data) -> int:
+        """Appends any bytes-like object (bytes, bytearray, numpy array). Returns bytes actually stored."""
+        src = memoryview(data).cast('B')
+        length = min(len(src), self._max_capacity - self._size)
+        if length < len(src):
+            self.overflow_bytes += len(src) - length
+        if length == 0:
+            return 0
+        if self._size + length > self._capacity:
+            self._grow(self._size + length)
+
+        write_pos = (self._read_pos + self._size) % self._capacity
+        first = min(length, self._capacity - write_pos)
+        self._view[write_pos:write_pos + first] = src[:first]
+        if first < length:
+            self._view[:length - first] = src[first:length]
+        self._size += length
+        return length
+
+    def read_into(self, dest: memoryview) -> int:
+        """Moves up to len(dest) bytes into `dest` without allocating. Returns bytes copied."""
+        length = min(len(dest), self._size)
+        if length == 0:
+            return 0
+
+        first = min(length, self._capacity - self._read_pos)
+        dest[:first] = self._view[self._read_pos:self._read_pos + first]
+        if first < length:
+            dest[first:length] = self._view[:length - first]
+        self._read_pos = (self._read_pos + length) % self._capacity
+        self._size -= length
+        return length
+
+    def _grow(self, needed: int):
+        """Reallocates to at least `needed` bytes (doubling, capped), unwrapping the queued audio to the start."""
+        capacity = min(self._max_capacity, max(needed, self._capacity * 2))
+        buffer = bytearray(capacity)
+        view = memoryview(buffer)
+        size = self._size
+        first = min(size, self._capacity - self._read_pos)
+        view[:first] = self._view[self._read_pos:self._read_pos + first]
+        if first < size:
+            view[first:size] = self._view[:size - first]
+        self._view.release()
+        self._buffer, self._view, self._capacity = buffer, view, capacity
+        self._read_pos = 0
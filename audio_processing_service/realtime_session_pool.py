@@ -0,0 +1,155 @@
+# audio_processing_service/realtime_session_pool.py
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, Optional
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from common.redis_client import RedisClient
+from audio_processing_service.openai_realtime_client import OpenAIRealtimeClient
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+
+class _WarmSession:
+    def __init__(self, client: OpenAIRealtimeClient, connect_task: asyncio.Task, created_at: float):
+        self.client = client
+        self.connect_task = connect_task
+        self.created_at = created_at
+
+
+class RealtimeSessionPool:
+    """OpenAI Realtime sessions opened while a call is still ringing, keyed by call_id.
+
+    CallAttemptHandler pre-warms a session once Originate is accepted; AudioSocketHandler adopts
+    it when the AudioSocket connects, so the websocket handshake and session.update round trips
+    happen during ringing instead of after answer. Sessions nobody adopts are closed by
+    discard() when the call ends, or by the reaper once they are older than `ttl_s`.
+    """
+
+    def __init__(self, ttl_s: float = app_config.OPENAI_SESSION_PREWARM_TTL_S):
+        self.ttl_s = ttl_s
+        self._sessions: Dict[int, _WarmSession] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "prewarmed": 0,
+            "adopted": 0,
+            "adopt_misses": 0,     # AudioSocket connected with no warm session (disabled, expired or never started)
+            "failed": 0,           # Warm connect failed; the handler fell back to a fresh connect
+            "discarded": 0,
+            "reaped": 0,
+        }
+
+    def prewarm(self, call_id: int, call_specific_prompt: str,
+                redis_client: Optional[RedisClient] = None,
+                audio_format: Optional[str] = None) -> bool:
+        """Starts connecting a session for `call_id` in the background. Returns True if one is (already) warming."""
+        if not app_config.OPENAI_SESSION_PREWARM_ENABLED or not app_config.OPENAI_API_KEY:
+            return False
+        if call_id in self._sessions:
+            return True
+
+        loop = asyncio.get_running_loop()
+        client = OpenAIRealtimeClient(
+            call_specific_prompt=call_specific_prompt,
+            openai_api_key=app_config.OPENAI_API_KEY,
+            loop=loop,
+            redis_client=redis_client
+        )
+        connect_task = loop.create_task(client.connect_and_initialize(audio_format=audio_format or app_config.OPENAI_REALTIME_AUDIO_FORMAT))
+        self._sessions[call_id] = _WarmSession(client, connect_task, loop.time())
+        self.stats["prewarmed"] += 1
+        logger.info(f"[RealtimeSessionPool] Pre-warming OpenAI session for AppCallID={call_id} ({len(self._sessions)} warm).")
+
+        if not self._reaper_task or self._reaper_task.done():
+            self._reaper_task = loop.create_task(self._reap_expired_sessions())
+        return True
+
+    async def adopt(self, call_id: int, audio_format: Optional[str] = None) -> Optional[OpenAIRealtimeClient]:
+        """Hands over the warm session for `call_id`, waiting for its connect to finish. None if there is no usable one."""
+        session = self._sessions.pop(call_id, None)
+        if not session:
+            self.stats["adopt_misses"] += 1
+            return None
+
+        try:
+            # Still connecting if the call was answered very quickly; finishing it is never slower than starting over
+            connected = await session.connect_task
+        except asyncio.CancelledError:
+            await self._close_session(call_id, session)
+            raise
+        except Exception as e:
+            logger.warning(f"[RealtimeSessionPool] Warm session for AppCallID={call_id} failed to connect: {e}")
+            connected = False
+
+        client = session.client
+        if not connected or not client.is_connected:
+            self.stats["failed"] += 1
+            await self._close_session(call_id, session)
+            return None
+        if audio_format and client.audio_format != audio_format:
+            logger.warning(f"[RealtimeSessionPool] Warm session for AppCallID={call_id} uses {client.audio_format}, handler wants {audio_format}. Discarding.")
+            self.stats["failed"] += 1
+            await self._close_session(call_id, session)
+            return None
+
+        self.stats["adopted"] += 1
+        warm_for_s = asyncio.get_running_loop().time() - session.created_at
+        logger.info(f"[RealtimeSessionPool] AppCallID={call_id} adopted warm session {client.session_id_from_openai} (warming started {warm_for_s:.2f}s before connect).")
+        return client
+
+    async def discard(self, call_id: int):
+        """Closes the warm session for `call_id` if nobody adopted it (call failed, was not answered, etc.)."""
+        session = self._sessions.pop(call_id, None)
+        if session:
+            self.stats["discarded"] += 1
+            logger.info(f"[RealtimeSessionPool] Discarding unused warm session for AppCallID={call_id}.")
+            await self._close_session(call_id, session)
+
+    async def close_all(self):
+        if self._reaper_task and not self._reaper_task.done():
+            self._reaper_task.cancel()
+        for call_id in list(self._sessions):
+            await self.discard(call_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "warm_sessions": len(self._sessions)}
+
+    async def _close_session(self, call_id: int, session: _WarmSession):
+        if not session.connect_task.done():
+            session.connect_task.cancel()
+            try:
+                await session.connect_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        try:
+            await session.client.close()
+        except Exception as e:
+            logger.error(f"[RealtimeSessionPool] Error closing warm session for AppCallID={call_id}: {e}")
+
+    async def _reap_expired_sessions(self):
+        """Closes sessions older than ttl_s; exits once the pool is empty (prewarm restarts it)."""
+        interval = max(1.0, min(10.0, self.ttl_s / 2))
+        try:
+            while self._sessions:
+                await asyncio.sleep(interval)
+                now = asyncio.get_running_loop().time()
+                expired = [call_id for call_id, session in self._sessions.items() if now - session.created_at > self.ttl_s]
+                for call_id in expired:
+                    session = self._sessions.pop(call_id, None)
+                    if session:
+                        self.stats["reaped"] += 1
+                        logger.warning(f"[RealtimeSessionPool] Reaping warm session for AppCallID={call_id} unused after {self.ttl_s:.0f}s.")
+                        await self._close_session(call_id, session)
+        except asyncio.CancelledError:
+            pass
+
+
+realtime_session_pool = RealtimeSessionPool()
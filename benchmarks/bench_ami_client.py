@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+AMI client benchmark
+
+Usage: python benchmarks/bench_ami_client.py [--actions 5000] [--concurrency 1,10,50] [--pool-sizes 1,3,5] [--response-latency-ms 2] [--noise-events-per-s 5000] [--calls 100]
+
+Starts load_testing/ami_stub_server.py in-process and drives AsteriskAmiClient against it:
+
+  actions  Ping round trips per second with N callers sending concurrently, for each AMI pool size
+           (actions pipelined on each session and balanced across the action sessions)
+  events   the stub's unrelated channel events with --calls call handlers listening, as generic
+           listeners (every handler sees every event, the pre-router pattern), as event_router
+           routes (no handler sees them), or as routes declaring CallAttemptHandler's event set
+           so the session is filtered on the server (the stub drops the noise): events delivered
+           per second and process CPU time per generated event (client and stub share the process)
+
+The stub answers each action after --response-latency-ms and handles one action at a time per
+session, like Asterisk's per-session manager thread, so pool size sets the parallelism.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from call_processor_service.asterisk_ami_client import AsteriskAmiClient
+from call_processor_service.call_attempt_handler import CALL_AMI_EVENTS
+from load_testing.ami_stub_server import AmiStubServer
+
+BENCH_PORT = 15038
+
+
+async def new_client(pool_size: int = 1) -> AsteriskAmiClient:
+    client = AsteriskAmiClient(pool_size=pool_size)
+    client.host, client.port = "127.0.0.1", BENCH_PORT
+    client.username = client.secret = "bench"
+    if not await client.connect_and_login():
+        raise SystemExit("Could not log in to the AMI stub")
+    return client
+
+
+async def bench_actions(actions: int, concurrency: int, pool_size: int) -> dict:
+    client = await new_client(pool_size)
+    remaining = [actions]
+    failed = [0]
+
+    async def caller():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            response = await client.send_action("Ping", timeout=10.0)
+            if not response or response.get("Ping") != "Pong":
+                failed[0] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    max_pending = max(connection["max_pending"] for connection in client.get_stats()["connections"])
+    await client.close()
+    return {"actions_per_s": actions / elapsed, "failed": failed[0], "max_pending": max_pending}
+
+
+async def bench_events(server: AmiStubServer, events_per_s: float, seconds: float, calls: int, mode: str) -> dict:
+    client = await new_client()
+
+    async def handler(event):
+        # Stands in for CallAttemptHandler._process_ami_event rejecting another call's event
+        return event.get("Uniqueid") == "not-this-call"
+
+    for call in range(calls):
+        if mode == "fanout":
+            client.add_generic_event_listener(lambda event, call=call: handler(event))
+        else:
+            client.event_router.add_route(f"call:{call}", handler, keys=[("VarSet", f"bench-call-{call}")],
+                                          events=CALL_AMI_EVENTS if mode == "filtered" else None)
+    await client.update_event_subscription()
+    server.noise_events_per_s = events_per_s
+    server._noise_task = asyncio.create_task(server._run_noise())
+    events_before = client.stats["events"]
+    generated_before = server.stats["events_sent"] + server.stats["events_filtered"]
+    cpu_start = time.process_time()
+    await asyncio.sleep(seconds)
+    cpu_s = time.process_time() - cpu_start
+    server._noise_task.cancel()
+    events = client.stats["events"] - events_before
+    generated = server.stats["events_sent"] + server.stats["events_filtered"] - generated_before
+    await client.close()
+    return {"events_per_s": events / seconds, "cpu_us_per_event": cpu_s / max(1, generated) * 1e6}
+
+
+async def main_async(args):
+    server = AmiStubServer(port=BENCH_PORT, response_latency_ms=args.response_latency_ms)
+    await server.start()
+    try:
+        print(f"{args.actions} Ping actions per run, stub response latency {args.response_latency_ms}ms")
+        for pool_size in args.pool_sizes:
+            for concurrency in args.concurrency:
+                result = await bench_actions(args.actions, concurrency, pool_size)
+                print(f"pool {pool_size:<3} concurrency {concurrency:<4} {result['actions_per_s']:9.0f} actions/s   "
+                      f"max {result['max_pending']} pending per session   {result['failed']} failed")
+        for mode in ("fanout", "routed", "filtered"):
+            result = await bench_events(server, args.noise_events_per_s, args.event_seconds, args.calls, mode)
+            print(f"events {mode:<8} {result['events_per_s']:9.0f} events/s with {args.calls} calls listening   "
+                  f"{result['cpu_us_per_event']:7.1f} us CPU per event")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AsteriskAmiClient against the local AMI stub")
+    parser.add_argument("--actions", type=int, default=5000, help="Ping actions per concurrency level")
+    parser.add_argument("--concurrency", type=lambda s: [int(x) for x in s.split(",")], default=[1, 10, 50],
+                        help="Comma-separated numbers of concurrent callers")
+    parser.add_argument("--pool-sizes", type=lambda s: [int(x) for x in s.split(",")], default=[1, 3, 5],
+                        help="Comma-separated AMI pool sizes (1 = single shared session)")
+    parser.add_argument("--response-latency-ms", type=float, default=2.0, help="Stub delay before each action response")
+    parser.add_argument("--noise-events-per-s", type=float, default=5000.0, help="Unrelated events per second for the event run")
+    parser.add_argument("--event-seconds", type=float, default=3.0)
+    parser.add_argument("--calls", type=int, default=100, help="Call handlers listening during the event runs")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
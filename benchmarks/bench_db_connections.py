@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+SQLite connection benchmark
+
+Usage: python benchmarks/bench_db_connections.py [--ops 20000] [--threads 8] [--readers 2] [--calls 200]
+
+Runs the same mix of db_manager calls a busy call server makes (call status updates,
+transcript inserts, call lookups, active-call counts) from a thread pool, the way
+run_in_executor does, against two scratch databases:
+
+  legacy      a new sqlite3 connection per call, rollback journal (the previous get_db_connection)
+  persistent  per-thread persistent connections, WAL, synchronous=NORMAL, mmap (get_db_connection now)
+
+--readers adds threads that loop over dashboard-style reads for the whole run. Reports
+ops/sec and how many operations failed (e.g. "database is locked").
+"""
+
+import argparse
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from database import db_manager
+from database.models import CampaignCreate, TaskCreate, CallCreate, CallStatus
+
+persistent_get_db_connection = db_manager.get_db_connection
+
+
+def legacy_get_db_connection(readonly: bool = False):
+    """The previous get_db_connection(): a fresh connection per call, closed by the caller."""
+    conn = sqlite3.connect(db_manager.DATABASE_FILE)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+def prepare_database(path: Path, mode: str, calls: int) -> tuple:
+    db_manager.DATABASE_FILE = str(path)
+    db_manager.get_db_connection = legacy_get_db_connection if mode == "legacy" else persistent_get_db_connection
+    if mode == "legacy":
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode = DELETE;")
+        conn.close()
+    db_manager.initialize_database()
+
+    user = db_manager.get_or_create_user("benchmark")
+    campaign = db_manager.create_campaign(CampaignCreate(user_id=user.id, batch_id=f"bench-{uuid.uuid4().hex[:8]}",
+                                                         user_goal_description="Connection benchmark"))
+    now = datetime.now()
+    task_id = db_manager.create_task(TaskCreate(campaign_id=campaign.id, user_id=user.id,
+                                                user_task_description="Connection benchmark",
+                                                generated_agent_prompt="benchmark", phone_number="0000000000",
+                                                initial_schedule_time=now, next_action_time=now))
+    call_ids = []
+    for attempt in range(1, calls + 1):
+        call = db_manager.create_call_attempt(CallCreate(task_id=task_id, attempt_number=attempt,
+                                                         prompt_used="benchmark", status=CallStatus.ANSWERED))
+        call_ids.append(call.id)
+    return task_id, call_ids
+
+
+def run_operation(i: int, task_id: int, call_ids: list) -> bool:
+    call_id = call_ids[i % len(call_ids)]
+    kind = i % 10
+    if kind < 4:
+        status = CallStatus.ANSWERED if kind % 2 else CallStatus.DIALING
+        return db_manager.update_call_status(call_id, status)
+    if kind < 6:
+        return db_manager.save_call_transcript(call_id, "user", f"benchmark utterance {i}") is not None
+    if kind < 9:
+        return db_manager.get_call_by_id(call_id) is not None
+    db_manager.get_active_calls_count()
+    return True
+
+
+def dashboard_reader(task_id: int, stop: threading.Event, counter: list):
+    while not stop.is_set():
+        db_manager.get_calls_for_task(task_id)
+        db_manager.get_recent_task_events(limit=50)
+        counter[0] += 1
+
+
+def benchmark(mode: str, workdir: Path, ops: int, threads: int, readers: int, calls: int) -> dict:
+    task_id, call_ids = prepare_database(workdir / f"{mode}.db", mode, calls)
+    order = list(range(ops))
+    random.Random(1).shuffle(order)
+
+    stop = threading.Event()
+    reader_rounds = [0]
+    reader_threads = [threading.Thread(target=dashboard_reader, args=(task_id, stop, reader_rounds), daemon=True)
+                      for _ in range(readers)]
+    for thread in reader_threads:
+        thread.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda i: run_operation(i, task_id, call_ids), order))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for thread in reader_threads:
+        thread.join()
+    return {"ops_per_s": ops / elapsed, "failed": results.count(False), "elapsed_s": elapsed,
+            "reader_rounds_per_s": reader_rounds[0] / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-call vs persistent WAL SQLite connections")
+    parser.add_argument("--ops", type=int, default=20000, help="Operations per mode")
+    parser.add_argument("--threads", type=int, default=8, help="Worker threads issuing operations (like the default executor)")
+    parser.add_argument("--readers", type=int, default=2, help="Concurrent dashboard reader threads")
+    parser.add_argument("--calls", type=int, default=200, help="Call rows the operations are spread over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_db_") as tmp:
+        print(f"{args.ops} operations, {args.threads} worker threads, {args.readers} dashboard readers, SQLite {sqlite3.sqlite_version}")
+        for mode in ("legacy", "persistent"):
+            result = benchmark(mode, Path(tmp), args.ops, args.threads, args.readers, args.calls)
+            print(f"{mode:<11} {result['ops_per_s']:9.0f} ops/s   {result['failed']:5d} failed   "
+                  f"{result['reader_rounds_per_s']:7.0f} dashboard reads/s   ({result['elapsed_s']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+DTMF benchmark
+
+Usage: python benchmarks/bench_dtmf.py [--digits 0123456789] [--response-latency-ms 20] [--runs 3]
+
+Compares the time to get a digit string to the far end:
+
+  ami      one PlayDTMF action per digit against load_testing/ami_stub_server.py, waiting for each
+           response and pacing digits like the fallback path (legacy: fixed 250ms gap)
+  inband   DtmfGenerator output written to an AudioSocket playback buffer; the digits then take
+           their airtime (DTMF_TONE_ON_MS + DTMF_TONE_OFF_MS per digit) with no AMI round trips
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from config.app_config import app_config
+from audio_processing_service.dtmf_generator import dtmf_generator
+from audio_processing_service.playback_buffer import AudioRingBuffer
+from call_processor_service.asterisk_ami_client import AsteriskAmiClient
+from load_testing.ami_stub_server import AmiStubServer
+
+BENCH_PORT = 15039
+
+
+async def send_ami(client: AsteriskAmiClient, digits: str, gap_s: float) -> float:
+    start = time.perf_counter()
+    for digit in digits:
+        await client.send_action("PlayDTMF", timeout=3.0, Channel="PJSIP/bench-00000001", Digit=digit,
+                                 Duration=int(app_config.DTMF_TONE_ON_MS))
+        await asyncio.sleep(gap_s)
+    return time.perf_counter() - start
+
+
+def send_inband(digits: str) -> float:
+    buffer = AudioRingBuffer(8000 * 2 * 60)
+    start = time.perf_counter()
+    pcm, _ = dtmf_generator.generate(digits)
+    buffer.write(pcm)
+    return time.perf_counter() - start
+
+
+async def main_async(args):
+    server = AmiStubServer(port=BENCH_PORT, response_latency_ms=args.response_latency_ms)
+    await server.start()
+    client = AsteriskAmiClient(pool_size=1)
+    client.host, client.port = "127.0.0.1", BENCH_PORT
+    client.username = client.secret = "bench"
+    try:
+        if not await client.connect_and_login():
+            raise SystemExit("Could not log in to the AMI stub")
+        digits = args.digits
+        tone_gap_s = (app_config.DTMF_TONE_ON_MS + app_config.DTMF_TONE_OFF_MS) / 1000.0
+        airtime_s = len(digits) * dtmf_generator.digit_duration_s
+        print(f"{len(digits)} digits, stub response latency {args.response_latency_ms}ms, "
+              f"tone {app_config.DTMF_TONE_ON_MS:.0f}ms on / {app_config.DTMF_TONE_OFF_MS:.0f}ms off")
+        for label, gap_s in (("ami legacy", 0.25), ("ami fallback", tone_gap_s)):
+            elapsed = min([await send_ami(client, digits, gap_s) for _ in range(args.runs)])
+            print(f"{label:<13} {elapsed * 1000:8.1f} ms   {len(digits)} AMI round trips")
+        queue_s = min(send_inband(digits) for _ in range(args.runs))
+        print(f"{'inband':<13} {(queue_s + airtime_s) * 1000:8.1f} ms   "
+              f"({queue_s * 1e6:.1f} us to queue + {airtime_s * 1000:.0f} ms airtime, 0 AMI round trips)")
+    finally:
+        await client.close()
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare AMI PlayDTMF with in-band AudioSocket DTMF")
+    parser.add_argument("--digits", default="0123456789")
+    parser.add_argument("--response-latency-ms", type=float, default=20.0, help="Stub delay before each action response")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+OpenAI Realtime receive-path benchmark
+
+Usage: python benchmarks/bench_realtime_events.py [--events capture.jsonl] [--turns 200] [--repeat 3]
+
+Replays a Realtime server event stream (one raw websocket message per line) through
+the previous receive path (wait_for(recv) + json.loads + if/elif chain) and through
+OpenAIRealtimeClient._handle_raw_message, and reports the CPU cost per event. Without
+--events a stream is synthesised with the event mix of a spoken response turn:
+session/response bookkeeping, ~100 ms audio deltas, transcript deltas and a done event.
+Use --write-events to save that synthetic stream as a .jsonl file.
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_processing_service.openai_realtime_client import OpenAIRealtimeClient, _json_loads
+
+AUDIO_DELTA_MS = 100
+PCM16_24KHZ_BYTES_PER_MS = 48
+
+
+def synthesize_turn(turn: int, deltas_per_turn: int, rng: np.random.Generator) -> list:
+    """Raw messages for one assistant turn, keyed the way the Realtime API sends them."""
+    response_id = f"resp_{turn:06d}"
+    item_id = f"item_{turn:06d}"
+    events = [
+        {"type": "input_audio_buffer.speech_started", "event_id": f"event_{turn}_a", "audio_start_ms": turn * 4000, "item_id": item_id},
+        {"type": "input_audio_buffer.speech_stopped", "event_id": f"event_{turn}_b", "audio_end_ms": turn * 4000 + 1500, "item_id": item_id},
+        {"type": "input_audio_buffer.committed", "event_id": f"event_{turn}_c", "previous_item_id": None, "item_id": item_id},
+        {"type": "response.created", "event_id": f"event_{turn}_d", "response": {"id": response_id, "object": "realtime.response", "status": "in_progress", "output": []}},
+        {"type": "response.output_item.added", "event_id": f"event_{turn}_e", "response_id": response_id, "output_index": 0, "item": {"id": item_id, "type": "message", "role": "assistant"}},
+        {"type": "response.content_part.added", "event_id": f"event_{turn}_f", "response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0, "part": {"type": "audio", "transcript": ""}},
+    ]
+    audio_bytes = AUDIO_DELTA_MS * PCM16_24KHZ_BYTES_PER_MS
+    for i in range(deltas_per_turn):
+        pcm = rng.integers(-8000, 8000, audio_bytes // 2, dtype=np.int16).tobytes()
+        events.append({"type": "response.audio.delta", "event_id": f"event_{turn}_ad{i}", "response_id": response_id,
+                       "item_id": item_id, "output_index": 0, "content_index": 0, "delta": base64.b64encode(pcm).decode("ascii")})
+        if i % 3 == 0:
+            events.append({"type": "response.audio_transcript.delta", "event_id": f"event_{turn}_td{i}", "response_id": response_id,
+                           "item_id": item_id, "output_index": 0, "content_index": 0, "delta": " word"})
+    events.extend([
+        {"type": "response.audio.done", "event_id": f"event_{turn}_g", "response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0},
+        {"type": "response.content_part.done", "event_id": f"event_{turn}_h", "response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0},
+        {"type": "response.output_item.done", "event_id": f"event_{turn}_i", "response_id": response_id, "output_index": 0, "item": {"id": item_id}},
+        {"type": "response.done", "event_id": f"event_{turn}_j", "response": {"id": response_id, "status": "completed", "usage": {"total_tokens": 512}}},
+        {"type": "rate_limits.updated", "event_id": f"event_{turn}_k", "rate_limits": [{"name": "tokens", "limit": 20000, "remaining": 19000, "reset_seconds": 3}]},
+    ])
+    return [json.dumps(event, separators=(",", ":")) for event in events]
+
+
+class ReplayWebSocket:
+    """Just enough of a websocket for the receive loops: recv() returns the next recorded message."""
+
+    def __init__(self, messages: list):
+        self._iter = iter(messages)
+
+    async def recv(self):
+        return next(self._iter)
+
+
+async def run_legacy(messages: list, audio_queue: asyncio.Queue) -> float:
+    """Previous receive path: per-message wait_for, full json.loads, then the if/elif chain."""
+    websocket = ReplayWebSocket(messages)
+    start = time.process_time()
+    for _ in range(len(messages)):
+        message_raw = await asyncio.wait_for(websocket.recv(), timeout=1.0)
+        data = json.loads(message_raw)
+        msg_type = data.get("type")
+        if msg_type == "error":
+            pass
+        elif msg_type == "response.audio.delta":
+            audio_data_b64 = data.get("delta")
+            if audio_data_b64:
+                audio_queue.put_nowait(base64.b64decode(audio_data_b64))
+        elif msg_type in ("response.audio_transcript.delta", "response.audio_transcript.done", "response.done",
+                          "response.function_call_output", "response.function_call_arguments.done",
+                          "conversation.item.input_audio_transcription.completed"):
+            pass
+        elif msg_type in ["input_audio_buffer.speech_started", "input_audio_buffer.speech_stopped"]:
+            pass
+        elif msg_type in ["session.updated", "session.created", "response.created", "response.audio.done"]:
+            pass
+    elapsed = time.process_time() - start
+    _drain(audio_queue)
+    return elapsed
+
+
+async def run_dispatch(client: OpenAIRealtimeClient, messages: list) -> float:
+    websocket = ReplayWebSocket(messages)
+    start = time.process_time()
+    for _ in range(len(messages)):
+        await client._handle_raw_message(await websocket.recv())
+    elapsed = time.process_time() - start
+    _drain(client.incoming_openai_audio_queue)
+    return elapsed
+
+
+def _drain(queue: asyncio.Queue):
+    while not queue.empty():
+        queue.get_nowait()
+
+
+async def benchmark(messages: list, repeat: int):
+    client = OpenAIRealtimeClient(call_specific_prompt="benchmark", openai_api_key="unused",
+                                  loop=asyncio.get_running_loop())
+    # Unbounded so the replay never blocks on the consumer; call_id stays None so no DB writes happen
+    client.incoming_openai_audio_queue = asyncio.Queue()
+    legacy_queue: asyncio.Queue = asyncio.Queue()
+
+    audio_events = sum(1 for m in messages if m.startswith('{"type":"response.audio.delta"'))
+    print(f"{len(messages)} events ({audio_events} audio deltas, {sum(len(m) for m in messages) / 1e6:.1f} MB), "
+          f"JSON backend: {_json_loads.__module__}")
+
+    best = {}
+    for _ in range(repeat):
+        for name, run in (("legacy", lambda: run_legacy(messages, legacy_queue)),
+                          ("dispatch", lambda: run_dispatch(client, messages))):
+            elapsed = await run()
+            best[name] = min(best.get(name, elapsed), elapsed)
+    for name, cpu_s in best.items():
+        print(f"{name:<10} {cpu_s / len(messages) * 1e6:8.2f} us/event   {cpu_s * 1000:8.1f} ms total (best of {repeat})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the OpenAI Realtime event receive path")
+    parser.add_argument("--events", type=Path, help="Recorded event stream (.jsonl, one raw server message per line)")
+    parser.add_argument("--turns", type=int, default=200, help="Synthetic assistant turns when --events is not given")
+    parser.add_argument("--deltas-per-turn", type=int, default=40, help="Audio deltas per synthetic turn (100 ms each)")
+    parser.add_argument("--write-events", type=Path, help="Save the synthetic stream to this .jsonl file and exit")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.events:
+        messages = [line.rstrip("\n") for line in args.events.read_text(encoding="utf-8").splitlines() if line.strip()]
+    else:
+        rng = np.random.default_rng(1)
+        messages = [m for turn in range(args.turns) for m in synthesize_turn(turn, args.deltas_per_turn, rng)]
+
+    if args.write_events:
+        args.write_events.write_text("\n".join(messages) + "\n", encoding="utf-8")
+        print(f"Wrote {len(messages)} events to {args.write_events}")
+        return
+
+    asyncio.run(benchmark(messages, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+AudioSocket resampler benchmark
+
+Usage: python benchmarks/bench_resampler.py [--calls 200] [--seconds 5]
+
+Simulates N concurrent calls, each pushing one 20 ms caller frame (8 kHz -> 24 kHz)
+and one 20 ms AI frame (24 kHz -> 8 kHz) per tick, and reports the per-frame CPU
+cost of the legacy np.interp path versus the streaming polyphase resampler.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
+
+from audio_processing_service.audio_resampler import PolyphaseResampler, resample_audio
+
+AST_SAMPLE_RATE = 8000
+OPENAI_SAMPLE_RATE = 24000
+FRAME_MS = 20
+
+
+def make_frames(sample_rate: int, ticks: int, seed: int) -> list:
+    """Speech-like test signal (two tones plus noise) split into 20 ms frames."""
+    rng = np.random.default_rng(seed)
+    samples_per_frame = sample_rate * FRAME_MS // 1000
+    t = np.arange(samples_per_frame * ticks) / sample_rate
+    signal = 6000 * np.sin(2 * np.pi * 310 * t) + 3000 * np.sin(2 * np.pi * 1250 * t) + rng.normal(0, 500, t.size)
+    pcm = np.clip(signal, -32768, 32767).astype(np.int16)
+    return [pcm[i * samples_per_frame:(i + 1) * samples_per_frame] for i in range(ticks)]
+
+
+def run_legacy(calls: int, up_frames: list, down_frames: list, gain: float) -> float:
+    start = time.process_time()
+    for up_frame, down_frame in zip(up_frames, down_frames):
+        for _ in range(calls):
+            resample_audio(up_frame, AST_SAMPLE_RATE, OPENAI_SAMPLE_RATE)
+            down = resample_audio(down_frame, OPENAI_SAMPLE_RATE, AST_SAMPLE_RATE)
+            np.clip(down.astype(np.float32) * gain, -32768.0, 32767.0).astype(np.int16)
+    return time.process_time() - start
+
+
+def run_polyphase(calls: int, up_frames: list, down_frames: list, gain: float) -> float:
+    upsamplers = [PolyphaseResampler(AST_SAMPLE_RATE, OPENAI_SAMPLE_RATE) for _ in range(calls)]
+    downsamplers = [PolyphaseResampler(OPENAI_SAMPLE_RATE, AST_SAMPLE_RATE, gain=gain) for _ in range(calls)]
+    start = time.process_time()
+    for up_frame, down_frame in zip(up_frames, down_frames):
+        for i in range(calls):
+            upsamplers[i].process(up_frame)
+            downsamplers[i].process(down_frame)
+    return time.process_time() - start
+
+
+def report(name: str, cpu_s: float, calls: int, ticks: int):
+    frames = calls * ticks * 2  # one frame in each direction per call per tick
+    per_frame_us = cpu_s / frames * 1e6
+    # Fraction of one core needed to keep up with `calls` real-time calls
+    core_load = cpu_s / (ticks * FRAME_MS / 1000)
+    print(f"{name:<12} {per_frame_us:8.1f} us/frame   {cpu_s * 1000 / ticks:7.2f} ms per 20ms tick   {core_load * 100:6.1f}% of one core")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AudioSocket resampling at N concurrent calls")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--gain", type=float, default=2.0)
+    args = parser.parse_args()
+
+    ticks = int(args.seconds * 1000 / FRAME_MS)
+    up_frames = make_frames(AST_SAMPLE_RATE, ticks, seed=1)
+    down_frames = make_frames(OPENAI_SAMPLE_RATE, ticks, seed=2)
+
+    print(f"Resampling {args.calls} concurrent calls for {args.seconds:.1f}s of audio ({ticks} ticks, both directions)")
+    report("np.interp", run_legacy(args.calls, up_frames, down_frames, args.gain), args.calls, ticks)
+    report("polyphase", run_polyphase(args.calls, up_frames, down_frames, args.gain), args.calls, ticks)
+
+
+if __name__ == "__main__":
+    main()
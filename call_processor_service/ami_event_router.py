@@ -0,0 +1,227 @@
+# call_processor_service/ami_event_router.py
+import asyncio
+import itertools
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+# Route key kinds and the event headers looked up for each one
+ROUTE_KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "ActionID": ("ActionID",),
+    "Uniqueid": ("Uniqueid", "DestUniqueID"),
+    "Linkedid": ("Linkedid", "DestLinkedid"),
+    "Channel": ("Channel", "DestChannel"),
+}
+VARSET_KEY = "VarSet" # Matches a VarSet event whose Value, or one "|"-separated part of it, equals the token
+ANCHOR_KEYS = ("ActionID", VARSET_KEY) # Keys that identify a call before its Asterisk ids are known
+ROUTE_MAX_QUEUE = 1000 # Events waiting for one route's callback before the oldest are dropped
+
+AmiEventCallback = Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]
+# Event name -> None (every event of that name) or a regex the wanted events of that name contain,
+# used to build the AMI session's server-side event filter
+EventDemand = Dict[str, Optional[str]]
+
+
+class EventRoute:
+    """One subscriber's slice of the AMI event stream, delivered in arrival order by a single worker.
+
+    With follow_anchor=True, an event matched by an ActionID or VarSet key also adds its Uniqueid
+    and Linkedid to the route at routing time, so the call's later channel events (DialBegin,
+    Hangup on either leg) are routed without waiting for the callback to learn the ids.
+    `events` lists the event names the callback uses (None: any), so the AMI session can filter
+    the rest out on the server.
+    """
+
+    def __init__(self, router: "AmiEventRouter", route_id: int, name: str,
+                 callback: AmiEventCallback, follow_anchor: bool, events: Optional[EventDemand]):
+        self.router = router
+        self.route_id = route_id
+        self.name = name
+        self.callback = callback
+        self.follow_anchor = follow_anchor
+        self.events = dict(events) if events is not None else None
+        self.keys: Set[Tuple[str, str]] = set()
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._worker: Optional[asyncio.Task] = None
+        self.closed = False
+        self.stats: Dict[str, int] = {"delivered": 0, "dropped": 0, "errors": 0, "max_queue_depth": 0}
+
+    def add_key(self, kind: str, value: Optional[str]):
+        if value and not self.closed:
+            self.router._index_key(self, kind, str(value))
+
+    def remove_key(self, kind: str, value: Optional[str]):
+        if value:
+            self.router._unindex_key(self, kind, str(value))
+
+    def close(self):
+        """Stops routing to this route. Events already queued are still delivered."""
+        if not self.closed:
+            self.closed = True
+            self.router._remove_route(self)
+
+    def _enqueue(self, event: Dict[str, Any]):
+        if len(self._queue) >= ROUTE_MAX_QUEUE:
+            self._queue.popleft()
+            self.stats["dropped"] += 1
+        self._queue.append(event)
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], len(self._queue))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._drain())
+
+    async def _drain(self):
+        while self._queue:
+            event = self._queue.popleft()
+            try:
+                await self.callback(event)
+                self.stats["delivered"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                logger.error(f"[AmiEventRouter:{self.name}] Callback failed for {event.get('Event')}: {e}", exc_info=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "keys": len(self.keys), "queued": len(self._queue), **self.stats}
+
+
+class AmiEventRouter:
+    """Routes AMI events to the routes indexed under their ActionID, Uniqueid, Linkedid, Channel or VarSet value.
+
+    Each lookup is a dict hit per event header, so the cost per event does not grow with the number
+    of active calls, and a call handler only sees events for its own channels. An event is delivered
+    at most once per route even if several of its keys match.
+
+    Events are routed on the event loop, straight from the AMI client's frame reader. There is no
+    batched hand-off through call_soon_threadsafe: since the AMI client became native asyncio it
+    has no reader thread, so events never cross threads.
+    """
+
+    def __init__(self):
+        self._index: Dict[Tuple[str, str], Set[EventRoute]] = {}
+        self._routes: Dict[int, EventRoute] = {}
+        self._route_ids = itertools.count(1)
+        self.stats: Dict[str, int] = {"events": 0, "routed": 0, "unrouted": 0, "deliveries": 0}
+        self.key_hits: Dict[str, int] = {kind: 0 for kind in (*ROUTE_KEY_FIELDS, VARSET_KEY)}
+        # Reference counts of the events open routes want; on_demand_change fires when the set changes
+        self._event_demand: Dict[Tuple[str, Optional[str]], int] = {}
+        self._unfiltered_routes = 0
+        self.on_demand_change: Optional[Callable[[], None]] = None
+
+    def add_route(self, name: str, callback: AmiEventCallback, follow_anchor: bool = True,
+                  keys: Iterable[Tuple[str, Optional[str]]] = (),
+                  events: Optional[EventDemand] = None) -> EventRoute:
+        route = EventRoute(self, next(self._route_ids), name, callback, follow_anchor, events)
+        self._routes[route.route_id] = route
+        for kind, value in keys:
+            route.add_key(kind, value)
+        self._update_demand(route, +1)
+        return route
+
+    def event_demand(self) -> Optional[Dict[str, Set[Optional[str]]]]:
+        """Events the open routes want, by name, or None if some route wants every event."""
+        if self._unfiltered_routes:
+            return None
+        demand: Dict[str, Set[Optional[str]]] = {}
+        for name, match in self._event_demand:
+            demand.setdefault(name, set()).add(match)
+        return demand
+
+    def route(self, event: Dict[str, Any]) -> bool:
+        """Queues `event` for every route it matches. Returns False if no route wanted it."""
+        self.stats["events"] += 1
+        matched: List[EventRoute] = []
+        anchored: List[EventRoute] = []
+        index = self._index
+        if index:
+            for kind, fields in ROUTE_KEY_FIELDS.items():
+                for field in fields:
+                    value = event.get(field)
+                    if value:
+                        routes = index.get((kind, value))
+                        if routes:
+                            self.key_hits[kind] += 1
+                            matched.extend(routes)
+                            if kind == "ActionID":
+                                anchored.extend(routes)
+            if event.get("Event") == "VarSet":
+                value = event.get("Value") or ""
+                for token in {value, *value.split("|")}:
+                    routes = index.get((VARSET_KEY, token)) if token else None
+                    if routes:
+                        self.key_hits[VARSET_KEY] += 1
+                        matched.extend(routes)
+                        anchored.extend(routes)
+
+        if not matched:
+            self.stats["unrouted"] += 1
+            return False
+        self.stats["routed"] += 1
+
+        for route in anchored:
+            if route.follow_anchor:
+                route.add_key("Uniqueid", event.get("Uniqueid"))
+                route.add_key("Linkedid", event.get("Linkedid") or event.get("Uniqueid"))
+
+        delivered: Set[int] = set()
+        for route in matched:
+            if route.route_id not in delivered:
+                delivered.add(route.route_id)
+                route._enqueue(event)
+        self.stats["deliveries"] += len(delivered)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "key_hits": dict(self.key_hits),
+            "indexed_keys": len(self._index),
+            "routes": [route.get_stats() for route in self._routes.values()],
+        }
+
+    def _index_key(self, route: EventRoute, kind: str, value: str):
+        key = (kind, value)
+        if key not in route.keys:
+            route.keys.add(key)
+            self._index.setdefault(key, set()).add(route)
+
+    def _unindex_key(self, route: EventRoute, kind: str, value: str):
+        key = (kind, value)
+        route.keys.discard(key)
+        routes = self._index.get(key)
+        if routes:
+            routes.discard(route)
+            if not routes:
+                del self._index[key]
+
+    def _remove_route(self, route: EventRoute):
+        for kind, value in list(route.keys):
+            self._unindex_key(route, kind, value)
+        if self._routes.pop(route.route_id, None):
+            self._update_demand(route, -1)
+
+    def _update_demand(self, route: EventRoute, delta: int):
+        changed = False
+        if route.events is None:
+            self._unfiltered_routes += delta
+            changed = self._unfiltered_routes == (1 if delta > 0 else 0)
+        else:
+            for key in route.events.items():
+                count = self._event_demand.get(key, 0) + delta
+                if count > 0:
+                    self._event_demand[key] = count
+                else:
+                    self._event_demand.pop(key, None)
+                changed = changed or count == (1 if delta > 0 else 0)
+        if changed and self.on_demand_change:
+            self.on_demand_change()
@@ -1,22 +1,12 @@
 # call_processor_service/asterisk_ami_client.py
 
 import asyncio
+import itertools
 import sys
 from pathlib import Path
-from typing import Coroutine, Dict, Any, Callable, Awaitable, Optional, Set, Union, List
-# import re # Not directly used by our client code anymore
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 from datetime import datetime
 import uuid
-import threading
-import queue as thread_safe_queue
-import socket 
-import time
-
-# Correct imports for 'asterisk-ami==0.1.7'
-from asterisk import ami # Main module, provides ami.AMIClient
-from asterisk.ami.action import Action, LoginAction, LogoffAction, SimpleAction # Import specific action classes
-from asterisk.ami.response import Response as LibAmiResponse # Alias to avoid conflict if we have our own Response type
-from asterisk.ami.event import Event as LibAmiEvent, EventListener as LibAmiEventListener # For type hinting and understanding
 
 # --- Path Setup ---
 _project_root = Path(__file__).resolve().parent.parent
@@ -26,13 +16,97 @@ if str(_project_root) not in sys.path:
 
 from config.app_config import app_config
 from common.logger_setup import setup_logger
+from call_processor_service.ami_event_router import AmiEventRouter, EventRoute, AmiEventCallback, EventDemand
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
+AMI_FRAME_END = b"\r\n\r\n"
+AMI_STREAM_LIMIT = 1024 * 1024 # Largest AMI frame accepted (big Command/list outputs)
+
+# Event class (manager.conf read permission) Asterisk sends each event under, for the session's
+# "Events:" mask. Wanting an event that is not listed here turns the mask fully on.
+AMI_EVENT_CLASSES: Dict[str, str] = {
+    **dict.fromkeys(("Newchannel", "Newstate", "NewCallerid", "Rename", "Hangup", "HangupRequest", "SoftHangupRequest",
+                     "Dial", "DialBegin", "DialState", "DialEnd", "OriginateResponse", "LocalBridge",
+                     "BridgeCreate", "BridgeEnter", "BridgeLeave", "BridgeDestroy", "Hold", "Unhold"), "call"),
+    **dict.fromkeys(("VarSet", "Newexten", "UserEvent"), "dialplan"),
+    **dict.fromkeys(("DTMFBegin", "DTMFEnd"), "dtmf"),
+    **dict.fromkeys(("RTCPSent", "RTCPReceived"), "reporting"),
+    **dict.fromkeys(("FullyBooted", "Reload", "Shutdown"), "system"),
+    "Cdr": "cdr",
+    "Cel": "cel",
+}
+AMI_FILTER_MATCH_ALL = "Event: " # Whitelist Filter every event passes; undoes narrower filters, which AMI cannot remove
+AMI_CONNECTION_COUNTERS = ("actions_sent", "responses", "events", "action_timeouts", "connects",
+                           "connection_losses", "health_checks", "health_check_failures") # Per pool session, summed in get_stats()
+
+
+def event_subscription(wanted: Optional[Dict[str, Set[Optional[str]]]]) -> Tuple[str, Optional[Set[str]]]:
+    """The "Events:" mask and whitelist Filter regexes that deliver the `wanted` events.
+
+    `wanted` maps event names to None (every event of that name) or regexes their events contain;
+    None means every event, unfiltered. Asterisk matches a filter anywhere in the event text, so
+    "Event: Dial" also lets DialBegin/DialEnd through: the server-side filter is a superset and
+    listeners still check the event name.
+    """
+    if wanted is None:
+        return "on", None
+    filters: Set[str] = set()
+    classes: Set[Optional[str]] = set()
+    for name, matches in wanted.items():
+        classes.add(AMI_EVENT_CLASSES.get(name))
+        if None in matches or not matches:
+            filters.add(f"Event: {name}")
+        else:
+            filters.update(match for match in matches if match)
+    if not classes:
+        return "off", filters
+    return ("on" if None in classes else ",".join(sorted(classes))), filters
+
+
+def parse_ami_frame(raw: bytes) -> Dict[str, str]:
+    """Parses one AMI frame ("Key: Value" lines ended by a blank line) into a dict.
+
+    Repeated keys (Output, Variable, ...) are joined with newlines; lines without a key (the body
+    of a legacy "Response: Follows") are collected under 'Follows'.
+    """
+    frame: Dict[str, str] = {}
+    follows = []
+    for line in raw.decode("utf-8", "replace").split("\r\n"):
+        if not line:
+            continue
+        key, sep, value = line.partition(":")
+        if not sep or " " in key:
+            follows.append(line)
+            continue
+        value = value[1:] if value.startswith(" ") else value
+        if key in frame:
+            frame[key] = f"{frame[key]}\n{value}"
+        else:
+            frame[key] = value
+    if follows:
+        frame["Follows"] = "\n".join(follows)
+    return frame
+
+
+def encode_ami_action(name: str, headers: Dict[str, Any]) -> bytes:
+    """Serialises an action; list values become one header line per item (e.g. several Variable lines)."""
+    lines = [f"Action: {name}"]
+    for key, value in headers.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            lines.extend(f"{key}: {item}" for item in value)
+        else:
+            lines.append(f"{key}: {value}")
+    lines.append("\r\n")
+    return "\r\n".join(lines).encode("utf-8")
+
+
 class AmiAction: # Our internal helper
     def __init__(self, name: str, **kwargs):
         self.name = name
-        self.headers = kwargs # These are the keys for the library's Action objects
+        self.headers = kwargs # Header lines sent after "Action: <name>"
         if 'ActionID' not in self.headers:
             self.headers['ActionID'] = f"{name.lower()}-{datetime.now().timestamp()}-{uuid.uuid4().hex[:8]}"
 
@@ -45,448 +119,533 @@ class AmiAction: # Our internal helper
     def get_action_id(self) -> str:
         return self.headers['ActionID']
 
-class AsteriskAmiClient:
-    def __init__(self):
-        self.host = app_config.ASTERISK_HOST
-        self.port = app_config.ASTERISK_PORT
-        self.username = app_config.ASTERISK_AMI_USER
-        self.secret = app_config.ASTERISK_AMI_SECRET
-
-        self._sync_ami_client: Optional[ami.AMIClient] = None # Use ami.AMIClient
-        self._ami_thread: Optional[threading.Thread] = None
-        self._stop_worker_event = threading.Event()
-        self._action_queue = thread_safe_queue.Queue(maxsize=100)
+class AmiConnection:
+    """One AMI session of AsteriskAmiClient's pool, read continuously by its own reader task.
+
+    Actions written on it may be pipelined; each response is matched to its caller by ActionID and
+    event frames go to the client's dispatcher. A Ping every AMI_KEEPALIVE_INTERVAL_S is the health
+    check (its round trip is kept for get_stats()); when it fails or the socket drops, pending
+    actions fail and the connection reconnects every `connection_retry_delay` seconds. Only the
+    events connection logs in with an event mask; the others log in with "Events: off" and carry
+    actions only.
+    """
+    def __init__(self, client: "AsteriskAmiClient", name: str, receives_events: bool):
+        self.client = client
+        self.name = name
+        self.receives_events = receives_events
 
-        self._main_loop: Optional[asyncio.AbstractEventLoop] = None
-        self._connection_future: Optional[asyncio.Future] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._keepalive_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
 
         self._connected = False
-        self._is_connecting_or_reconnecting = False
+        self._closing = False
         self._lock = asyncio.Lock()
-
+        self.server_banner: Optional[str] = None
         self._response_futures: Dict[str, asyncio.Future] = {}
-        self._action_event_callbacks: Dict[str, Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]] = {}
-        self._event_listeners: Dict[str, Set[Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]]] = {}
-        self._generic_event_listeners: Set[Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]] = set()
-        
-        self._connection_retry_delay = 5
-        self._keepalive_interval = 540
 
-    # _InternalAmiEventListener class is no longer needed if we use a simple lambda for add_event_listener
+        self.healthy = False # Connected and the last health check Ping was answered
+        self.last_ping_rtt_ms: Optional[float] = None
+        self.stats: Dict[str, int] = {key: 0 for key in AMI_CONNECTION_COUNTERS}
+        self.stats["max_pending"] = 0
 
-    def _dispatch_ami_event_from_thread(self, lib_event_obj: LibAmiEvent): # Receives LibAmiEvent
-        # Convert LibAmiEvent object to our standard event_dict format
-        logger.info(f"[AMI_CLIENT_EVENT_CATCH_ALL] Received Event: {lib_event_obj.name if hasattr(lib_event_obj, 'name') else 'Unknown'} | Keys: {lib_event_obj.keys if hasattr(lib_event_obj, 'keys') else 'No Keys'}")
+    @property
+    def connected(self) -> bool:
+        return self._connected
 
-        event_dict = {}
-        event_name_from_lib = "UnknownEvent"
+    @property
+    def pending(self) -> int:
+        """Actions written on this connection and still waiting for their response."""
+        return len(self._response_futures)
 
-        if hasattr(lib_event_obj, 'name') and lib_event_obj.name:
-            event_name_from_lib = lib_event_obj.name
-            event_dict['Event'] = event_name_from_lib
-        
-        if hasattr(lib_event_obj, 'keys') and isinstance(lib_event_obj.keys, dict):
-            event_dict.update(lib_event_obj.keys)
-            # Ensure 'Event' key is consistent
-            if 'Event' in lib_event_obj.keys and lib_event_obj.keys['Event'] != event_name_from_lib:
-                if event_name_from_lib == "UnknownEvent": event_name_from_lib = lib_event_obj.keys['Event']
-                event_dict['Event'] = lib_event_obj.keys['Event']
-        elif isinstance(lib_event_obj, dict): # Should not happen if lib sends Event objects
-            event_dict.update(lib_event_obj)
-            if 'Event' in lib_event_obj: event_name_from_lib = lib_event_obj['Event']
-        else:
-            logger.warning(f"Dispatch: Received event object of unexpected type: {type(lib_event_obj)}")
-            event_dict['Event'] = event_name_from_lib
-            event_dict['RawEventDetails'] = str(lib_event_obj)
-
-        if 'Event' not in event_dict and event_name_from_lib != "UnknownEvent":
-            event_dict['Event'] = event_name_from_lib
-            
-        # ---- The rest of the dispatch logic from your correct version ----
-        action_id_in_event = event_dict.get("ActionID") # Get ActionID from the processed dict
-        logger.debug(f"Dispatching Event to Async Listeners: Name='{event_dict.get('Event')}', ActionID='{action_id_in_event}', FullDict='{event_dict}'")
-        
-        event_name_to_dispatch = event_dict.get("Event")
-        if event_name_to_dispatch:
-            if event_name_to_dispatch in self._event_listeners:
-                for callback in list(self._event_listeners[event_name_to_dispatch]):
-                    asyncio.create_task(callback(event_dict))
-            for g_callback in list(self._generic_event_listeners):
-                asyncio.create_task(g_callback(event_dict))
-
-        if action_id_in_event and action_id_in_event in self._action_event_callbacks:
-            callback = self._action_event_callbacks[action_id_in_event]
-            asyncio.create_task(callback(event_dict))
-
-        if action_id_in_event and event_name_to_dispatch and event_name_to_dispatch.endswith("Complete"):
-            if action_id_in_event in self._response_futures:
-                logger.debug(f"Dispatch: Received completion event '{event_name_to_dispatch}' for ActionID {action_id_in_event}. "
-                             "Note: Future for this ActionID might have already been resolved on initial response.")
-            if action_id_in_event in self._action_event_callbacks:
-                # Clean up the action-specific callback once the action is complete
-                del self._action_event_callbacks[action_id_in_event]
-                logger.debug(f"Dispatch: Removed action-specific event callback for completed ActionID {action_id_in_event}.")
+    async def connect_and_login(self) -> bool:
+        if await self._connect_once():
+            return True
+        self._schedule_reconnect()
+        return False
 
+    async def _connect_once(self) -> bool:
+        async with self._lock:
+            if self._connected:
+                return True
+            self._closing = False
+            timeout = self.client._connect_timeout
+            try:
+                await asyncio.wait_for(self._open_session(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"[AMI:{self.name}] Timeout connecting/logging in to Asterisk AMI at {self.client.host}:{self.client.port} after {timeout}s.")
+            except Exception as e:
+                logger.error(f"[AMI:{self.name}] AMI connection or login failed: {e}")
+            else:
+                return True
+            await self._close_transport()
+            return False
 
-    def _ami_worker_thread_main(self):
-        logger.info(f"AMI Worker Thread ({threading.get_ident()}): Started.")
-        last_keepalive_time = time.monotonic()
-        self._sync_ami_client = None 
+    async def _open_session(self):
+        client = self.client
+        logger.info(f"[AMI:{self.name}] Connecting and logging into Asterisk AMI at {client.host}:{client.port}...")
+        reader, writer = await asyncio.open_connection(client.host, client.port, limit=AMI_STREAM_LIMIT)
+        self._reader, self._writer = reader, writer
+        banner = await reader.readline()
+        if not banner:
+            raise ConnectionAbortedError("Connection closed before the AMI banner")
+        self.server_banner = banner.decode("utf-8", "replace").strip()
+        self._reader_task = asyncio.create_task(self._read_frames(reader, writer))
+
+        mask = event_subscription(client._wanted_events())[0] if self.receives_events else "off"
+        response = await self.request(AmiAction("Login", Username=client.username, Secret=client.secret, Events=mask),
+                                      timeout=client._connect_timeout)
+        if response.get("Response") != "Success":
+            raise ConnectionRefusedError(f"AMI Login Failed. Message='{response.get('Message', 'Login failure')}'")
+        if self.receives_events:
+            client._events_session_opened(mask)
+
+        self._connected = True
+        self.healthy = True
+        self.stats["connects"] += 1
+        logger.info(f"[AMI:{self.name}] AMI Login Successful ({self.server_banner}). Message: {response.get('Message', 'Authentication accepted')}")
+        self._keepalive_task = asyncio.create_task(self._run_keepalive(writer))
+        if self.receives_events:
+            client._schedule_event_subscription_sync() # Picks up listener changes made while logging in
+
+    def _schedule_reconnect(self):
+        if self._closing or (self._reconnect_task and not self._reconnect_task.done()):
+            return
+        self._reconnect_task = asyncio.create_task(self._reconnect_loop())
 
+    async def _reconnect_loop(self):
+        retry_delay = self.client._connection_retry_delay
         try:
-            self._sync_ami_client = ami.AMIClient(
-                address=self.host, port=self.port, timeout=20 # Increased default timeout for client
-            )
-            
-            # Event handler for the library's add_event_listener
-            # The library's client.py shows its internal _fire_on_event calls:
-            # listener(event=event, source=self) if it's an EventListener object,
-            # or just listener(event=event) if it's a simple callable.
-            # Our _dispatch_ami_event_from_thread expects the event object.
-            def internal_event_callback_for_library(event, source=None): # source is often the client instance
-                if self._main_loop and self._main_loop.is_running():
-                    self._main_loop.call_soon_threadsafe(self._dispatch_ami_event_from_thread, event)
-                else: # pragma: no cover
-                    logger.warning(f"AMI Worker: Main asyncio loop not available. Cannot dispatch event: {event.name if hasattr(event, 'name') else 'Unknown Event'}")
-            
-            # The library's add_event_listener can take a callable directly.
-            self._sync_ami_client.add_event_listener(internal_event_callback_for_library)
-            logger.info("Worker: Event listener registered with AMI client.")
-
-            logger.info(f"Worker: Connecting and logging into Asterisk at {self.host}:{self.port}...")
-            # login() returns a FutureResponse. .response blocks for the actual Response.
-            login_future = self._sync_ami_client.login(username=self.username, secret=self.secret)
-            login_response_obj: Optional[LibAmiResponse] = login_future.response 
-
-            # --- DEBUG LOGGING for login_response_obj --- (Copied from your last successful log structure)
-            if login_response_obj:
-                logger.debug(f"Worker: Login - Type: {type(login_response_obj)}, Status: {getattr(login_response_obj, 'status', 'N/A')}, "
-                             f"IsError: {login_response_obj.is_error() if hasattr(login_response_obj, 'is_error') else 'N/A'}, "
-                             f"Keys: {getattr(login_response_obj, 'keys', {})}")
-            else:
-                logger.debug("Worker: Login - login_response_obj is None (likely timeout on .response).")
+            while not self._closing and not self._connected:
+                logger.info(f"[AMI:{self.name}] Scheduling AMI reconnect in {retry_delay}s.")
+                await asyncio.sleep(retry_delay)
+                if not self._closing:
+                    await self._connect_once()
+        except asyncio.CancelledError:
+            pass
+
+    async def _read_frames(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        reason: Optional[Exception] = None
+        try:
+            while True:
+                frame = parse_ami_frame(await reader.readuntil(AMI_FRAME_END))
+                if "Event" in frame:
+                    self.stats["events"] += 1
+                    self.client._dispatch_event(frame)
+                elif "Response" in frame:
+                    self.stats["responses"] += 1
+                    future = self._response_futures.get(frame.get("ActionID"))
+                    if future and not future.done():
+                        future.set_result(frame)
+                else:
+                    logger.debug(f"[AMI:{self.name}] Ignoring AMI frame with neither Event nor Response: {frame}")
+        except asyncio.CancelledError:
+            return
+        except asyncio.IncompleteReadError:
+            reason = ConnectionResetError("AMI connection closed by Asterisk")
+        except Exception as e:
+            reason = e
+        self._connection_lost(writer, reason)
 
-            if login_response_obj and not login_response_obj.is_error():
-                logger.info(f"Worker: AMI Login Successful. Message: {login_response_obj.keys.get('Message', 'Authentication accepted')}")
-                if self._main_loop:
-                    self._main_loop.call_soon_threadsafe(self._set_connected_status, True)
-            else:
-                err_msg = "Worker: AMI Login Failed."
-                if login_response_obj and hasattr(login_response_obj, 'keys'):
-                    err_msg += f" Details: Status='{getattr(login_response_obj, 'status', 'N/A')}', Message='{login_response_obj.keys.get('Message', 'Login failure')}'"
-                elif login_response_obj: err_msg += f" Unexpected response: {str(login_response_obj)[:100]}"
-                else: err_msg += " No response from server (timeout on future.response)."
-                logger.error(err_msg)
-                raise ConnectionRefusedError(err_msg)
-
-            # --- Queued Action Loop ---
-            while not self._stop_worker_event.is_set():
+    def _connection_lost(self, writer: asyncio.StreamWriter, reason: Optional[Exception]):
+        if writer is not self._writer:
+            return # An older session; already handled
+        was_connected = self._connected
+        self._connected = False
+        self.healthy = False
+        self._writer = self._reader = None
+        writer.close()
+        if self._keepalive_task and self._keepalive_task is not asyncio.current_task():
+            self._keepalive_task.cancel()
+        self._fail_pending_actions(ConnectionError(f"AMI connection lost: {reason}"))
+        if was_connected:
+            self.stats["connection_losses"] += 1
+            logger.warning(f"[AMI:{self.name}] Connection marked as disconnected. Error: {reason}")
+            self._schedule_reconnect()
+
+    def _fail_pending_actions(self, error: Exception):
+        for future in self._response_futures.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _run_keepalive(self, writer: asyncio.StreamWriter):
+        loop = asyncio.get_running_loop()
+        interval = self.client._keepalive_interval
+        try:
+            while writer is self._writer:
+                await asyncio.sleep(interval)
+                if writer is not self._writer:
+                    break
+                self.stats["health_checks"] += 1
+                sent_at = loop.time()
                 try:
-                    action_tuple = self._action_queue.get(block=True, timeout=1.0)
-                    if action_tuple is None: break 
-                    
-                    ami_action_obj, response_future_async = action_tuple # Our internal AmiAction wrapper
-                    
-                    # Use the library's SimpleAction class
-                    # Our AmiAction's get_headers() provides the dict for **kwargs
-                    # Our AmiAction's get_name() provides the name
-                    action_for_lib = SimpleAction(
-                        name=ami_action_obj.get_name(),
-                        **ami_action_obj.get_headers() 
-                    )
-                    
-                    # Debug log for the action being sent
-                    sent_action_id = action_for_lib.keys.get('ActionID', 'N/A_IN_LIB_ACTION_KEYS')
-                    logger.debug(f"Worker: Sending Action='{action_for_lib.name}', Headers='{action_for_lib.keys}', EffectiveActionID='{sent_action_id}'")
-                    
-                    try:
-                        action_future = self._sync_ami_client.send_action(action_for_lib)
-                        response_from_sync_client: Optional[LibAmiResponse] = action_future.response # Blocks
-                        
-                        response_dict_for_async = {}
-                        if response_from_sync_client:
-                            response_dict_for_async = {
-                                'Response': getattr(response_from_sync_client, 'status', 'Error'),
-                                **getattr(response_from_sync_client, 'keys', {})
-                            }
-                            if hasattr(response_from_sync_client, 'follows') and response_from_sync_client.follows:
-                                 response_dict_for_async['Follows'] = '\n'.join(response_from_sync_client.follows)
-                            logger.debug(f"Worker: Action '{action_for_lib.name}' (ID: {sent_action_id}) received response: {response_dict_for_async.get('Response')}, FullRespKeys: {response_dict_for_async}")
-                        else: # Timeout on .response
-                            logger.warning(f"Worker: Action '{action_for_lib.name}' (ID: {sent_action_id}) - No response object from sync client (timeout on future.response).")
-                            response_dict_for_async = {'Response': 'Error', 'Message': 'No response from library (timeout on future.response)'}
-
-                        if self._main_loop:
-                            self._main_loop.call_soon_threadsafe(response_future_async.set_result, response_dict_for_async)
-
-                    except Exception as e_action_send:
-                        logger.error(f"Worker: Error during send_action/get_response for '{action_for_lib.name}' (ID: {sent_action_id}): {e_action_send}", exc_info=True)
-                        if self._main_loop:
-                            self._main_loop.call_soon_threadsafe(response_future_async.set_exception, e_action_send)
-                    finally:
-                         last_keepalive_time = time.monotonic()
-
-                except thread_safe_queue.Empty:
-                    # The queue was empty. Instead of just waiting, send a Ping to keep the
-                    # underlying socket of the synchronous library active, which allows it to
-                    # process incoming events that are not direct responses to actions.
-                    # This is the workaround for the library not having a dedicated listen() mode.
-                    logger.debug("Worker: Action queue empty, sending Ping to process events.")
-                    try:
-                        # We don't need a full async future for this internal ping.
-                        # The library will add an ActionID if we don't provide one.
-                        ping_action_for_lib = SimpleAction('Ping')
-                        
-                        ping_future = self._sync_ami_client.send_action(ping_action_for_lib)
-                        # Use a short timeout for the ping response. The main purpose is to
-                        # block on the socket and process any incoming data, not just the pong.
-                        ping_response_obj = ping_future.response # Blocks
-                        
-                        if ping_response_obj and not ping_response_obj.is_error():
-                            # Successfully received a Pong. The connection is alive and listening.
-                            logger.debug(f"Worker: AMI Ping-Pong successful. Connection active. Pong details: {getattr(ping_response_obj, 'keys', {})}")
-                        else: # Ping failed or timed out
-                            ping_err_msg = "Ping failed"
-                            if ping_response_obj and hasattr(ping_response_obj, 'keys'):
-                                ping_err_msg += f" - Response: {ping_response_obj.keys.get('Response', 'Error')}, Message: {ping_response_obj.keys.get('Message', 'Unknown')}"
-                            elif ping_response_obj:
-                                ping_err_msg += f" - Unexpected obj: {str(ping_response_obj)[:100]}"
-                            else:
-                                ping_err_msg += " - No response object (timeout on future.response)"
-                            logger.warning(f"Worker: AMI Ping response issue: {ping_err_msg}")
-                            # A failed ping is a strong sign the connection is dead.
-                            raise ConnectionAbortedError(f"Ping failure implies connection loss: {ping_err_msg}")
-                        
-                    except Exception as e_ping: # Includes ConnectionAbortedError from above
-                        logger.error(f"Worker: Critical error during keepalive Ping: {e_ping}", exc_info=True)
-                        # Re-raise as ConnectionAbortedError to trigger the main exception handler for the worker loop.
-                        raise ConnectionAbortedError(f"Ping processing failed, connection likely lost: {e_ping}") from e_ping
-        except (ConnectionRefusedError, socket.timeout, OSError, ConnectionAbortedError) as e:
-            logger.error(f"AMI Worker Thread: Connection or Critical Action Error: {e}")
-            if self._main_loop:
-                 self._main_loop.call_soon_threadsafe(self._set_connected_status, False, e)
-        except Exception as e: 
-            logger.critical(f"AMI Worker Thread: Unhandled Exception: {e}", exc_info=True)
-            if self._main_loop:
-                 self._main_loop.call_soon_threadsafe(self._set_connected_status, False, e)
+                    await self.request(AmiAction("Ping"), timeout=min(10.0, interval))
+                except (asyncio.TimeoutError, ConnectionError) as e:
+                    self.stats["health_check_failures"] += 1
+                    self._connection_lost(writer, ConnectionAbortedError(f"Keepalive Ping failed: {e!r}"))
+                    break
+                self.last_ping_rtt_ms = (loop.time() - sent_at) * 1000.0
+                self.healthy = True
+        except asyncio.CancelledError:
+            pass
+
+    async def request(self, action_obj: "AmiAction", timeout: float) -> Dict[str, Any]:
+        """Writes `action_obj` and waits for its response. Raises TimeoutError or ConnectionError."""
+        writer = self._writer
+        if writer is None:
+            raise ConnectionError("AMI not connected")
+        action_id = action_obj.get_action_id()
+        future = asyncio.get_running_loop().create_future()
+        self._response_futures[action_id] = future
+        self.stats["max_pending"] = max(self.stats["max_pending"], len(self._response_futures))
+        try:
+            writer.write(encode_ami_action(action_obj.get_name(), action_obj.get_headers()))
+            self.stats["actions_sent"] += 1
+            logger.debug(f"[AMI:{self.name}] Sent Action='{action_obj.get_name()}' (ID: {action_id})")
+            await writer.drain()
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats["action_timeouts"] += 1
+            raise
         finally:
-            logger.info(f"AMI Worker Thread ({threading.get_ident()}): Shutting down...")
-            if self._sync_ami_client:
+            self._response_futures.pop(action_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "role": "events" if self.receives_events else "actions",
+            "connected": self._connected,
+            "healthy": self.healthy,
+            "pending": self.pending,
+            "last_ping_rtt_ms": round(self.last_ping_rtt_ms, 2) if self.last_ping_rtt_ms is not None else None,
+            **self.stats,
+        }
+
+    async def _close_transport(self):
+        writer, reader_task = self._writer, self._reader_task
+        self._connected = False
+        self.healthy = False
+        self._writer = self._reader = None
+        for task in (self._keepalive_task, reader_task):
+            if task and not task.done() and task is not asyncio.current_task():
+                task.cancel()
+        self._fail_pending_actions(ConnectionError("AMI client closed"))
+        if writer:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def close(self):
+        self._closing = True # Prevent further auto-reconnects
+        if self._reconnect_task and not self._reconnect_task.done():
+            self._reconnect_task.cancel()
+        async with self._lock:
+            if self._connected:
+                self._connected = False # Asterisk drops the socket after Logoff; that is not a connection loss
                 try:
-                    if hasattr(self._sync_ami_client, 'logoff'): # logoff first
-                        logger.info("Worker: Attempting Logoff.")
-                        logoff_future = self._sync_ami_client.logoff()
-                        if logoff_future: logoff_future.response # Block for logoff completion
-                    if hasattr(self._sync_ami_client, 'disconnect'): # then disconnect
-                        logger.info("Worker: Attempting Disconnect.")
-                        self._sync_ami_client.disconnect()
-                    logger.info("Worker: AMI client logoff/disconnect process completed.")
-                except Exception as e_close: 
-                    logger.error(f"Worker: Error during client cleanup (logoff/disconnect): {e_close}")
-            self._sync_ami_client = None
-            if self._main_loop and self._connected: 
-                self._main_loop.call_soon_threadsafe(self._set_connected_status, False, ConnectionAbortedError("Worker thread terminated"))
-            logger.info(f"AMI Worker Thread ({threading.get_ident()}): Finished.")
-
-    # --- Methods below this line are part of the async public API of AsteriskAmiClient ---
-    # connect_and_login, _set_connected_status, send_action, event listeners, _stop_ami_worker, close
-    # These should generally remain unchanged from the last fully working version for lock management.
-    # I will paste the verified versions of these from our successful lock resolution.
-
-    def _set_connected_status(self, status: bool, error: Optional[Exception] = None):
-        async def task():
-            async with self._lock:
-                current_connection_future = self._connection_future
-                if status:
-                    self._connected = True
-                    self._is_connecting_or_reconnecting = False
-                    logger.info("AsteriskAmiClient marked as connected.")
-                    if current_connection_future and not current_connection_future.done():
-                        current_connection_future.set_result(True)
-                else:
-                    self._connected = False
-                    logger.warning(f"AsteriskAmiClient marked as disconnected. Error: {error}")
-                    if current_connection_future and not current_connection_future.done():
-                         current_connection_future.set_exception(error or ConnectionError("Connection failed by worker"))
-                    if self._is_connecting_or_reconnecting and not self._stop_worker_event.is_set():
-                         logger.info(f"Connection attempt failed (notified by worker), scheduling retry in {self._connection_retry_delay}s.")
-                         if self._main_loop and self._main_loop.is_running():
-                             self._main_loop.call_later(self._connection_retry_delay, 
-                                                        lambda: asyncio.create_task(self.connect_and_login()) if not self._stop_worker_event.is_set() else None)
-                         else: # pragma: no cover
-                              logger.error("Main loop not available to schedule retry for failed connection.")
-                    else:
-                        if not self._stop_worker_event.is_set():
-                            self._is_connecting_or_reconnecting = False
-        
-        if self._main_loop and self._main_loop.is_running():
-             self._main_loop.create_task(task())
-        else: # pragma: no cover
-             logger.error("Cannot set connected status, main event loop not available for task().")
+                    await self.request(AmiAction("Logoff"), timeout=2.0)
+                except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+                    logger.debug(f"[AMI:{self.name}] AMI Logoff did not complete cleanly: {e!r}")
+            await self._close_transport()
 
-    async def connect_and_login(self) -> bool:
-        attempt_connection_future: asyncio.Future 
-        await self._lock.acquire()
-        try:
-            if self._connected: return True
-            if self._is_connecting_or_reconnecting and self._connection_future and not self._connection_future.done():
-                logger.info("Connection attempt already in progress, awaiting its result...")
-                existing_future_to_await = self._connection_future
-                self._lock.release()
-                try: return await existing_future_to_await
-                except Exception as e_await:
-                    logger.warning(f"Awaiting existing connection future failed: {e_await}. Will start new attempt if leader.")
-                    await self._lock.acquire() 
-                    if self._connected: return True 
-                    self._is_connecting_or_reconnecting = False 
-            
-            if self._is_connecting_or_reconnecting:
-                 logger.debug("Connect_and_login: Still marked as connecting by another call, returning False.")
-                 return False 
-
-            self._is_connecting_or_reconnecting = True
-            self._main_loop = asyncio.get_running_loop()
-            self._connection_future = self._main_loop.create_future()
-            attempt_connection_future = self._connection_future
-        finally:
-            if self._lock.locked(): self._lock.release()
 
-        await self._stop_ami_worker() 
-        self._stop_worker_event.clear()
-        self._ami_thread = threading.Thread(target=self._ami_worker_thread_main, daemon=True, name="AMIWorkerThread")
-        self._ami_thread.start()
-        logger.info("New AMI worker thread started. Waiting for connection status via its future.")
-        
-        try:
-            await asyncio.wait_for(attempt_connection_future, timeout=30.0) # Increased wait_for timeout slightly
-            async with self._lock: 
-                is_now_connected = self._connected
-                if not is_now_connected: 
-                    self._is_connecting_or_reconnecting = False   
-                return is_now_connected
-        except asyncio.TimeoutError:
-            logger.error("Timeout waiting for AMI worker thread to connect/login via future.")
-            async with self._lock:
-                if attempt_connection_future and not attempt_connection_future.done():
-                     attempt_connection_future.set_exception(TimeoutError("Connection timeout for this attempt"))
-                self._is_connecting_or_reconnecting = False 
-            await self._stop_ami_worker()
-            return False
-        except Exception as e: 
-            logger.error(f"Error in connect_and_login waiting for connection future: {e}")
-            async with self._lock:
-                if attempt_connection_future and not attempt_connection_future.done(): 
-                    attempt_connection_future.set_exception(e)
-                self._is_connecting_or_reconnecting = False
-            await self._stop_ami_worker()
-            return False
+class AsteriskAmiClient:
+    """Asyncio AMI client over a pool of AMI_POOL_SIZE sessions (see AmiConnection).
+
+    The first session is reserved for events; actions go to the connected action session with the
+    fewest responses outstanding (round robin among equals), so a slow Originate does not hold
+    up the PlayDTMF or Hangup sent after it. With a pool size of 1, or while every action session
+    is down, actions share the events session. Events are dispatched as they arrive, independent
+    of any action in flight: `event_router` delivers each one only to the routes that own its
+    ActionID, Uniqueid, Linkedid, Channel or VarSet value; name and generic listeners still see
+    everything.
+
+    With AMI_EVENT_FILTERING, the events session only receives the events its name listeners and
+    routes declared (see event_subscription()): the Login "Events:" mask and Filter actions are
+    derived from them and updated as they change. A generic listener, or a route declared without
+    `events`, turns filtering off. Filters cannot be removed from a live session, so ones no
+    longer needed stay until the next login.
+    """
+    def __init__(self, pool_size: Optional[int] = None):
+        self.host = app_config.ASTERISK_HOST
+        self.port = app_config.ASTERISK_PORT
+        self.username = app_config.ASTERISK_AMI_USER
+        self.secret = app_config.ASTERISK_AMI_SECRET
+
+        self.pool_size = max(1, pool_size or app_config.AMI_POOL_SIZE)
+        self._events_connection = AmiConnection(self, "events", receives_events=True)
+        self._action_connections: List[AmiConnection] = [
+            AmiConnection(self, f"actions-{index}", receives_events=False) for index in range(1, self.pool_size)
+        ]
+        self._connections: List[AmiConnection] = [self._events_connection, *self._action_connections]
+        self._next_connection = itertools.count()
+
+        self.event_router = AmiEventRouter()
+        self._action_routes: Dict[str, EventRoute] = {} # send_action(event_callback=...) routes, closed on *Complete
+        self._event_listeners: Dict[str, Set[AmiEventCallback]] = {}
+        self._generic_event_listeners: Set[AmiEventCallback] = set()
+        self.event_router.on_demand_change = self._schedule_event_subscription_sync
+
+        # Event subscription installed on the events session
+        self._event_mask: Optional[str] = None
+        self._event_filters: Set[str] = set()
+        self._filters_supported = True
+        self._subscription_dirty = False
+        self._subscription_task: Optional[asyncio.Task] = None
 
-    # In call_processor_service/asterisk_ami_client.py
+        self._connection_retry_delay = 5
+        self._connect_timeout = app_config.AMI_CONNECT_TIMEOUT_S
+        self._keepalive_interval = app_config.AMI_KEEPALIVE_INTERVAL_S
+        self.stats: Dict[str, int] = {
+            "events": 0,
+            "no_connection": 0, # send_action calls made while no session was up
+            "subscription_updates": 0,
+        }
+
+    @property
+    def is_connected(self) -> bool:
+        """Whether the events session is up (call events are only seen through it)."""
+        return self._events_connection.connected
+
+    @property
+    def server_banner(self) -> Optional[str]:
+        return self._events_connection.server_banner
 
-    async def send_action(self, action: Union[str, AmiAction], timeout: float = 10.0, event_callback: Optional[Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]] = None, **kwargs) -> Optional[Dict[str, Any]]:
-        if not self._connected:
+    async def connect_and_login(self) -> bool:
+        """Connects and logs in every pool session that is down. Returns whether the events session
+        is up; sessions that failed keep retrying in the background.
+        """
+        results = await asyncio.gather(*(connection.connect_and_login() for connection in self._connections))
+        if any(results[1:]) and not results[0]:
+            logger.warning("AMI action sessions are up but the events session is not; call events will be missed until it reconnects.")
+        return results[0]
+
+    def _wanted_events(self) -> Optional[Dict[str, Set[Optional[str]]]]:
+        """Events the listeners and routes use, by name (None: every event)."""
+        if not app_config.AMI_EVENT_FILTERING or self._generic_event_listeners:
+            return None
+        wanted = self.event_router.event_demand()
+        if wanted is None:
+            return None
+        for event_name in self._event_listeners:
+            wanted.setdefault(event_name, set()).add(None)
+        return wanted
+
+    def _events_session_opened(self, mask: str):
+        """Resets the subscription state for a fresh events session; the sync runs after login."""
+        self._event_mask, self._event_filters, self._filters_supported = mask, set(), True
+
+    async def _open_event_subscription(self):
+        """Best effort: turns the events session's mask fully on and opens any partial Filter whitelist."""
+        connection = self._events_connection
+        timeout = min(10.0, self._connect_timeout)
+        try:
+            if self._event_mask != "on":
+                response = await connection.request(AmiAction("Events", EventMask="on"), timeout=timeout)
+                if response.get("Response") == "Success":
+                    self._event_mask = "on"
+            if self._event_filters and AMI_FILTER_MATCH_ALL not in self._event_filters:
+                response = await connection.request(AmiAction("Filter", Operation="Add", Filter=AMI_FILTER_MATCH_ALL), timeout=timeout)
+                if response.get("Response") == "Success":
+                    self._event_filters.add(AMI_FILTER_MATCH_ALL)
+        except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+            logger.warning(f"Could not open the AMI event subscription ({e!r}); keeping the login event mask '{self._event_mask}'.")
+
+    async def _sync_event_subscription(self):
+        """Brings the events session's event mask and filters in line with _wanted_events()."""
+        connection = self._events_connection
+        mask, filters = event_subscription(self._wanted_events())
+        timeout = min(10.0, self._connect_timeout)
+        if mask != self._event_mask:
+            response = await connection.request(AmiAction("Events", EventMask=mask), timeout=timeout)
+            if response.get("Response") == "Success":
+                self._event_mask = mask
+                self.stats["subscription_updates"] += 1
+                logger.info(f"AMI event mask set to '{mask}'.")
+            else:
+                logger.warning(f"AMI Events action failed for mask '{mask}': {response.get('Message')}")
+
+        if filters is None:
+            # Everything wanted: only needed if narrower filters are already in place
+            filters = {AMI_FILTER_MATCH_ALL} if self._event_filters else set()
+        elif AMI_FILTER_MATCH_ALL in self._event_filters:
+            return # The whitelist is open until the next login; narrower filters would change nothing
+        for event_filter in sorted(filters - self._event_filters):
+            if not self._filters_supported:
+                break
+            response = await connection.request(AmiAction("Filter", Operation="Add", Filter=event_filter), timeout=timeout)
+            if response.get("Response") == "Success":
+                self._event_filters.add(event_filter)
+                self.stats["subscription_updates"] += 1
+                logger.debug(f"AMI event filter added: '{event_filter}'")
+                continue
+            logger.warning(f"AMI Filter '{event_filter}' rejected ({response.get('Message')}); relying on the event mask only.")
+            self._filters_supported = False
+            if self._event_filters and AMI_FILTER_MATCH_ALL not in self._event_filters:
+                # A partial whitelist would hide the events whose filter failed; open it up again
+                response = await connection.request(AmiAction("Filter", Operation="Add", Filter=AMI_FILTER_MATCH_ALL), timeout=timeout)
+                if response.get("Response") == "Success":
+                    self._event_filters.add(AMI_FILTER_MATCH_ALL)
+                else:
+                    logger.error(f"AMI match-all Filter rejected ({response.get('Message')}); some wanted events are filtered out until the next login.")
+
+    def _schedule_event_subscription_sync(self):
+        if not self._events_connection.connected:
+            return # Applied at the next login
+        self._subscription_dirty = True
+        if self._subscription_task is None or self._subscription_task.done():
+            self._subscription_task = asyncio.create_task(self._run_event_subscription_sync(self._events_connection._writer))
+
+    async def _run_event_subscription_sync(self, writer: Optional[asyncio.StreamWriter]):
+        while self._subscription_dirty and writer is self._events_connection._writer:
+            self._subscription_dirty = False
+            try:
+                await self._sync_event_subscription()
+            except (asyncio.TimeoutError, ConnectionError, OSError) as e:
+                # Server-side filtering is an optimisation; listeners still pick their events out of the
+                # full stream, so fall back to it rather than keep a stale or partial whitelist
+                logger.warning(f"Could not update the AMI event subscription ({e!r}); falling back to the unfiltered event stream.")
+                self._filters_supported = False
+                await self._open_event_subscription()
+                break
+
+    async def update_event_subscription(self):
+        """Waits until the session receives the events currently registered for.
+
+        Call after registering for a call's events and before the action that produces them
+        (e.g. Originate), so the first events are not filtered out by a stale subscription.
+        """
+        task = self._subscription_task
+        if task and not task.done():
+            await asyncio.wait({task})
+
+    def _connection_for_action(self) -> Optional[AmiConnection]:
+        candidates = [connection for connection in self._action_connections if connection.connected]
+        if not candidates and self._events_connection.connected:
+            candidates = [self._events_connection]
+        if not candidates:
+            return None
+        # Fewest outstanding responses wins; rotating the start spreads ties across idle sessions
+        start = next(self._next_connection) % len(candidates)
+        return min(candidates[start:] + candidates[:start], key=lambda connection: connection.pending)
+
+    def _dispatch_event(self, event_dict: Dict[str, Any]):
+        self.stats["events"] += 1
+        event_name = event_dict.get("Event")
+        action_id_in_event = event_dict.get("ActionID")
+        logger.debug(f"Dispatching AMI event: Name='{event_name}', ActionID='{action_id_in_event}'")
+
+        for callback in list(self._event_listeners.get(event_name, ())):
+            asyncio.create_task(callback(event_dict))
+        for g_callback in list(self._generic_event_listeners):
+            asyncio.create_task(g_callback(event_dict))
+
+        self.event_router.route(event_dict)
+        if action_id_in_event and event_name and event_name.endswith("Complete"):
+            # Clean up the action-specific route once the action is complete
+            route = self._action_routes.pop(action_id_in_event, None)
+            if route:
+                route.close()
+
+    async def send_action(self, action: Union[str, AmiAction], timeout: float = 10.0, event_callback: Optional[AmiEventCallback] = None,
+                          callback_events: Optional[EventDemand] = None, **kwargs) -> Optional[Dict[str, Any]]:
+        """Sends an action on the least busy pool session and returns its response. `event_callback` gets
+        the events carrying its ActionID; `callback_events` names the ones it needs (default: all, which
+        disables event filtering while the action is open). List action responses (e.g. CoreShowChannel)
+        bypass the filter, so list actions can pass {}.
+        """
+        connection = self._connection_for_action()
+        if connection is None:
+            self.stats["no_connection"] += 1
             logger.warning("AMI not connected. Attempting connect before send_action.")
-            if not await self.connect_and_login():
+            await self.connect_and_login()
+            connection = self._connection_for_action()
+            if connection is None:
                 logger.error("send_action: Failed to connect to AMI. Cannot send.")
                 return {"Response": "Error", "Message": "AMI connection failed prior to send_action"}
-        
-        if not self._connected:
-             logger.error("send_action: Still not connected after connect attempt. Cannot send.")
-             return {"Response": "Error", "Message": "AMI still not connected post-attempt"}
- 
+
         action_obj = action if isinstance(action, AmiAction) else AmiAction(action, **kwargs)
         action_id = action_obj.get_action_id()
-        
-        if not self._main_loop: self._main_loop = asyncio.get_running_loop()
-        response_future_async = self._main_loop.create_future()
-        self._response_futures[action_id] = response_future_async
-        
         if event_callback:
-            self._action_event_callbacks[action_id] = event_callback
+            self._action_routes[action_id] = self.event_router.add_route(
+                f"action:{action_id}", event_callback, follow_anchor=False, keys=[("ActionID", action_id)],
+                events=callback_events)
             logger.debug(f"Registered event callback for ActionID: {action_id}")
 
         try:
-            self._action_queue.put((action_obj, response_future_async), block=False)
-            logger.debug(f"Queued action {action_obj.get_name()} (ID: {action_id}) for worker thread.")
-            
-            # <<< START: MODIFIED BLOCK TO HANDLE TIMEOUTS GRACEFULLY >>>
-            try:
-                # We wait for the response from the worker thread.
-                return await asyncio.wait_for(response_future_async, timeout=timeout)
-            except asyncio.TimeoutError:
-                # If we time out, it means the worker didn't get a response from Asterisk in time.
-                # For an async Originate, this is OFTEN OK. We can assume success and let events handle it.
-                logger.warning(f"Timeout waiting for response to ActionID {action_id} ({action_obj.get_name()}). Assuming success due to Async Originate pattern.")
-                # We'll return a synthetic success message.
-                return {"Response": "Success", "Message": "Action sent, response timeout assumed OK for async action."}
-            # <<< END: MODIFIED BLOCK >>>
-
-        except thread_safe_queue.Full:
-            logger.error(f"AMI action queue is full. Cannot send action {action_obj.get_name()} (ID: {action_id}).")
-            if action_id in self._response_futures: self._response_futures.pop(action_id, None)
-            return {"Response": "Error", "Message": "Action queue full"}
+            return await connection.request(action_obj, timeout)
+        except asyncio.TimeoutError:
+            # For an async Originate this is OFTEN OK. We can assume success and let events handle it.
+            logger.warning(f"Timeout waiting for response to ActionID {action_id} ({action_obj.get_name()}) on AMI session '{connection.name}'. Assuming success due to Async Originate pattern.")
+            return {"Response": "Success", "Message": "Action sent, response timeout assumed OK for async action."}
+        except (ConnectionError, OSError) as e:
+            logger.error(f"send_action: AMI connection error for {action_id} ({action_obj.get_name()}): {e}")
+            return {"Response": "Error", "Message": str(e)}
         except Exception as e:
             logger.error(f"Error in async send_action for {action_id} ({action_obj.get_name()}): {e}", exc_info=True)
             return {"Response": "Error", "Message": f"An exception occurred: {e}"}
-        finally:
-            # Clean up the future from our tracking dict regardless of outcome.
-            self._response_futures.pop(action_id, None)
-            # Do NOT remove the action_event_callback here; it's removed upon action completion event.
 
-    def add_event_listener(self, event_name: str, callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]): # pragma: no cover
-        if event_name not in self._event_listeners: self._event_listeners[event_name] = set()
+    def add_event_listener(self, event_name: str, callback: AmiEventCallback): # pragma: no cover
+        if event_name not in self._event_listeners:
+            self._event_listeners[event_name] = set()
+            self._schedule_event_subscription_sync()
         self._event_listeners[event_name].add(callback)
         logger.debug(f"Added listener for AMI event: {event_name}")
 
-    def remove_event_listener(self, event_name: str, callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]): # pragma: no cover
+    def remove_event_listener(self, event_name: str, callback: AmiEventCallback): # pragma: no cover
         if event_name in self._event_listeners:
             self._event_listeners[event_name].discard(callback)
-            if not self._event_listeners[event_name]: del self._event_listeners[event_name]
+            if not self._event_listeners[event_name]:
+                del self._event_listeners[event_name]
+                self._schedule_event_subscription_sync()
         logger.debug(f"Removed listener for AMI event: {event_name}")
 
-    def add_generic_event_listener(self, callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]):
+    def add_generic_event_listener(self, callback: AmiEventCallback):
+        if not self._generic_event_listeners:
+            self._schedule_event_subscription_sync()
         self._generic_event_listeners.add(callback)
         logger.debug("Added generic AMI event listener.")
 
-    def remove_generic_event_listener(self, callback: Callable[[Dict[str, Any]], Coroutine[Any, Any, None]]): # pragma: no cover
-        self._generic_event_listeners.discard(callback)
+    def remove_generic_event_listener(self, callback: AmiEventCallback): # pragma: no cover
+        if callback in self._generic_event_listeners:
+            self._generic_event_listeners.discard(callback)
+            if not self._generic_event_listeners:
+                self._schedule_event_subscription_sync()
         logger.debug("Removed generic AMI event listener.")
 
-    async def _stop_ami_worker(self):
-        if self._ami_thread and self._ami_thread.is_alive():
-            logger.info(f"Stopping AMI worker thread ({self._ami_thread.name})...")
-            self._stop_worker_event.set()
-            try: self._action_queue.put_nowait(None) 
-            except thread_safe_queue.Full: pass 
-            
-            join_timeout = 5.0
-            start_join_time = time.monotonic()
-            while self._ami_thread.is_alive() and (time.monotonic() - start_join_time) < join_timeout:
-                await asyncio.sleep(0.1)
-
-            if self._ami_thread.is_alive(): # pragma: no cover
-                 logger.warning(f"AMI worker thread ({self._ami_thread.name}) did not stop in {join_timeout}s.")
-            else:
-                 logger.info(f"AMI worker thread ({self._ami_thread.name}) stopped.")
-        self._ami_thread = None
+    def get_stats(self) -> Dict[str, Any]:
+        """Totals across the pool plus per-session state: health, Ping round trip, pending (queue depth) and max_pending."""
+        _, wanted_filters = event_subscription(self._wanted_events())
+        totals = {key: sum(connection.stats[key] for connection in self._connections) for key in AMI_CONNECTION_COUNTERS}
+        return {**totals, **self.stats,
+                "connected": self.is_connected,
+                "pool_size": self.pool_size,
+                "healthy_connections": sum(1 for connection in self._connections if connection.healthy),
+                "pending_actions": sum(connection.pending for connection in self._connections),
+                "connections": [connection.get_stats() for connection in self._connections],
+                "event_subscription": {
+                    "mask": self._event_mask,
+                    "filters": sorted(self._event_filters),
+                    "stale_filters": len(self._event_filters - ({AMI_FILTER_MATCH_ALL} if wanted_filters is None else wanted_filters)),
+                    "filters_supported": self._filters_supported,
+                },
+                "router": self.event_router.get_stats()}
 
     async def close(self):
-        logger.info("Closing AsteriskAmiClient connection.")
-        async with self._lock:
-            self._is_connecting_or_reconnecting = False # Prevent further auto-reconnects
-            self._stop_worker_event.set() # Signal worker to stop if running
-
-        await self._stop_ami_worker() # Ensure worker is stopped and joined
+        logger.info("Closing AsteriskAmiClient connections.")
+        if self._subscription_task and not self._subscription_task.done():
+            self._subscription_task.cancel()
+        await asyncio.gather(*(connection.close() for connection in self._connections))
 
-        # Clear listeners and fail any pending response futures
         self._event_listeners.clear()
         self._generic_event_listeners.clear()
-        for future_id, future in list(self._response_futures.items()): # Iterate copy
-            if not future.done():
-                future.set_exception(ConnectionError("AMI client closed"))
-            self._response_futures.pop(future_id, None) # Remove it
-        
-        self._connected = False # Mark as disconnected
+        for route in self._action_routes.values():
+            route.close()
+        self._action_routes.clear()
         logger.info("AsteriskAmiClient resources released and client closed.")
 
 # if __name__ == "__main__": (test block from previous full file)
@@ -15,17 +15,35 @@ if str(_project_root) not in sys.path:
 
 from config.app_config import app_config
 from database import db_manager
+from database.db_writer import db_writer
 from database.models import Call, CallStatus, TaskStatus, CallCreate
 from common.logger_setup import setup_logger
 from common.redis_client import RedisClient
 from common.data_models import (
     RedisDTMFCommand, RedisEndCallCommand, RedisAIHandshakeCommand,
-    RedisRequestUserInfoCommand, RedisHITLResponseCommand, RedisHITLTimeoutCommand
+    RedisRequestUserInfoCommand, RedisHITLResponseCommand, RedisHITLTimeoutCommand,
+    CallContext
 )
+from common.call_context_registry import call_context_registry
 from call_processor_service.asterisk_ami_client import AsteriskAmiClient, AmiAction
+from call_processor_service.ami_event_router import EventRoute
+from audio_processing_service.realtime_session_pool import realtime_session_pool
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
+# AMI events _process_ami_event acts on; the AMI session filters out the rest on the Asterisk side.
+# VarSet only for our call-identifying variables (set by Originate and by the opendeep dialplan).
+CALL_AMI_EVENTS = {
+    "Newchannel": None,
+    "OriginateResponse": None,
+    "Dial": None,
+    "DialBegin": None,
+    "DialEnd": None,
+    "Hangup": None,
+    "BridgeEnter": None,
+    "VarSet": "Variable: _*OPENDDEEP_(VARS|CALL_UUID)",
+}
+
 class CallAttemptHandler:
     def __init__(self,
                  call_record: Call,
@@ -57,6 +75,7 @@ class CallAttemptHandler:
         self._stop_event = asyncio.Event()
         self._redis_listener_task: Optional[asyncio.Task] = None
         self._ami_event_listener_task_active = False
+        self._ami_route: Optional[EventRoute] = None # This call's events only (see manage_call_lifecycle)
         self._loop: Optional[asyncio.AbstractEventLoop] = None # For run_in_executor
         self._channel_identified_event = asyncio.Event()
  
@@ -91,6 +110,15 @@ class CallAttemptHandler:
         self.asterisk_call_specific_uuid = str(uuid.uuid4())
         logger.info(f"[CallAttemptHandler:{self.call_id}] Generated Asterisk-specific UUID for AudioSocket: {self.asterisk_call_specific_uuid}")
         
+        # Publish the call context so the AudioSocket handshake resolves this UUID without touching the DB
+        await call_context_registry.publish(CallContext(
+            call_id=self.call_id,
+            task_id=self.task_id,
+            user_id=self.task_user_id,
+            asterisk_call_uuid=self.asterisk_call_specific_uuid,
+            prompt=task.generated_agent_prompt or "Default prompt"
+        ), self.redis_client)
+
         # Update database with UUID first to prevent race condition
         await self._update_call_status_db(CallStatus.PENDING_ORIGINATION, call_uuid=self.asterisk_call_specific_uuid)
         
@@ -147,18 +175,21 @@ class CallAttemptHandler:
         
         self.originate_action_id = originate_action.get_action_id()
         logger.info(f"[CallAttemptHandler:{self.call_id}] Originate ActionID set to: {self.originate_action_id}")
+        # The router follows the channels these keys identify, so later leg events reach this handler too
+        self._ami_route.add_key("ActionID", self.originate_action_id)
+        self._ami_route.add_key("VarSet", self.asterisk_call_specific_uuid)
+
+        await self.ami_client.update_event_subscription() # The first call after idle turns its events on
 
         self.call_start_time = datetime.now()
-        response = await self.ami_client.send_action(
-            originate_action,
-            timeout=1.0,
-            event_callback=self._process_ami_event
-        )
+        response = await self.ami_client.send_action(originate_action, timeout=1.0)
         
         if response and response.get("Response") == "Success":
-            logger.info(f"[CallAttemptHandler:{self.call_id}] Originate command sent successfully to Asterisk for phone: {target_phone_number}. ActionID: {self.originate_action_id}. Awaiting events via action-specific callback.")
+            logger.info(f"[CallAttemptHandler:{self.call_id}] Originate command sent successfully to Asterisk for phone: {target_phone_number}. ActionID: {self.originate_action_id}. Awaiting events via its AMI route.")
             # Update only the status - UUID is already in database
             await self._update_call_status_db(CallStatus.ORIGINATING)
+            # Open the OpenAI session while the phone rings; AudioSocketHandler adopts it on connect
+            realtime_session_pool.prewarm(self.call_id, task.generated_agent_prompt or "Default prompt", self.redis_client)
             return True
         else:
             err_msg = response.get('Message', 'Unknown error') if response else "No response from AMI client"
@@ -166,28 +197,44 @@ class CallAttemptHandler:
             await self._update_call_status_db(CallStatus.FAILED_ASTERISK_ERROR, hangup_cause=f"Originate failed: {err_msg}")
             return False
 
+    async def _send_dtmf_inband(self, cmd: RedisDTMFCommand) -> bool:
+        """Hands the digits to this call's AudioSocketHandler, which plays them as tones. False if no handler is listening."""
+        channel = f"audiosocket_commands:{self.call_id}"
+        receivers = await self.redis_client.publish_to_subscribers(channel, cmd.model_dump())
+        if receivers:
+            logger.info(f"[CallAttemptHandler:{self.call_id}] Sent DTMF '{cmd.digits}' in-band via {channel}.")
+            return True
+        logger.warning(f"[CallAttemptHandler:{self.call_id}] No AudioSocket handler on {channel}; falling back to AMI PlayDTMF.")
+        return False
+
+    async def _send_dtmf_ami(self, digits: str):
+        if not self.outbound_channel_name:
+            logger.error(f"[CallAttemptHandler:{self.call_id}] Cannot send DTMF. Outbound channel has not been identified yet.")
+            return
+        logger.info(f"[CallAttemptHandler:{self.call_id}] Processing DTMF command: sending '{digits}' to outbound channel {self.outbound_channel_name}")
+        for digit in digits:
+            logger.info(f"[CallAttemptHandler:{self.call_id}] Sending DTMF digit: '{digit}' to channel {self.outbound_channel_name}")
+            dtmf_action = AmiAction("PlayDTMF", Channel=self.outbound_channel_name, Digit=digit,
+                                    Duration=int(app_config.DTMF_TONE_ON_MS))
+            response = await self.ami_client.send_action(dtmf_action, timeout=3.0)
+            if response and response.get("Response") == "Success":
+                logger.info(f"[CallAttemptHandler:{self.call_id}] DTMF digit '{digit}' sent successfully.")
+            else:
+                logger.error(f"[CallAttemptHandler:{self.call_id}] Failed to send DTMF digit '{digit}'. Response: {response}")
+                break
+            # Let the digit finish playing before the next one is queued
+            await asyncio.sleep((app_config.DTMF_TONE_ON_MS + app_config.DTMF_TONE_OFF_MS) / 1000.0)
+
     async def _handle_redis_command(self, channel: str, command_data_dict: dict):
         logger.debug(f"[CallAttemptHandler:{self.call_id}] Received Redis command on {channel}: {command_data_dict}")
         command_type = command_data_dict.get("command_type")
 
         if command_type == "send_dtmf":
-            # --- NEW DTMF LOGIC ---
-            if not self.outbound_channel_name:
-                logger.error(f"[CallAttemptHandler:{self.call_id}] Cannot send DTMF. Outbound channel has not been identified yet.")
-                return
             try:
                 cmd = RedisDTMFCommand(**command_data_dict)
-                logger.info(f"[CallAttemptHandler:{self.call_id}] Processing DTMF command: sending '{cmd.digits}' to outbound channel {self.outbound_channel_name}")
-                for digit in cmd.digits:
-                    logger.info(f"[CallAttemptHandler:{self.call_id}] Sending DTMF digit: '{digit}' to channel {self.outbound_channel_name}")
-                    dtmf_action = AmiAction("PlayDTMF", Channel=self.outbound_channel_name, Digit=digit)
-                    response = await self.ami_client.send_action(dtmf_action, timeout=3.0)
-                    if response and response.get("Response") == "Success":
-                        logger.info(f"[CallAttemptHandler:{self.call_id}] DTMF digit '{digit}' sent successfully.")
-                    else:
-                        logger.error(f"[CallAttemptHandler:{self.call_id}] Failed to send DTMF digit '{digit}'. Response: {response}")
-                        break
-                    await asyncio.sleep(0.25)
+                if app_config.DTMF_MODE == "inband" and await self._send_dtmf_inband(cmd):
+                    return
+                await self._send_dtmf_ami(cmd.digits)
             except Exception as e:
                 logger.error(f"[CallAttemptHandler:{self.call_id}] Error processing DTMF command: {e}", exc_info=True)
 
@@ -472,7 +519,7 @@ class CallAttemptHandler:
     async def _update_call_status_db(self, status: CallStatus, **kwargs):
         if self._loop is None: self._loop = asyncio.get_running_loop()
         self.call_record.status = status
-        # db_manager.update_call_status is synchronous, run in executor
+        # db_manager.update_call_status is synchronous; the DB writer thread runs it (group-committed)
         # Prepare arguments for the synchronous function
         sync_kwargs = {
             'hangup_cause': kwargs.get("hangup_cause"),
@@ -481,10 +528,9 @@ class CallAttemptHandler:
             'asterisk_channel': kwargs.get("asterisk_channel"),
             'call_uuid': kwargs.get("call_uuid")
         }
-        await self._loop.run_in_executor(
-            None, 
-            db_manager.update_call_status, 
-            self.call_id, 
+        await db_writer.submit(
+            db_manager.update_call_status,
+            self.call_id,
             status,
             # Pass individual args expected by db_manager.update_call_status
             sync_kwargs['hangup_cause'],
@@ -501,15 +547,16 @@ class CallAttemptHandler:
         self._loop = asyncio.get_running_loop()
         logger.info(f"[CallAttemptHandler:{self.call_id}] Starting to manage call lifecycle.")
 
-        # --- NEW: Register a generic event listener for this handler ---
-        self.ami_client.add_generic_event_listener(self._process_ami_event)
-        logger.info(f"[CallAttemptHandler:{self.call_id}] Registered generic AMI event listener.")
+        # Route only this call's AMI events to the handler, in arrival order
+        self._ami_route = self.ami_client.event_router.add_route(f"call:{self.call_id}", self._process_ami_event,
+                                                                 events=CALL_AMI_EVENTS)
+        logger.info(f"[CallAttemptHandler:{self.call_id}] Registered AMI event route.")
 
         try:
             # 1. Start listening for Redis commands.
             self._redis_listener_task = asyncio.create_task(self._listen_for_redis_commands())
             
-            # 2. Originate the call. The action-specific callback remains for rapid OriginateResponse handling.
+            # 2. Originate the call. Its events arrive through self._ami_route.
             origination_success = await self._originate_call()
             if not origination_success:
                 logger.error(f"[CallAttemptHandler:{self.call_id}] Origination failed. Aborting lifecycle management.")
@@ -539,9 +586,13 @@ class CallAttemptHandler:
         finally:
             logger.info(f"[CallAttemptHandler:{self.call_id}] Starting final cleanup for lifecycle.")
             
-            # --- NEW: Unregister the generic event listener ---
-            self.ami_client.remove_generic_event_listener(self._process_ami_event)
-            logger.info(f"[CallAttemptHandler:{self.call_id}] Unregistered generic AMI event listener.")
+            self._ami_route.close()
+            logger.info(f"[CallAttemptHandler:{self.call_id}] Closed AMI event route.")
+
+            # Close the pre-warmed OpenAI session if the call never reached the AudioSocket (no-op once adopted)
+            await realtime_session_pool.discard(self.call_id)
+            if self.asterisk_call_specific_uuid:
+                await call_context_registry.remove(self.asterisk_call_specific_uuid, self.redis_client)
 
             logger.info(f"[CallAttemptHandler:{self.call_id}] Final cleanup initiated.")
             
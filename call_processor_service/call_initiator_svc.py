@@ -17,8 +17,10 @@ from database import db_manager # db_manager's functions will be called directly
 from database.models import Task, Call, CallCreate, CallStatus, TaskStatus
 from common.logger_setup import setup_logger
 from common.redis_client import RedisClient
+from common.scheduler_events import scheduler_events, EVENT_CALL_ENDED
 from call_processor_service.asterisk_ami_client import AsteriskAmiClient
 from call_processor_service.call_attempt_handler import CallAttemptHandler
+from call_processor_service.call_rate_limiter import call_rate_limiter
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
@@ -35,6 +37,7 @@ class CallInitiatorService:
         self.active_call_attempt_ids: Set[int] = set()
         self._lock = asyncio.Lock()
         self._sync_task: Optional[asyncio.Task] = None
+        self.trunk_name = f"{app_config.DEFAULT_ASTERISK_CHANNEL_TYPE}/{app_config.DEFAULT_CALLER_ID_EXTEN}" # Rate limit key for the SIP trunk
         # self._loop is no longer needed here if db_manager functions are async def
         logger.info(f"CallInitiatorService initialized. Effective max concurrent calls: {self.max_concurrent_calls}")
         
@@ -50,11 +53,15 @@ class CallInitiatorService:
         async with self._lock:
             self.active_call_attempt_ids.discard(call_id)
             logger.info(f"[CallInitiator] Unregistered call attempt ID: {call_id}. Current active calls: {len(self.active_call_attempt_ids)}")
+        scheduler_events.notify_local(EVENT_CALL_ENDED) # A slot is free; the scheduler can claim the next due task now
 
     async def get_current_active_calls(self) -> int:
         async with self._lock:
             return len(self.active_call_attempt_ids)
 
+    async def get_available_call_slots(self) -> int:
+        return max(0, self.max_concurrent_calls - await self.get_current_active_calls())
+
     async def can_initiate_new_call(self) -> bool:
         current_active = await self.get_current_active_calls()
         can_initiate = current_active < self.max_concurrent_calls
@@ -66,6 +73,11 @@ class CallInitiatorService:
         logger.info(f"[CallInitiator] Attempting to initiate call for Task ID: {task.id} (User ID: {task.user_id}, Phone: {task.phone_number})")
         loop = asyncio.get_running_loop() # <<< DEFINE LOOP HERE, AT THE START OF THE METHOD
 
+        # Pacing happens before a slot is taken, so attempts waiting on the trunk/campaign/user rate
+        # limits never count against get_available_call_slots(); the scheduler's claimed batch waits here
+        waited_s = await call_rate_limiter.acquire(self.trunk_name, task.campaign_id, task.user_id)
+        if waited_s > 0:
+            logger.info(f"[CallInitiator] Task ID: {task.id} - Waited {waited_s:.2f}s for the call rate limit.")
 
         if not await self.can_initiate_new_call():
             logger.warning(f"[CallInitiator] Task ID: {task.id} - Call initiation deferred due to concurrency limit.")
@@ -0,0 +1,162 @@
+# call_processor_service/call_rate_limiter.py
+import asyncio
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+RATE_LIMIT_SCOPES = ("trunk", "campaign", "user")
+IDLE_BUCKET_TTL_S = 600.0 # Full, unused campaign/user buckets are forgotten after this long
+TOKEN_EPSILON = 1e-6 # Refill arithmetic can land a hair under a whole token exactly when one is due
+
+
+class TokenBucket:
+    """`rate_per_s` tokens per second, holding at most `burst`. One token per call origination."""
+
+    def __init__(self, rate_per_s: float, burst: float, now: float):
+        self.rate_per_s = rate_per_s
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated_at = now
+        self.last_used = now
+        self.waiters: Deque[asyncio.Event] = deque() # FIFO; only the head may take a token
+
+    def _refill(self, now: float):
+        if now > self.updated_at:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate_per_s)
+            self.updated_at = now
+
+    def wait_time(self, now: float) -> float:
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1.0 - TOKEN_EPSILON else (1.0 - self.tokens) / self.rate_per_s
+
+    def take(self, now: float):
+        self.tokens -= 1.0
+        self.last_used = now
+
+    def is_idle(self, now: float) -> bool:
+        self._refill(now)
+        return not self.waiters and self.tokens >= self.burst and now - self.last_used > IDLE_BUCKET_TTL_S
+
+
+class CallRateLimiter:
+    """Paces call originations (calls per second) per SIP trunk, per campaign and per user.
+
+    Each scope has a rate and burst size (CALL_RATE_*_CPS / CALL_RATE_*_BURST; a rate of 0 means
+    unlimited). acquire() waits until every bucket that applies to the call has a token and then
+    takes one from each, so a campaign starting or many slots freeing at once produce a steady
+    stream of Originates instead of a burst that trips the trunk's CPS limit. Callers queue per
+    bucket and are served in arrival order.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None):
+        self.limits: Dict[str, Tuple[float, float]] = limits or {
+            "trunk": (app_config.CALL_RATE_TRUNK_CPS, app_config.CALL_RATE_TRUNK_BURST),
+            "campaign": (app_config.CALL_RATE_CAMPAIGN_CPS, app_config.CALL_RATE_CAMPAIGN_BURST),
+            "user": (app_config.CALL_RATE_USER_CPS, app_config.CALL_RATE_USER_BURST),
+        }
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._last_prune = 0.0
+        self.stats: Dict[str, float] = {
+            "acquired": 0,
+            "delayed": 0,          # Acquisitions that had to wait for a token
+            "total_wait_s": 0.0,
+            "max_wait_s": 0.0,
+        }
+
+    async def acquire(self, trunk: Optional[str] = None, campaign_id: Optional[int] = None,
+                      user_id: Optional[int] = None) -> float:
+        """Waits for a token from each applicable bucket and takes them. Returns the seconds waited."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        buckets = self._buckets_for({"trunk": trunk, "campaign": campaign_id, "user": user_id}, started)
+        delayed = False
+        turn = asyncio.Event() # Set whenever this caller may have reached the head of a queue
+        for bucket in buckets:
+            bucket.waiters.append(turn)
+        try:
+            while True:
+                if any(bucket.waiters[0] is not turn for bucket in buckets):
+                    delayed = True
+                    turn.clear()
+                    await turn.wait()
+                    continue
+                now = loop.time()
+                wait_s = max((bucket.wait_time(now) for bucket in buckets), default=0.0)
+                if wait_s <= 0:
+                    for bucket in buckets:
+                        bucket.take(now)
+                    break
+                delayed = True
+                await asyncio.sleep(wait_s)
+        finally:
+            for bucket in buckets:
+                bucket.waiters.remove(turn)
+                if bucket.waiters:
+                    bucket.waiters[0].set() # Wake the next caller in line
+
+        waited_s = loop.time() - started if delayed else 0.0
+        self.stats["acquired"] += 1
+        if delayed:
+            self.stats["delayed"] += 1
+            self.stats["total_wait_s"] += waited_s
+            self.stats["max_wait_s"] = max(self.stats["max_wait_s"], waited_s)
+        return waited_s
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = asyncio.get_running_loop().time()
+        buckets = []
+        for (scope, key), bucket in self._buckets.items():
+            bucket.wait_time(now) # Refill so the reported token count is current
+            buckets.append({
+                "scope": scope,
+                "key": key,
+                "rate_per_s": bucket.rate_per_s,
+                "burst": bucket.burst,
+                "tokens": round(bucket.tokens, 3),
+                "waiting": len(bucket.waiters),
+            })
+        return {
+            "limits": {scope: {"rate_per_s": rate, "burst": burst} for scope, (rate, burst) in self.limits.items()},
+            **self.stats,
+            "waiting": max((bucket["waiting"] for bucket in buckets), default=0),
+            "buckets": buckets,
+        }
+
+    def _buckets_for(self, keys: Dict[str, Any], now: float) -> List[TokenBucket]:
+        if now - self._last_prune > IDLE_BUCKET_TTL_S:
+            self._prune_idle_buckets(now)
+        buckets = []
+        for scope in RATE_LIMIT_SCOPES:
+            key = keys.get(scope)
+            rate_per_s, burst = self.limits.get(scope, (0.0, 0.0))
+            if key is None or rate_per_s <= 0:
+                continue
+            bucket = self._buckets.get((scope, str(key)))
+            if bucket is None:
+                bucket = self._buckets[(scope, str(key))] = TokenBucket(rate_per_s, burst, now)
+            buckets.append(bucket)
+        return buckets
+
+    def _prune_idle_buckets(self, now: float):
+        self._last_prune = now
+        idle = [key for key, bucket in self._buckets.items() if bucket.is_idle(now)]
+        for key in idle:
+            del self._buckets[key]
+        if idle:
+            logger.debug(f"[CallRateLimiter] Dropped {len(idle)} idle rate limit buckets.")
+
+
+call_rate_limiter = CallRateLimiter()
@@ -0,0 +1,74 @@
+# common/call_context_registry.py
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from common.redis_client import RedisClient
+from common.data_models import CallContext
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+REDIS_KEY_PREFIX = "call_context:"
+
+
+class CallContextRegistry:
+    """Call context keyed by the AudioSocket UUID, so the AudioSocket handshake needs no database reads.
+
+    Lookups hit an in-process dict first (the normal single-process deployment, an O(1) lookup);
+    contexts are also written to Redis with a TTL so an AudioSocket server on another node can
+    resolve them. Entries expire after `ttl_s` in both places.
+    """
+
+    def __init__(self, ttl_s: float = app_config.CALL_CONTEXT_TTL_S):
+        self.ttl_s = ttl_s
+        self._contexts: Dict[str, Tuple[CallContext, float]] = {}
+
+    async def publish(self, context: CallContext, redis_client: Optional[RedisClient] = None):
+        """Registers `context` under its asterisk_call_uuid, locally and (if given) in Redis."""
+        now = time.monotonic()
+        self._purge_expired(now)
+        self._contexts[context.asterisk_call_uuid] = (context, now + self.ttl_s)
+        if redis_client:
+            if not await redis_client.set_json(REDIS_KEY_PREFIX + context.asterisk_call_uuid, context.model_dump(), ttl_s=self.ttl_s):
+                logger.warning(f"[CallContextRegistry] Could not mirror context for AppCallID={context.call_id} to Redis; only this process can resolve it.")
+        logger.debug(f"[CallContextRegistry] Published context for AppCallID={context.call_id}, UUID={context.asterisk_call_uuid}")
+
+    async def lookup(self, asterisk_call_uuid: str, redis_client: Optional[RedisClient] = None) -> Optional[CallContext]:
+        """Returns the context for `asterisk_call_uuid`, trying this process first and then Redis."""
+        entry = self._contexts.get(asterisk_call_uuid)
+        if entry:
+            context, expires_at = entry
+            if time.monotonic() < expires_at:
+                return context
+            del self._contexts[asterisk_call_uuid]
+
+        if redis_client:
+            data = await redis_client.get_json(REDIS_KEY_PREFIX + asterisk_call_uuid)
+            if data:
+                try:
+                    return CallContext(**data)
+                except Exception as e:
+                    logger.error(f"[CallContextRegistry] Invalid context in Redis for UUID {asterisk_call_uuid}: {e}")
+        return None
+
+    async def remove(self, asterisk_call_uuid: str, redis_client: Optional[RedisClient] = None):
+        self._contexts.pop(asterisk_call_uuid, None)
+        if redis_client:
+            await redis_client.delete_key(REDIS_KEY_PREFIX + asterisk_call_uuid)
+
+    def _purge_expired(self, now: float):
+        expired = [key for key, (_, expires_at) in self._contexts.items() if expires_at <= now]
+        for key in expired:
+            del self._contexts[key]
+
+
+call_context_registry = CallContextRegistry()
@@ -143,4 +143,11 @@ class RedisHITLTimeoutCommand(RedisCommandBase):
     question: str = Field(..., description="The original question that was asked to the operator, for context.")
 class RedisAIHandshakeCommand(RedisCommandBase):
     command_type: Literal["trigger_ai_response"] = "trigger_ai_response"
-    asterisk_call_uuid: str = Field(..., description="The unique UUID for the call audio stream, used to identify the correct handler.")
\ No newline at end of file
+    asterisk_call_uuid: str = Field(..., description="The unique UUID for the call audio stream, used to identify the correct handler.")
+class CallContext(BaseModel):
+    """Everything the AudioSocket side needs about a call, published by CallAttemptHandler before Originate."""
+    call_id: int
+    task_id: int
+    user_id: int
+    asterisk_call_uuid: str
+    prompt: str
@@ -1,4 +1,8 @@
 import sys
+import os
+import itertools
+import time
+from collections import deque
 from pathlib import Path
 import asyncio
 
@@ -11,151 +15,463 @@ if str(_project_root) not in sys.path:
 import redis # Main redis module for exceptions
 import redis.asyncio as aioredis
 import json
-from typing import Callable, Any, Coroutine
+from typing import Callable, Any, Coroutine, Optional, Dict, Tuple, Set
 
 from config.app_config import app_config
 from common.logger_setup import setup_logger
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
-class RedisClient:
-    def __init__(self):
+PUBSUB_GLOB_CHARS = ("*", "?", "[")
+DISPATCH_OVERFLOW_POLICIES = ("drop_oldest", "drop_newest")
+
+
+class SubscriptionDispatcher:
+    """Runs one subscription's callback for each message it receives.
+
+    Ordered (the default): messages on the same channel are handled one at a time in arrival order,
+    different channels concurrently on at most `max_workers` tasks. At most `max_queue` messages wait
+    per channel; past that, `overflow` drops the oldest waiting message or the incoming one.
+    Unordered: one task per message with no limit (the original subscribe_to_channel behaviour); use it
+    for server-wide patterns such as `call_completed:*`, where the channels are different calls.
+    """
+
+    def __init__(self, name: str, callback: Callable[[str, dict], Coroutine[Any, Any, None]],
+                 ordered: bool = True,
+                 max_workers: int = app_config.REDIS_DISPATCH_MAX_WORKERS,
+                 max_queue: int = app_config.REDIS_DISPATCH_MAX_QUEUE,
+                 overflow: str = app_config.REDIS_DISPATCH_OVERFLOW):
+        if overflow not in DISPATCH_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow}'. Expected one of {DISPATCH_OVERFLOW_POLICIES}.")
+        self.name = name
+        self.callback = callback
+        self.ordered = ordered
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self.overflow = overflow
+        self._queues: Dict[str, deque] = {} # Channels that are waiting in _ready or held by a worker
+        self._ready: deque = deque()
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            "received": 0,
+            "handled": 0,
+            "dropped": 0,
+            "errors": 0,
+            "max_queue_depth": 0,
+        }
+
+    def submit(self, channel: str, data: dict):
+        self.stats["received"] += 1
+        if not self.ordered:
+            self._start_task(self._run_callback(channel, data))
+            return
+
+        queue = self._queues.get(channel)
+        if queue is None:
+            queue = self._queues[channel] = deque()
+            self._ready.append(channel)
+        elif len(queue) >= self.max_queue:
+            self.stats["dropped"] += 1
+            if self.overflow == "drop_newest":
+                logger.warning(f"[SubscriptionDispatcher:{self.name}] Queue for {channel} full ({len(queue)}). Dropping incoming message.")
+                return
+            queue.popleft()
+            logger.warning(f"[SubscriptionDispatcher:{self.name}] Queue for {channel} full ({len(queue) + 1}). Dropping oldest message.")
+        queue.append(data)
+        if len(queue) > self.stats["max_queue_depth"]:
+            self.stats["max_queue_depth"] = len(queue)
+        if self._ready and len(self._tasks) < self.max_workers:
+            self._start_task(self._run_worker())
+
+    def close(self):
+        """Drops waiting messages. Callbacks already running are left to finish."""
+        self._queues.clear()
+        self._ready.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "queued": sum(len(queue) for queue in self._queues.values()),
+            "channels_waiting": len(self._ready),
+            "running": len(self._tasks),
+        }
+
+    def _start_task(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_worker(self):
+        # One message per turn, so a busy channel cannot starve the others
+        while self._ready:
+            channel = self._ready.popleft()
+            queue = self._queues.get(channel)
+            if not queue:
+                continue
+            await self._run_callback(channel, queue.popleft())
+            if self._queues.get(channel) is not queue:
+                continue # close() ran while the callback was awaited
+            if queue:
+                self._ready.append(channel)
+            else:
+                del self._queues[channel]
+
+    async def _run_callback(self, channel: str, data: dict):
         try:
-            self.sync_redis_client = redis.Redis(
-                host=app_config.REDIS_HOST,
-                port=app_config.REDIS_PORT,
-                db=app_config.REDIS_DB,
-                password=app_config.REDIS_PASSWORD,
-                decode_responses=True
-            )
-            self.sync_redis_client.ping()
-            logger.info(f"Synchronous Redis client connected to {app_config.REDIS_HOST}:{app_config.REDIS_PORT}")
-        except redis.exceptions.ConnectionError as e: # Use redis.exceptions
-            logger.error(f"Failed to connect synchronous Redis client: {e}")
-            self.sync_redis_client = None
+            await self.callback(channel, data)
+            self.stats["handled"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Error in Redis message callback for {channel}: {e}", exc_info=True)
+
 
+class RedisClient:
+    def __init__(self):
+        self._sync_redis_client = None # Created on first access; nothing on the async paths needs it
         self.async_redis_client = None
+        self._connect_lock: Optional[asyncio.Lock] = None
 
-    async def _get_async_redis_client(self):
-        # For async client, we primarily rely on successful ping or operations.
-        # Connection check is implicit in operations.
-        if self.async_redis_client is None: # Initialize if None
+        # Health is tracked by a background heartbeat instead of a PING before every operation
+        self.is_healthy = False
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self.heartbeat_stats: Dict[str, Any] = {"heartbeats": 0, "failures": 0, "reconnects": 0, "last_rtt_ms": None}
+
+        # Pub/Sub multiplexer: every subscribe_to_channel() caller shares one pubsub connection.
+        # Exact channel names are SUBSCRIBEd, glob patterns PSUBSCRIBEd; each maps to {subscription_id: dispatcher}.
+        self._channel_callbacks: Dict[str, Dict[int, SubscriptionDispatcher]] = {}
+        self._pattern_callbacks: Dict[str, Dict[int, SubscriptionDispatcher]] = {}
+        self._subscription_keys: Dict[int, Tuple[str, bool]] = {}
+        self._subscription_ids = itertools.count(1)
+        self._pubsub = None # Set while the reader holds a live pubsub connection
+        self._pubsub_reader_task: Optional[asyncio.Task] = None
+        # Always subscribed, so listen() keeps running while no caller is registered
+        self._pubsub_keepalive_channel = f"redis_client_keepalive:{os.getpid()}:{id(self)}"
+
+    @property
+    def sync_redis_client(self):
+        """Blocking client for scripts and tests, connected on first access. None if Redis is unreachable."""
+        if self._sync_redis_client is None:
             try:
-                self.async_redis_client = aioredis.Redis(
+                client = redis.Redis(
                     host=app_config.REDIS_HOST,
                     port=app_config.REDIS_PORT,
                     db=app_config.REDIS_DB,
                     password=app_config.REDIS_PASSWORD,
                     decode_responses=True
                 )
-                await self.async_redis_client.ping() # Test connection on creation
-                logger.info(f"Asynchronous Redis client (re)connected to {app_config.REDIS_HOST}:{app_config.REDIS_PORT}")
-            except (redis.exceptions.ConnectionError, Exception) as e: # Use redis.exceptions
-                logger.error(f"Failed to connect asynchronous Redis client: {e}")
-                if self.async_redis_client: # Ensure it's None if connection failed
-                    await self.async_redis_client.aclose() # Use aclose
-                    self.async_redis_client = None
-                raise
-        # To check if an existing client is still connected, we can try a ping before returning it.
-        # However, this adds overhead. Usually, operations will fail if not connected.
-        # For robustness, especially if the client might have disconnected:
-        elif self.async_redis_client is not None:
-             try:
-                 await self.async_redis_client.ping()
-             except redis.exceptions.ConnectionError:
-                 logger.warning("Async Redis client lost connection. Attempting to reconnect.")
-                 await self.async_redis_client.aclose() # Use aclose
-                 self.async_redis_client = None
-                 # Call self again to re-initialize
-                 return await self._get_async_redis_client()
-             except Exception as e_ping: # Other errors during ping
-                 logger.error(f"Error pinging existing async Redis client: {e_ping}")
-                 # Decide if to force reconnect or raise
-                 await self.async_redis_client.aclose() # Use aclose
-                 self.async_redis_client = None
-                 return await self._get_async_redis_client()
+                client.ping()
+                self._sync_redis_client = client
+                logger.info(f"Synchronous Redis client connected to {app_config.REDIS_HOST}:{app_config.REDIS_PORT}")
+            except redis.exceptions.ConnectionError as e:
+                logger.error(f"Failed to connect synchronous Redis client: {e}")
+        return self._sync_redis_client
 
+    async def _get_async_redis_client(self):
+        """Returns the shared async client, connecting (and starting the heartbeat) on first use.
 
+        No PING here: a cached client is returned as is, and the heartbeat replaces it if Redis stops answering.
+        Raises if a new connection cannot be made.
+        """
+        if self.async_redis_client is not None:
+            return self.async_redis_client
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.async_redis_client is None:
+                client = aioredis.Redis(
+                    host=app_config.REDIS_HOST,
+                    port=app_config.REDIS_PORT,
+                    db=app_config.REDIS_DB,
+                    password=app_config.REDIS_PASSWORD,
+                    decode_responses=True
+                )
+                try:
+                    await client.ping() # Test connection on creation
+                except Exception as e:
+                    logger.error(f"Failed to connect asynchronous Redis client: {e}")
+                    self.is_healthy = False
+                    await client.aclose()
+                    raise
+                self.async_redis_client = client
+                self.is_healthy = True
+                logger.info(f"Asynchronous Redis client (re)connected to {app_config.REDIS_HOST}:{app_config.REDIS_PORT}")
+            if self._heartbeat_task is None or self._heartbeat_task.done():
+                self._heartbeat_task = asyncio.create_task(self._run_heartbeat())
         return self.async_redis_client
 
+    async def _drop_async_client(self, client=None):
+        """Discards `client` (default: the current one) so the next operation or heartbeat reconnects."""
+        client = client or self.async_redis_client
+        if client is None:
+            return
+        if self.async_redis_client is client:
+            self.async_redis_client = None
+            self.is_healthy = False
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.debug(f"Error closing dropped async Redis client: {e}")
+
+    async def _run_heartbeat(self):
+        """PINGs Redis every REDIS_HEARTBEAT_INTERVAL_S. A missed heartbeat drops the client and the next one reconnects."""
+        while True:
+            await asyncio.sleep(app_config.REDIS_HEARTBEAT_INTERVAL_S)
+            client = self.async_redis_client
+            try:
+                if client is None:
+                    await self._get_async_redis_client()
+                    self.heartbeat_stats["reconnects"] += 1
+                    continue
+                started = time.perf_counter()
+                await asyncio.wait_for(client.ping(), timeout=app_config.REDIS_HEARTBEAT_TIMEOUT_S)
+                self.heartbeat_stats["heartbeats"] += 1
+                self.heartbeat_stats["last_rtt_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                if not self.is_healthy:
+                    logger.info("Redis heartbeat recovered.")
+                self.is_healthy = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.heartbeat_stats["failures"] += 1
+                if self.is_healthy or client is not None:
+                    logger.warning(f"Redis heartbeat failed: {e!r}. Reconnecting.")
+                await self._drop_async_client(client)
+
+    def get_health_stats(self) -> Dict[str, Any]:
+        return {"healthy": self.is_healthy, **self.heartbeat_stats}
+
     async def publish_command(self, channel: str, command_data: dict) -> bool:
         if not isinstance(command_data, dict):
             logger.error(f"Command data must be a dictionary. Received: {type(command_data)}")
             return False
+        client = None
         try:
             client = await self._get_async_redis_client()
-            if client:
-                message_json = json.dumps(command_data)
-                await client.publish(channel, message_json)
-                logger.debug(f"Published to {channel}: {message_json}")
-                return True
-            logger.warning("Cannot publish command, async Redis client not available.")
-            return False
+            message_json = json.dumps(command_data)
+            await client.publish(channel, message_json)
+            logger.debug(f"Published to {channel}: {message_json}")
+            return True
         except redis.exceptions.ConnectionError: # Specific catch for connection issues
             logger.error(f"Connection error publishing to Redis channel {channel}. Forcing client re-init on next call.")
-            if self.async_redis_client:
-                await self.async_redis_client.aclose() # Use aclose
-            self.async_redis_client = None
+            await self._drop_async_client(client)
             return False
         except Exception as e:
             logger.error(f"Error publishing to Redis channel {channel}: {e}")
             return False
 
-    async def subscribe_to_channel(self, channel_pattern: str,
-                                   callback: Callable[[str, dict], Coroutine[Any, Any, None]]):
-        pubsub = None
+    async def publish_to_subscribers(self, channel: str, command_data: dict) -> int:
+        """Like publish_command(), but returns how many subscribers received the message (0 on error)."""
+        client = None
+        try:
+            client = await self._get_async_redis_client()
+            receivers = await client.publish(channel, json.dumps(command_data))
+            logger.debug(f"Published to {channel} ({receivers} subscribers): {command_data}")
+            return int(receivers)
+        except redis.exceptions.ConnectionError:
+            logger.error(f"Connection error publishing to Redis channel {channel}. Forcing client re-init on next call.")
+            await self._drop_async_client(client)
+            return 0
+        except Exception as e:
+            logger.error(f"Error publishing to Redis channel {channel}: {e}")
+            return 0
+
+    async def set_json(self, key: str, value: dict, ttl_s: Optional[float] = None) -> bool:
+        """Stores `value` as a JSON string under `key`, expiring after `ttl_s` seconds if given."""
+        client = None
+        try:
+            client = await self._get_async_redis_client()
+            await client.set(key, json.dumps(value), px=int(ttl_s * 1000) if ttl_s else None)
+            return True
+        except redis.exceptions.ConnectionError:
+            logger.error(f"Connection error setting Redis key {key}. Forcing client re-init on next call.")
+            await self._drop_async_client(client)
+            return False
+        except Exception as e:
+            logger.error(f"Error setting Redis key {key}: {e}")
+            return False
+
+    async def get_json(self, key: str) -> Optional[dict]:
+        """Returns the JSON value stored under `key`, or None if missing or unreadable."""
         client = None
+        try:
+            client = await self._get_async_redis_client()
+            raw = await client.get(key)
+            return json.loads(raw) if raw else None
+        except redis.exceptions.ConnectionError:
+            logger.error(f"Connection error reading Redis key {key}. Forcing client re-init on next call.")
+            await self._drop_async_client(client)
+            return None
+        except Exception as e:
+            logger.error(f"Error reading Redis key {key}: {e}")
+            return None
+
+    async def delete_key(self, key: str) -> bool:
+        client = None
+        try:
+            client = await self._get_async_redis_client()
+            await client.delete(key)
+            return True
+        except redis.exceptions.ConnectionError:
+            logger.error(f"Connection error deleting Redis key {key}. Forcing client re-init on next call.")
+            await self._drop_async_client(client)
+            return False
+        except Exception as e:
+            logger.error(f"Error deleting Redis key {key}: {e}")
+            return False
+
+    async def subscribe_to_channel(self, channel_pattern: str,
+                                   callback: Callable[[str, dict], Coroutine[Any, Any, None]],
+                                   **dispatch_options):
+        """Routes messages on `channel_pattern` (exact channel name or glob) to `callback` until the calling task is cancelled.
+
+        All subscriptions share this client's single pubsub connection; see add_subscription().
+        `dispatch_options` (ordered, max_workers, max_queue, overflow) go to SubscriptionDispatcher.
+        """
+        subscription_id = await self.add_subscription(channel_pattern, callback, **dispatch_options)
+        logger.info(f"Subscribed to Redis channel pattern: {channel_pattern}")
+        try:
+            await asyncio.get_running_loop().create_future() # Resolved never; the caller cancels us
+        except asyncio.CancelledError:
+            logger.info(f"Subscription to {channel_pattern} cancelled.")
+        finally:
+            await self.remove_subscription(subscription_id)
+
+    async def add_subscription(self, channel_pattern: str,
+                               callback: Callable[[str, dict], Coroutine[Any, Any, None]],
+                               **dispatch_options) -> int:
+        """Registers `callback` on the shared pubsub connection. Returns an id for remove_subscription().
+
+        Only the first callback for a channel/pattern costs a Redis round trip; the rest are a dict insert.
+        """
+        dispatcher = SubscriptionDispatcher(channel_pattern, callback, **dispatch_options)
+        is_pattern = any(char in channel_pattern for char in PUBSUB_GLOB_CHARS)
+        table = self._pattern_callbacks if is_pattern else self._channel_callbacks
+        callbacks = table.get(channel_pattern)
+        first_for_key = callbacks is None
+        if first_for_key:
+            callbacks = table[channel_pattern] = {}
+        subscription_id = next(self._subscription_ids)
+        callbacks[subscription_id] = dispatcher
+        self._subscription_keys[subscription_id] = (channel_pattern, is_pattern)
+
+        if self._pubsub_reader_task is None or self._pubsub_reader_task.done():
+            self._pubsub_reader_task = asyncio.create_task(self._run_pubsub_reader())
+        elif first_for_key:
+            # If the reader is still (re)connecting it subscribes everything in the tables itself
+            await self._update_server_subscription(channel_pattern, is_pattern, subscribe=True)
+        return subscription_id
+
+    async def remove_subscription(self, subscription_id: int):
+        """Unregisters a callback; the channel/pattern is unsubscribed once its last callback is gone."""
+        key = self._subscription_keys.pop(subscription_id, None)
+        if key is None:
+            return
+        channel_pattern, is_pattern = key
+        table = self._pattern_callbacks if is_pattern else self._channel_callbacks
+        callbacks = table.get(channel_pattern)
+        if callbacks is None:
+            return
+        dispatcher = callbacks.pop(subscription_id, None)
+        if dispatcher:
+            dispatcher.close()
+        if not callbacks:
+            del table[channel_pattern]
+            await self._update_server_subscription(channel_pattern, is_pattern, subscribe=False)
+
+    async def _update_server_subscription(self, channel_pattern: str, is_pattern: bool, subscribe: bool):
+        pubsub = self._pubsub
+        if pubsub is None:
+            return
+        try:
+            if is_pattern:
+                await (pubsub.psubscribe if subscribe else pubsub.punsubscribe)(channel_pattern)
+            else:
+                await (pubsub.subscribe if subscribe else pubsub.unsubscribe)(channel_pattern)
+        except Exception as e:
+            # A broken connection also ends the reader's listen(), which reconnects and resubscribes from the tables
+            logger.error(f"Error {'subscribing to' if subscribe else 'unsubscribing from'} Redis {channel_pattern}: {e}")
+
+    async def _run_pubsub_reader(self):
+        """Owns the shared pubsub connection: (re)subscribes everything registered and routes each message by dict lookup."""
         while True:
+            pubsub = None
             try:
                 client = await self._get_async_redis_client()
-                if not client:
-                    logger.error("Cannot subscribe, async Redis client not available. Retrying in 5s...")
-                    await asyncio.sleep(5)
-                    continue
-
                 pubsub = client.pubsub()
-                await pubsub.psubscribe(channel_pattern)
-                logger.info(f"Subscribed to Redis channel pattern: {channel_pattern}")
+                # The first command opens the pubsub connection; nobody else may use it before that
+                await pubsub.subscribe(self._pubsub_keepalive_channel)
+                self._pubsub = pubsub
+                if self._channel_callbacks:
+                    await pubsub.subscribe(*self._channel_callbacks)
+                if self._pattern_callbacks:
+                    await pubsub.psubscribe(*self._pattern_callbacks)
+                logger.info(f"Redis pub/sub connected: {len(self._channel_callbacks)} channel(s), {len(self._pattern_callbacks)} pattern(s) subscribed.")
 
                 async for message in pubsub.listen():
-                    if message and message["type"] == "pmessage":
-                        try:
-                            actual_channel = message["channel"]
-                            message_data_dict = json.loads(message["data"])
-                            logger.debug(f"Received from {actual_channel} (matched by {channel_pattern}): {message_data_dict}")
-                            asyncio.create_task(callback(actual_channel, message_data_dict))
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Error decoding JSON from Redis message on {message['channel']}: {e} - Data: {message['data']}")
-                        except Exception as e:
-                            logger.error(f"Error in Redis message callback for {message['channel']}: {e}")
-            except redis.exceptions.ConnectionError: # Use redis.exceptions
-                logger.warning(f"Redis connection lost during subscription to {channel_pattern}. Reconnecting in 5s...")
-                if client:
-                    await client.aclose() # Use aclose
-                self.async_redis_client = None
-                client = None
-                if pubsub:
-                    # No explicit close for pubsub object itself, it's tied to client connection
-                    pubsub = None
+                    self._route_pubsub_message(message)
+            except redis.exceptions.ConnectionError:
+                logger.warning("Redis pub/sub connection lost. Reconnecting in 5s...")
+                self._pubsub = None
+                await self._drop_async_client()
                 await asyncio.sleep(5)
             except asyncio.CancelledError:
-                logger.info(f"Subscription to {channel_pattern} cancelled.")
-                if pubsub and client: # Ensure client exists before trying to use pubsub methods
-                    try:
-                        # Check if client is still valid before unsubscribe
-                        # No direct is_connected, rely on it not throwing if connection is bad during this critical cleanup
-                        if client: # Redundant check but safe
-                           await pubsub.unsubscribe(channel_pattern) #This might fail if connection is truly gone
-                    except Exception as e_unsub:
-                        logger.error(f"Error during pubsub.unsubscribe on cancellation: {e_unsub}")
-                    # pubsub object itself doesn't have a separate close/aclose. It's managed by the client.
-                break
+                raise
             except Exception as e:
-                logger.error(f"Unexpected error in Redis subscription loop for {channel_pattern}: {e}")
+                logger.error(f"Unexpected error in Redis pub/sub reader: {e}")
+                self._pubsub = None
                 await asyncio.sleep(10)
+            finally:
+                if pubsub is not None:
+                    if self._pubsub is pubsub:
+                        self._pubsub = None
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def _route_pubsub_message(self, message: dict):
+        message_type = message["type"]
+        if message_type == "message":
+            callbacks = self._channel_callbacks.get(message["channel"])
+        elif message_type == "pmessage":
+            callbacks = self._pattern_callbacks.get(message["pattern"])
+        else:
+            return # subscribe/unsubscribe confirmations
+        if not callbacks:
+            return
+
+        actual_channel = message["channel"]
+        try:
+            message_data_dict = json.loads(message["data"])
+        except json.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON from Redis message on {actual_channel}: {e} - Data: {message['data']}")
+            return
+        logger.debug(f"Received from {actual_channel} ({len(callbacks)} subscriber(s)): {message_data_dict}")
+        for dispatcher in list(callbacks.values()):
+            dispatcher.submit(actual_channel, message_data_dict)
 
+    def get_subscription_stats(self) -> Dict[str, Any]:
+        dispatchers = [dispatcher for table in (self._channel_callbacks, self._pattern_callbacks)
+                       for callbacks in table.values() for dispatcher in callbacks.values()]
+        return {
+            "pubsub_connected": int(self._pubsub is not None),
+            "channels": len(self._channel_callbacks),
+            "patterns": len(self._pattern_callbacks),
+            "callbacks": len(self._subscription_keys),
+            "queued": sum(dispatcher.get_stats()["queued"] for dispatcher in dispatchers),
+            "subscriptions": [{"channel_pattern": dispatcher.name, **dispatcher.get_stats()} for dispatcher in dispatchers],
+        }
 
     async def close_async_client(self):
+        for task in (self._pubsub_reader_task, self._heartbeat_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         if self.async_redis_client:
             try:
                 await self.async_redis_client.aclose() # Use aclose
@@ -0,0 +1,86 @@
+# common/scheduler_events.py
+import os
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from common.redis_client import RedisClient
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+TASK_SCHEDULER_EVENTS_CHANNEL = "task_scheduler_events"
+
+# Reasons sent with a wake-up; listeners treat them all the same, they are for logs and stats
+EVENT_CALL_ENDED = "call_ended"
+EVENT_TASKS_CREATED = "tasks_created"
+EVENT_TASK_SCHEDULED = "task_scheduled"
+
+SchedulerListener = Callable[[str, Optional[datetime]], None]
+
+
+class SchedulerEvents:
+    """Wake-up signals for TaskSchedulerService, so it runs when there is work instead of on a fixed poll.
+
+    notify() calls the listeners registered in this process and, given a RedisClient, publishes the
+    event on TASK_SCHEDULER_EVENTS_CHANNEL for schedulers in other processes. `next_action_time` is
+    the time the affected task becomes due (None means now). A process ignores its own messages
+    when they come back from Redis.
+    """
+
+    def __init__(self):
+        self._listeners: List[SchedulerListener] = []
+        self.origin = f"{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+    def add_listener(self, listener: SchedulerListener):
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: SchedulerListener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def notify_local(self, reason: str, next_action_time: Optional[datetime] = None):
+        """Wakes the schedulers in this process. Safe to call from sync code on the event loop thread."""
+        for listener in list(self._listeners):
+            try:
+                listener(reason, next_action_time)
+            except Exception as e:
+                logger.error(f"[SchedulerEvents] Listener failed for '{reason}': {e}", exc_info=True)
+
+    async def notify(self, reason: str, next_action_time: Optional[datetime] = None,
+                     redis_client: Optional[RedisClient] = None):
+        """Wakes the schedulers in this process and, if `redis_client` is given, in every other one."""
+        self.notify_local(reason, next_action_time)
+        if redis_client:
+            payload = {
+                "reason": reason,
+                "next_action_time": next_action_time.isoformat() if next_action_time else None,
+                "origin": self.origin,
+            }
+            if not await redis_client.publish_command(TASK_SCHEDULER_EVENTS_CHANNEL, payload):
+                logger.warning(f"[SchedulerEvents] Could not publish '{reason}' to {TASK_SCHEDULER_EVENTS_CHANNEL}; only this process was woken.")
+
+    async def handle_redis_message(self, channel: str, data: dict):
+        """subscribe_to_channel() callback for TASK_SCHEDULER_EVENTS_CHANNEL."""
+        if data.get("origin") == self.origin:
+            return
+        next_action_time = None
+        if data.get("next_action_time"):
+            try:
+                next_action_time = datetime.fromisoformat(data["next_action_time"])
+            except (TypeError, ValueError):
+                logger.warning(f"[SchedulerEvents] Ignoring bad next_action_time in event: {data}")
+        self.notify_local(str(data.get("reason", "remote")), next_action_time)
+
+
+scheduler_events = SchedulerEvents()
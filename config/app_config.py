@@ -8,17 +8,39 @@ load_dotenv()
 class AppConfig:
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./opendeep_app.db")
+    DB_BUSY_TIMEOUT_S: float = float(os.getenv("DB_BUSY_TIMEOUT_S", 5.0)) # How long a write waits for the lock before "database is locked"
+    DB_MMAP_SIZE_MB: int = int(os.getenv("DB_MMAP_SIZE_MB", 64)) # Memory-mapped reads per connection (0 disables)
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 256)) # Prepared statements kept per connection
+    # Writes queued to database/db_writer.py within this window after the first one are committed together
+    DB_GROUP_COMMIT_WINDOW_MS: float = float(os.getenv("DB_GROUP_COMMIT_WINDOW_MS", 2.0))
+    DB_GROUP_COMMIT_MAX_BATCH: int = int(os.getenv("DB_GROUP_COMMIT_MAX_BATCH", 200))
 
     # Redis Configuration
     REDIS_HOST: str = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT: int = int(os.getenv("REDIS_PORT", 6379))
     REDIS_DB: int = int(os.getenv("REDIS_DB", 0))
     REDIS_PASSWORD: str | None = os.getenv("REDIS_PASSWORD") # Optional
+    REDIS_HEARTBEAT_INTERVAL_S: float = float(os.getenv("REDIS_HEARTBEAT_INTERVAL_S", 5.0)) # Background PING; operations never ping
+    REDIS_HEARTBEAT_TIMEOUT_S: float = float(os.getenv("REDIS_HEARTBEAT_TIMEOUT_S", 2.0))
+    # Subscription callbacks: each channel is handled in arrival order, up to this many channels at once per subscription
+    REDIS_DISPATCH_MAX_WORKERS: int = int(os.getenv("REDIS_DISPATCH_MAX_WORKERS", 4))
+    REDIS_DISPATCH_MAX_QUEUE: int = int(os.getenv("REDIS_DISPATCH_MAX_QUEUE", 256)) # Pending messages per channel before overflow
+    REDIS_DISPATCH_OVERFLOW: str = os.getenv("REDIS_DISPATCH_OVERFLOW", "drop_oldest").lower() # drop_oldest or drop_newest
 
     # OpenAI API Configuration
     OPENAI_API_KEY: str | None = os.getenv("OPENAI_API_KEY")
     OPENAI_FORM_LLM_MODEL: str = os.getenv("OPENAI_FORM_LLM_MODEL", "gpt-4o") # For prompt generation, analysis
     OPENAI_REALTIME_LLM_MODEL: str = os.getenv("OPENAI_REALTIME_LLM_MODEL", "gpt-4o-realtime-preview-2025-06-03") # For live calls
+    # Realtime websocket endpoint; point at load_testing/realtime_stub_server.py (ws://127.0.0.1:8765/v1/realtime) to run offline
+    OPENAI_REALTIME_URL: str = os.getenv("OPENAI_REALTIME_URL", "wss://api.openai.com/v1/realtime")
+    # Realtime audio codec: "pcm16" (24kHz, resampled at the Asterisk boundary) or "g711_ulaw" (8kHz passthrough)
+    OPENAI_REALTIME_AUDIO_FORMAT: str = os.getenv("OPENAI_REALTIME_AUDIO_FORMAT", "pcm16").lower()
+    # Caller audio is coalesced into one input_audio_buffer.append per this many ms (20 = one message per AudioSocket frame)
+    OPENAI_UPLINK_BATCH_MS: int = int(os.getenv("OPENAI_UPLINK_BATCH_MS", 40))
+    # Open the Realtime session while the call is ringing so it is ready when the AudioSocket connects
+    OPENAI_SESSION_PREWARM_ENABLED: bool = os.getenv("OPENAI_SESSION_PREWARM_ENABLED", "True").lower() == "true"
+    CALL_CONTEXT_TTL_S: float = float(os.getenv("CALL_CONTEXT_TTL_S", 300.0)) # Lifetime of call context published for the AudioSocket handshake
+    OPENAI_SESSION_PREWARM_TTL_S: float = float(os.getenv("OPENAI_SESSION_PREWARM_TTL_S", 90.0)) # Unadopted warm sessions are closed after this
     GOOGLE_API_KEY: str | None = os.getenv("GOOGLE_API_KEY")
 
     # Asterisk AMI Configuration
@@ -29,19 +51,49 @@ class AppConfig:
     DEFAULT_ASTERISK_CONTEXT: str = os.getenv("DEFAULT_ASTERISK_CONTEXT", "default")
     DEFAULT_ASTERISK_CHANNEL_TYPE: str = os.getenv("DEFAULT_ASTERISK_CHANNEL_TYPE", "PJSIP") # or SIP, etc.
     DEFAULT_CALLER_ID_EXTEN: str = os.getenv("DEFAULT_CALLER_ID_EXTEN", "opendeep") # CallerID num part
+    AMI_CONNECT_TIMEOUT_S: float = float(os.getenv("AMI_CONNECT_TIMEOUT_S", 10.0)) # TCP connect + banner + Login
+    AMI_KEEPALIVE_INTERVAL_S: float = float(os.getenv("AMI_KEEPALIVE_INTERVAL_S", 30.0)) # Ping period; a missed Pong triggers a reconnect
+    AMI_POOL_SIZE: int = int(os.getenv("AMI_POOL_SIZE", 3)) # AMI sessions: 1 reserved for events, the rest load-balance actions (1 = one shared session)
+    # Ask Asterisk for only the events our listeners use (Login "Events:" mask + Filter actions). Needs the AMI user's "system" write permission for Filter
+    AMI_EVENT_FILTERING: bool = os.getenv("AMI_EVENT_FILTERING", "True").lower() == "true"
 
     # AudioSocket Server Configuration (for Asterisk to connect to)
     AUDIOSOCKET_HOST: str = os.getenv("AUDIOSOCKET_HOST", "0.0.0.0") # Host for our audiosocket server
     AUDIOSOCKET_PORT: int = int(os.getenv("AUDIOSOCKET_PORT", 1200)) # Port for our audiosocket server
         # Add the missing timeout variable for TCP AudioSocket reads
     AUDIOSOCKET_READ_TIMEOUT_S: float = float(os.getenv("AUDIOSOCKET_READ_TIMEOUT_S", 5.0)) # <-- ADD THIS LINE
+    # Shared 20ms playout clock: max frames sent per handler in one tick when the clock wakes up late
+    AUDIOSOCKET_PLAYOUT_MAX_CATCHUP_FRAMES: int = int(os.getenv("AUDIOSOCKET_PLAYOUT_MAX_CATCHUP_FRAMES", 5))
+    # Per-call 8kHz playback ring buffer: allocated at the initial size and grown on demand up to the cap, and the
+    # fill level at which we stop pulling AI audio until it drains (the cap only needs a little headroom above it)
+    AUDIOSOCKET_PLAYBACK_BUFFER_S: float = float(os.getenv("AUDIOSOCKET_PLAYBACK_BUFFER_S", 50.0))
+    AUDIOSOCKET_PLAYBACK_INITIAL_S: float = float(os.getenv("AUDIOSOCKET_PLAYBACK_INITIAL_S", 2.0))
+    AUDIOSOCKET_PLAYBACK_HIGH_WATER_S: float = float(os.getenv("AUDIOSOCKET_PLAYBACK_HIGH_WATER_S", 45.0))
+    AUDIOSOCKET_PLAYOUT_STATS_INTERVAL_S: float = float(os.getenv("AUDIOSOCKET_PLAYOUT_STATS_INTERVAL_S", 30.0)) # Missed-deadline report interval
+
+    # Call recordings: pcm16_24k (legacy), pcm16_8k (native rate) or ulaw_8k (G.711 archive)
+    CALL_RECORDING_FORMAT: str = os.getenv("CALL_RECORDING_FORMAT", "pcm16_24k").lower()
+
+    # DTMF: "ami" uses PlayDTMF. "inband" (opt-in) plays tones into the AudioSocket stream; only enable it when the
+    # trunk carries G.711 end to end (G.729/GSM distort the tones). Inband falls back to AMI when no AudioSocket handler is attached
+    DTMF_MODE: str = os.getenv("DTMF_MODE", "ami").lower()
+    DTMF_TONE_ON_MS: float = float(os.getenv("DTMF_TONE_ON_MS", 100.0)) # Tone length per digit (also the PlayDTMF Duration)
+    DTMF_TONE_OFF_MS: float = float(os.getenv("DTMF_TONE_OFF_MS", 100.0)) # Silence after each digit
 
     OUTPUT_GAIN_FACTOR: float = 1.5 # Default gain, adjust as neede
     # Application Settings
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
     MAX_CONCURRENT_CALLS: int = int(os.getenv("MAX_CONCURRENT_CALLS", 10)) # For CallInitiatorService
+    # Call pacing is off by default (every CPS is 0). To enable it, set a scope's CPS to the allowed
+    # Originates per second, e.g. CALL_RATE_TRUNK_CPS=5 for the trunk's contracted limit; BURST is how many may go back to back
+    CALL_RATE_TRUNK_CPS: float = float(os.getenv("CALL_RATE_TRUNK_CPS", 0)) # Originates per second on the SIP trunk. 0 disables
+    CALL_RATE_TRUNK_BURST: float = float(os.getenv("CALL_RATE_TRUNK_BURST", 5))
+    CALL_RATE_CAMPAIGN_CPS: float = float(os.getenv("CALL_RATE_CAMPAIGN_CPS", 0)) # Per campaign. 0 disables
+    CALL_RATE_CAMPAIGN_BURST: float = float(os.getenv("CALL_RATE_CAMPAIGN_BURST", 3))
+    CALL_RATE_USER_CPS: float = float(os.getenv("CALL_RATE_USER_CPS", 0)) # Per user. 0 disables
+    CALL_RATE_USER_BURST: float = float(os.getenv("CALL_RATE_USER_BURST", 3))
     DEFAULT_MAX_TASK_ATTEMPTS: int = int(os.getenv("DEFAULT_MAX_TASK_ATTEMPTS", 3))
-    TASK_SCHEDULER_POLL_INTERVAL_S: int = int(os.getenv("TASK_SCHEDULER_POLL_INTERVAL_S", 5)) # Seconds
+    TASK_SCHEDULER_POLL_INTERVAL_S: int = int(os.getenv("TASK_SCHEDULER_POLL_INTERVAL_S", 30)) # Seconds. Safety net only; the scheduler wakes on due times and scheduler events
     POST_CALL_ANALYZER_POLL_INTERVAL_S: int = int(os.getenv("POST_CALL_ANALYZER_POLL_INTERVAL_S", 10)) # Seconds
 
     # Web Interface Configuration
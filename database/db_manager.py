@@ -6,7 +6,7 @@ import sys
 from pathlib import Path
 import uuid # For generating unique batch IDs
 from enum import Enum # Import Enum for type checking
-import shutil # For creating database backups
+import threading # Per-thread persistent connections
 
 # Add the project root to the Python path
 project_root = Path(__file__).resolve().parent.parent
@@ -29,13 +29,90 @@ if "pytest" in sys.modules: # pragma: no cover
 logger.info(f"Using database file: {DATABASE_FILE}")
 
 
-def get_db_connection():
-    """Establishes a connection to the SQLite database."""
-    conn = sqlite3.connect(DATABASE_FILE)
+GROUP_COMMIT_SAVEPOINT = "group_commit_op"
+
+
+class PersistentConnection(sqlite3.Connection):
+    """A connection that stays open for the lifetime of its thread.
+
+    close() only ends the caller's use of it: an uncommitted transaction is rolled back, as a real
+    close would do, and the connection is reused by the next get_db_connection() on this thread.
+
+    While `group_commit` is set (see database/db_writer.py) each write runs inside a savepoint of a
+    shared transaction: commit() just marks the write done, rollback() undoes only that write.
+    """
+
+    group_commit = False
+    _write_committed = False
+
+    def commit(self):
+        if self.group_commit:
+            self._write_committed = True
+            return
+        super().commit()
+
+    def rollback(self):
+        if self.group_commit:
+            self.execute(f"ROLLBACK TO SAVEPOINT {GROUP_COMMIT_SAVEPOINT}")
+            return
+        super().rollback()
+
+    def close(self):
+        if self.group_commit:
+            if not self._write_committed:
+                self.rollback()
+            return
+        if self.in_transaction:
+            self.rollback()
+
+    def close_connection(self):
+        super().close()
+
+
+_thread_connections = threading.local()
+
+
+def _open_connection(readonly: bool) -> PersistentConnection:
+    conn = sqlite3.connect(
+        DATABASE_FILE,
+        factory=PersistentConnection,
+        timeout=app_config.DB_BUSY_TIMEOUT_S,
+        cached_statements=app_config.DB_STATEMENT_CACHE_SIZE
+    )
     conn.row_factory = sqlite3.Row
+    if not readonly:
+        conn.execute("PRAGMA journal_mode = WAL;") # Persistent in the file; readers no longer block writers
+    conn.execute("PRAGMA synchronous = NORMAL;") # No fsync per commit; with WAL a crash can only lose the latest commits
     conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA mmap_size = {app_config.DB_MMAP_SIZE_MB * 1024 * 1024};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    if readonly:
+        conn.execute("PRAGMA query_only = ON;")
     return conn
 
+
+def get_db_connection(readonly: bool = False) -> PersistentConnection:
+    """Returns this thread's persistent connection to the SQLite database.
+
+    Readers (`readonly=True`) get their own query_only connection, so a read never waits behind the
+    writer connection's open transaction. Callers still call close() when done; see PersistentConnection.
+    """
+    attr = "reader" if readonly else "writer"
+    conn = getattr(_thread_connections, attr, None)
+    if conn is None:
+        conn = _open_connection(readonly)
+        setattr(_thread_connections, attr, conn)
+    return conn
+
+
+def close_thread_connections():
+    """Really closes the calling thread's connections (they are reopened on next use)."""
+    for attr in ("reader", "writer"):
+        conn = getattr(_thread_connections, attr, None)
+        if conn is not None:
+            conn.close_connection()
+            setattr(_thread_connections, attr, None)
+
 def initialize_database():
     """Creates database tables from schema.sql if they don't exist."""
     conn = get_db_connection()
@@ -193,7 +270,7 @@ def create_task(task_data: TaskCreate) -> Optional[int]:
 
 def get_task_by_id(task_id: int) -> Optional[Task]:
     """Retrieves a specific task by its ID."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     try:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
@@ -356,7 +433,7 @@ def get_due_tasks(user_id: Optional[int] = None, max_tasks: int = 10) -> List[Ta
     Fetches tasks that are due for processing.
     Filters by user_id if provided.
     """
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     tasks = []
     try:
         cursor = conn.cursor()
@@ -423,11 +500,107 @@ def get_due_tasks(user_id: Optional[int] = None, max_tasks: int = 10) -> List[Ta
         logger.debug(f"get_due_tasks: Returning {len(tasks)} parsed tasks.")
     return tasks
 
+# Statuses the scheduler may pick up. The literal list must match the idx_tasks_due partial index in schema.sql,
+# or SQLite cannot use that index.
+DUE_TASK_STATUSES = (TaskStatus.PENDING, TaskStatus.ON_HOLD, TaskStatus.RETRY_SCHEDULED, TaskStatus.PENDING_USER_INFO)
+_SCHEDULABLE_TASK_FILTER = (
+    "status IN (" + ", ".join(f"'{status.value}'" for status in DUE_TASK_STATUSES) + ")"
+    " AND current_attempt_count < max_attempts"
+)
+_DUE_TASK_FILTER = _SCHEDULABLE_TASK_FILTER + " AND IFNULL(next_action_time, '') <= ?"  # NULL means due now; '' sorts before every timestamp
+_DND_MATCH = "SELECT 1 FROM dnd_list d WHERE d.user_id = tasks.user_id AND d.phone_number = tasks.phone_number"
+
+def claim_due_tasks(max_tasks: int, user_id: Optional[int] = None, now: Optional[datetime] = None) -> List[Task]:
+    """
+    Atomically moves up to `max_tasks` due tasks to QUEUED_FOR_CALL and returns them, earliest due first.
+    Due tasks whose number is on the owner's DND list are set to CANCELLED_DND in the same transaction.
+    Both statements range-scan the idx_tasks_due partial index (named explicitly: without ANALYZE
+    statistics SQLite prefers the status index and sorts every pending task), so a poll costs the
+    same however many tasks are not yet due.
+    """
+    if max_tasks <= 0:
+        return []
+    now = now or datetime.now()
+    user_filter = " AND user_id = ?" if user_id is not None else ""
+    user_params: List[Any] = [user_id] if user_id is not None else []
+
+    conn = get_db_connection()
+    tasks: List[Task] = []
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            UPDATE tasks SET status = ?, overall_conclusion = ?
+            WHERE id IN (
+                SELECT id FROM tasks INDEXED BY idx_tasks_due
+                WHERE {_DUE_TASK_FILTER}{user_filter} AND EXISTS ({_DND_MATCH})
+                LIMIT ?
+            )
+            RETURNING id
+        """, (TaskStatus.CANCELLED_DND.value, "Cancelled: Phone number on DND list.", now, *user_params, max_tasks))
+        cancelled_ids = [row["id"] for row in cursor.fetchall()]
+
+        cursor.execute(f"""
+            UPDATE tasks SET status = ?
+            WHERE id IN (
+                SELECT id FROM tasks INDEXED BY idx_tasks_due
+                WHERE {_DUE_TASK_FILTER}{user_filter} AND NOT EXISTS ({_DND_MATCH})
+                ORDER BY IFNULL(next_action_time, ''), created_at
+                LIMIT ?
+            )
+            RETURNING *
+        """, (TaskStatus.QUEUED_FOR_CALL.value, now, *user_params, max_tasks))
+        rows = cursor.fetchall()
+        conn.commit()
+
+        if cancelled_ids:
+            logger.info(f"claim_due_tasks: Cancelled {len(cancelled_ids)} due task(s) on DND lists: {cancelled_ids}")
+        for row in rows:
+            try:
+                tasks.append(Task(**dict(row)))
+            except Exception as e_parse:
+                logger.error(f"claim_due_tasks: Error parsing claimed task {row['id']}: {e_parse}", exc_info=True)
+        # RETURNING order is unspecified; hand tasks out in due order
+        tasks.sort(key=lambda task: (task.next_action_time is not None, str(task.next_action_time or ""), str(task.created_at or "")))
+    except sqlite3.Error as e:
+        logger.error(f"Database error in claim_due_tasks (user_id: {user_id}): {e}", exc_info=True)
+        return []
+    finally:
+        conn.close()
+    return tasks
+
+def get_upcoming_task_due_times(limit: int, after: Optional[datetime] = None) -> List[datetime]:
+    """
+    Returns the next `limit` next_action_time values after `after` (default now) of tasks the scheduler
+    will claim once they are due, earliest first. Reads the idx_tasks_due index only.
+    """
+    after = after or datetime.now()
+    conn = get_db_connection(readonly=True)
+    due_times: List[datetime] = []
+    try:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT next_action_time FROM tasks INDEXED BY idx_tasks_due
+            WHERE {_SCHEDULABLE_TASK_FILTER} AND IFNULL(next_action_time, '') > ?
+            ORDER BY IFNULL(next_action_time, ''), created_at
+            LIMIT ?
+        """, (after, limit))
+        for row in cursor.fetchall():
+            value = row["next_action_time"]
+            try:
+                due_times.append(value if isinstance(value, datetime) else datetime.fromisoformat(str(value)))
+            except ValueError:
+                logger.warning(f"get_upcoming_task_due_times: Skipping unparseable next_action_time {value!r}")
+    except sqlite3.Error as e:
+        logger.error(f"Database error in get_upcoming_task_due_times: {e}", exc_info=True)
+    finally:
+        conn.close()
+    return due_times
+
 # Add this function to database/db_manager.py (or replace if a similar one exists)
 
 def get_call_by_asterisk_uuid(asterisk_uuid: str) -> Optional[Call]:
     """Retrieves a specific call attempt by its Asterisk call_uuid."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     try:
         cursor = conn.cursor()
         # We query using the 'call_uuid' column which stores the Asterisk UUID
@@ -445,7 +618,7 @@ def get_call_by_asterisk_uuid(asterisk_uuid: str) -> Optional[Call]:
 
 def get_call_by_id(call_id: int) -> Optional[Call]:
     """Retrieves a specific call attempt by its ID."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     try:
         cursor = conn.cursor()
         cursor.execute("SELECT * FROM calls WHERE id = ?", (call_id,))
@@ -526,7 +699,7 @@ def update_call_status(call_id: int, status: CallStatus,
 
 def get_calls_for_task(task_id: int) -> List[Call]:
     """Retrieves all call attempts associated with a given task ID."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     calls = []
     try:
         cursor = conn.cursor()
@@ -568,7 +741,7 @@ def add_to_dnd_list(dnd_entry_data: DNDEntryCreate) -> Optional[DNDEntry]:
 
 def is_on_dnd_list(phone_number: str, user_id: int) -> bool:
     """Checks if a phone number is on the DND list for a specific user."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     try:
         cursor = conn.cursor()
         cursor.execute("SELECT 1 FROM dnd_list WHERE phone_number = ? AND user_id = ?", (phone_number, user_id))
@@ -726,7 +899,7 @@ if __name__ == "__main__": # pragma: no cover
 
 def get_active_calls_count() -> int:
     """Get count of calls that are currently active/in-progress"""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     try:
         cursor = conn.cursor()
         # Active statuses are those where the call is still ongoing
@@ -774,7 +947,7 @@ def create_task_event(event_data: TaskEventCreate) -> Optional[TaskEvent]:
 
 def get_task_events(task_id: int, limit: int = 100) -> List[TaskEvent]:
     """Retrieves task events for a specific task."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     events = []
     try:
         cursor = conn.cursor()
@@ -794,7 +967,7 @@ def get_task_events(task_id: int, limit: int = 100) -> List[TaskEvent]:
 
 def get_recent_task_events(limit: int = 50) -> List[TaskEvent]:
     """Retrieves recent task events across all tasks."""
-    conn = get_db_connection()
+    conn = get_db_connection(readonly=True)
     events = []
     try:
         cursor = conn.cursor()
@@ -817,7 +990,14 @@ def create_database_backup() -> str:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_file = f"{db_file}.backup_before_clear.{timestamp}"
         
-        shutil.copy2(db_file, backup_file)
+        # The online backup API includes commits still in the WAL, which copying the file would miss
+        source = get_db_connection(readonly=True)
+        target = sqlite3.connect(backup_file)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
         logger.info(f"Database backup created: {backup_file}")
         return backup_file
     except Exception as e:
@@ -866,5 +1046,6 @@ def clear_all_database_tables() -> int:
         logger.error(f"Error clearing database: {e}", exc_info=True)
         raise
     finally:
+        conn.execute("PRAGMA foreign_keys = ON") # The connection is reused, so never leave it with constraints off
         conn.close()
 
@@ -0,0 +1,180 @@
+# database/db_writer.py
+import asyncio
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from database import db_manager
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+_STOP = object()
+
+
+class _WriteRequest:
+    __slots__ = ("func", "args", "kwargs", "future", "loop")
+
+    def __init__(self, func: Callable, args: tuple, kwargs: dict,
+                 future: asyncio.Future, loop: asyncio.AbstractEventLoop):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+        self.loop = loop
+
+
+class AsyncDBWriter:
+    """Single thread that performs db_manager writes for the process, committing them in groups.
+
+    submit() queues a db_manager write function and returns an asyncio future for its return value.
+    The writer takes whatever is queued (waiting `window_ms` after the first write for more, up to
+    `max_batch`) and runs each write in its own savepoint of one transaction, then commits once. A
+    write that fails is rolled back to its savepoint without affecting the rest of the group. Futures
+    resolve after the commit. Writes run in submission order.
+    """
+
+    def __init__(self, window_ms: float = app_config.DB_GROUP_COMMIT_WINDOW_MS,
+                 max_batch: int = app_config.DB_GROUP_COMMIT_MAX_BATCH):
+        self.window_s = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.stats: Dict[str, int] = {
+            "writes": 0,
+            "failed_writes": 0,
+            "commits": 0,
+            "largest_group": 0,
+            "fallbacks": 0,     # Group commit failed; the group was retried one write at a time
+        }
+
+    def submit(self, func: Callable, *args, **kwargs) -> asyncio.Future:
+        """Queues `func(*args, **kwargs)` for the writer thread. Must be called from the event loop."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._ensure_started()
+        self._queue.put(_WriteRequest(func, args, kwargs, future, loop))
+        return future
+
+    async def stop(self, timeout_s: float = 10.0):
+        """Finishes the queued writes and stops the writer thread."""
+        thread = self._thread
+        if not thread or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        await asyncio.get_running_loop().run_in_executor(None, thread.join, timeout_s)
+        if thread.is_alive():
+            logger.warning(f"[DBWriter] Writer thread still running after {timeout_s}s ({self._queue.qsize()} writes queued).")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "queued": self._queue.qsize()}
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="DBWriter", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.window_s
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                self._write_group(batch)
+            except Exception as e:
+                logger.error(f"[DBWriter] Unexpected error writing a group of {len(batch)}: {e}", exc_info=True)
+                for request in batch:
+                    self._resolve(request, False, e)
+        db_manager.close_thread_connections()
+
+    def _write_group(self, batch: List[_WriteRequest]):
+        conn = db_manager.get_db_connection()
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.group_commit = True
+            try:
+                outcomes = [self._run_in_savepoint(conn, request) for request in batch]
+            finally:
+                conn.group_commit = False
+            conn.commit()
+            self.stats["commits"] += 1
+            self.stats["largest_group"] = max(self.stats["largest_group"], len(batch))
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            self.stats["fallbacks"] += 1
+            logger.warning(f"[DBWriter] Group commit of {len(batch)} writes failed ({e}). Retrying them one at a time.")
+            outcomes = [self._run_alone(request) for request in batch]
+
+        for request, (ok, value) in zip(batch, outcomes):
+            self._resolve(request, ok, value)
+
+    def _run_in_savepoint(self, conn: db_manager.PersistentConnection, request: _WriteRequest) -> Tuple[bool, Any]:
+        conn._write_committed = False
+        conn.execute(f"SAVEPOINT {db_manager.GROUP_COMMIT_SAVEPOINT}")
+        try:
+            return True, request.func(*request.args, **request.kwargs)
+        except Exception as e:
+            conn.execute(f"ROLLBACK TO SAVEPOINT {db_manager.GROUP_COMMIT_SAVEPOINT}")
+            return False, e
+        finally:
+            conn.execute(f"RELEASE SAVEPOINT {db_manager.GROUP_COMMIT_SAVEPOINT}")
+
+    @staticmethod
+    def _run_alone(request: _WriteRequest) -> Tuple[bool, Any]:
+        try:
+            return True, request.func(*request.args, **request.kwargs)
+        except Exception as e:
+            return False, e
+
+    def _resolve(self, request: _WriteRequest, ok: bool, value: Any):
+        self.stats["writes"] += 1
+        if not ok:
+            self.stats["failed_writes"] += 1
+
+        def _set():
+            if request.future.done():
+                return
+            if ok:
+                request.future.set_result(value)
+            else:
+                request.future.set_exception(value)
+
+        try:
+            request.loop.call_soon_threadsafe(_set)
+        except RuntimeError:
+            pass # The submitting loop has closed; nobody is waiting
+
+
+db_writer = AsyncDBWriter()
@@ -125,6 +125,8 @@ CREATE INDEX IF NOT EXISTS idx_users_username ON users (username);
 CREATE INDEX IF NOT EXISTS idx_campaigns_user_id ON campaigns (user_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_campaign_id ON tasks (campaign_id);
 CREATE INDEX IF NOT EXISTS idx_tasks_status_next_action_time ON tasks (status, next_action_time);
+-- Due-task claim (db_manager.claim_due_tasks): only schedulable rows, in due order. Keep the status list in sync with DUE_TASK_STATUSES.
+CREATE INDEX IF NOT EXISTS idx_tasks_due ON tasks (IFNULL(next_action_time, ''), created_at) WHERE status IN ('pending', 'on_hold', 'retry_scheduled', 'pending_user_info');
 CREATE INDEX IF NOT EXISTS idx_calls_task_id ON calls (task_id);
 CREATE INDEX IF NOT EXISTS idx_calls_status ON calls (status);
 CREATE INDEX IF NOT EXISTS idx_call_transcripts_call_id ON call_transcripts (call_id);
@@ -0,0 +1,286 @@
+# load_testing/ami_stub_server.py
+"""Local stand-in for the Asterisk Manager Interface, for offline AMI client and call-flow testing.
+
+Speaks the AMI wire protocol (banner, "Key: Value" frames, ActionID correlation) and implements
+Login, Logoff, Ping, Events, Filter, Originate, Hangup and PlayDTMF. An async Originate produces
+the event sequence CallAttemptHandler follows for a real call (Newchannel, VarSet, DialBegin,
+DialEnd, OriginateResponse and, after --call-ms, Hangup). --noise-events-per-s adds unrelated
+channel events, like a shared production PBX. Events go to every logged-in session whose event
+mask (Login "Events:" / Events action) and Filter whitelist/blacklist let them through, as in
+Asterisk's manager.c.
+
+Usage: python load_testing/ami_stub_server.py [--port 5038] [--response-latency-ms 5] [--ring-ms 500] [--call-ms 5000]
+Then point the app at it with ASTERISK_HOST=127.0.0.1 ASTERISK_PORT=5038 (any AMI user/secret
+is accepted unless --username/--secret are given).
+"""
+import argparse
+import asyncio
+import itertools
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from call_processor_service.asterisk_ami_client import AMI_EVENT_CLASSES, AMI_FRAME_END, parse_ami_frame
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+AMI_BANNER = b"Asterisk Call Manager/7.0.3\r\n"
+NOISE_EVENT_NAMES = ("Newexten", "VarSet", "RTCPSent", "RTCPReceived", "Newstate")
+
+
+def _encode_frame(fields: Dict[str, object]) -> bytes:
+    return ("".join(f"{key}: {value}\r\n" for key, value in fields.items()) + "\r\n").encode("utf-8")
+
+
+def _parse_event_mask(mask: Optional[str]) -> Optional[Set[str]]:
+    """None: every class ("on"); otherwise the enabled classes (empty for "off")."""
+    mask = (mask or "on").strip().lower()
+    if mask in ("on", "yes", "true", "all"):
+        return None
+    if mask in ("off", "no", "false"):
+        return set()
+    return {part.strip() for part in mask.split(",") if part.strip()}
+
+
+class _Session:
+    def __init__(self, session_id: int, writer: asyncio.StreamWriter):
+        self.session_id = session_id
+        self.writer = writer
+        self.logged_in = False
+        self.event_classes: Optional[Set[str]] = None
+        self.filters: List[Tuple[bool, "re.Pattern[str]"]] = [] # (whitelist, regex); "!" prefix blacklists
+
+    def send(self, fields: Dict[str, object]):
+        if not self.writer.is_closing():
+            self.writer.write(_encode_frame(fields))
+
+    def wants(self, event_class: str, text: str) -> bool:
+        if self.event_classes is not None and event_class not in self.event_classes:
+            return False
+        whitelist = [regex for allow, regex in self.filters if allow]
+        if whitelist and not any(regex.search(text) for regex in whitelist):
+            return False
+        return not any(regex.search(text) for allow, regex in self.filters if not allow)
+
+
+class AmiStubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 5038,
+                 username: Optional[str] = None, secret: Optional[str] = None,
+                 response_latency_ms: float = 5.0,
+                 ring_ms: float = 500.0,
+                 call_ms: float = 5000.0,
+                 dial_status: str = "ANSWER",
+                 noise_events_per_s: float = 0.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.secret = secret
+        self.response_latency_s = response_latency_ms / 1000.0
+        self.ring_s = ring_ms / 1000.0
+        self.call_s = call_ms / 1000.0
+        self.dial_status = dial_status
+        self.noise_events_per_s = noise_events_per_s
+
+        self._sessions: Set[_Session] = set()
+        self._session_ids = itertools.count(1)
+        self._uniqueids = itertools.count(1)
+        self._calls: Dict[str, asyncio.Task] = {} # Channel name -> running call flow
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._noise_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"sessions": 0, "actions": 0, "events_sent": 0, "events_filtered": 0, "originates": 0}
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_session, self.host, self.port)
+        if self.noise_events_per_s > 0:
+            self._noise_task = asyncio.create_task(self._run_noise())
+        logger.info(f"[AmiStub] Listening on {self.host}:{self.port}")
+
+    async def stop(self):
+        if self._noise_task:
+            self._noise_task.cancel()
+        for task in self._calls.values():
+            task.cancel()
+        for session in list(self._sessions):
+            session.writer.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def broadcast(self, fields: Dict[str, object]):
+        event_class = AMI_EVENT_CLASSES.get(str(fields.get("Event")), "system")
+        fields = {"Event": fields["Event"], "Privilege": f"{event_class},all", **fields}
+        text = "".join(f"{key}: {value}\r\n" for key, value in fields.items())
+        for session in self._sessions:
+            if not session.logged_in:
+                continue
+            if session.wants(event_class, text):
+                session.send(fields)
+                self.stats["events_sent"] += 1
+            else:
+                self.stats["events_filtered"] += 1
+
+    def _new_uniqueid(self) -> str:
+        return f"{time.time():.0f}.{next(self._uniqueids)}"
+
+    async def _handle_session(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = _Session(next(self._session_ids), writer)
+        self._sessions.add(session)
+        self.stats["sessions"] += 1
+        writer.write(AMI_BANNER)
+        try:
+            while True:
+                action = parse_ami_frame(await reader.readuntil(AMI_FRAME_END))
+                self.stats["actions"] += 1
+                if self.response_latency_s > 0:
+                    await asyncio.sleep(self.response_latency_s)
+                if not self._handle_action(session, action):
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._sessions.discard(session)
+            writer.close()
+
+    def _handle_action(self, session: _Session, action: Dict[str, str]) -> bool:
+        """Answers one action. Returns False when the session should close."""
+        name = action.get("Action", "").lower()
+        reply: Dict[str, object] = {"Response": "Success"}
+        if "ActionID" in action:
+            reply["ActionID"] = action["ActionID"]
+
+        if name == "login":
+            if (self.username and action.get("Username") != self.username) or (self.secret and action.get("Secret") != self.secret):
+                reply.update(Response="Error", Message="Authentication failed")
+            else:
+                session.logged_in = True
+                session.event_classes = _parse_event_mask(action.get("Events"))
+                reply["Message"] = "Authentication accepted"
+        elif not session.logged_in:
+            reply.update(Response="Error", Message="Permission denied")
+        elif name == "logoff":
+            reply.update(Response="Goodbye", Message="Thanks for all the fish.")
+            session.send(reply)
+            return False
+        elif name == "ping":
+            reply.update(Ping="Pong", Timestamp=f"{time.time():.6f}")
+        elif name == "events":
+            session.event_classes = _parse_event_mask(action.get("EventMask"))
+            reply["Events"] = "Off" if session.event_classes == set() else "On"
+        elif name == "filter":
+            event_filter = action.get("Filter", "")
+            try:
+                if action.get("Operation", "").lower() != "add":
+                    raise ValueError("Unknown operation")
+                allow = not event_filter.startswith("!")
+                session.filters.append((allow, re.compile(event_filter if allow else event_filter[1:])))
+                reply["Message"] = "Filter Added Successfully"
+            except (re.error, ValueError):
+                reply.update(Response="Error", Message="Filter Not Added")
+        elif name == "originate":
+            self.stats["originates"] += 1
+            reply["Message"] = "Originate successfully queued"
+            channel = f"Local/s@opendeep-ai-leg-{next(self._uniqueids):08x};1"
+            self._calls[channel] = asyncio.create_task(self._run_call(channel, action))
+        elif name == "hangup":
+            task = self._calls.get(action.get("Channel", ""))
+            if task:
+                task.cancel()
+            reply["Message"] = "Channel Hungup"
+        elif name == "playdtmf":
+            reply["Message"] = "DTMF successfully queued"
+        else:
+            reply["Message"] = f"Stub accepted {action.get('Action')}"
+        session.send(reply)
+        return True
+
+    async def _run_call(self, channel: str, action: Dict[str, str]):
+        """Event sequence of an answered outbound call through the opendeep dialplan."""
+        ai_uid, human_uid, dest_uid = self._new_uniqueid(), self._new_uniqueid(), self._new_uniqueid()
+        human_channel = channel[:-1] + "2"
+        dest_channel = f"{app_config.DEFAULT_ASTERISK_CHANNEL_TYPE}/stub-{dest_uid}"
+        action_id = action.get("ActionID", "")
+        variable = action.get("Variable", "")
+        common = {"Linkedid": ai_uid}
+        try:
+            self.broadcast({"Event": "Newchannel", "Channel": channel, "Uniqueid": ai_uid, **common})
+            self.broadcast({"Event": "Newchannel", "Channel": human_channel, "Uniqueid": human_uid, **common})
+            if "=" in variable:
+                var_name, _, var_value = variable.partition("=")
+                self.broadcast({"Event": "VarSet", "Channel": channel, "Uniqueid": ai_uid, "Variable": var_name, "Value": var_value, **common})
+            self.broadcast({"Event": "DialBegin", "Channel": human_channel, "Uniqueid": human_uid,
+                            "DestChannel": dest_channel, "DestUniqueID": dest_uid, **common})
+            await asyncio.sleep(self.ring_s)
+            self.broadcast({"Event": "DialEnd", "Channel": human_channel, "Uniqueid": human_uid,
+                            "DestChannel": dest_channel, "DialStatus": self.dial_status, **common})
+            self.broadcast({"Event": "OriginateResponse", "ActionID": action_id, "Response": "Success",
+                            "Channel": channel, "Uniqueid": ai_uid, "Reason": "4"})
+            if self.dial_status == "ANSWER":
+                await asyncio.sleep(self.call_s)
+        except asyncio.CancelledError:
+            pass # Hung up by a Hangup action
+        finally:
+            self._calls.pop(channel, None)
+            for hangup_channel, uid in ((dest_channel, dest_uid), (human_channel, human_uid), (channel, ai_uid)):
+                self.broadcast({"Event": "Hangup", "Channel": hangup_channel, "Uniqueid": uid,
+                                "Cause": "16", "Cause-txt": "Normal Clearing", **common})
+
+    async def _run_noise(self):
+        interval = 1.0 / self.noise_events_per_s
+        next_at = time.monotonic()
+        try:
+            while True:
+                uid = f"noise.{random.randrange(1_000_000)}"
+                self.broadcast({"Event": random.choice(NOISE_EVENT_NAMES),
+                                "Channel": f"PJSIP/other-{uid}", "Uniqueid": uid, "Linkedid": uid,
+                                "Context": "from-external", "Exten": "s", "Priority": "1"})
+                next_at += interval
+                await asyncio.sleep(max(0.0, next_at - time.monotonic()))
+        except asyncio.CancelledError:
+            pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Asterisk AMI stand-in for offline AMI/call-flow tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5038)
+    parser.add_argument("--username", default=None, help="Required AMI username (default: accept any)")
+    parser.add_argument("--secret", default=None, help="Required AMI secret (default: accept any)")
+    parser.add_argument("--response-latency-ms", type=float, default=5.0, help="Delay before each action response")
+    parser.add_argument("--ring-ms", type=float, default=500.0, help="DialBegin to DialEnd")
+    parser.add_argument("--call-ms", type=float, default=5000.0, help="Answer to Hangup")
+    parser.add_argument("--dial-status", default="ANSWER", help="DialStatus for originated calls (ANSWER, BUSY, NOANSWER, ...)")
+    parser.add_argument("--noise-events-per-s", type=float, default=0.0, help="Unrelated channel events per second")
+    parser.add_argument("--stats-interval-s", type=float, default=30.0)
+    args = parser.parse_args()
+
+    async def run():
+        server = AmiStubServer(args.host, args.port, args.username, args.secret, args.response_latency_ms,
+                               args.ring_ms, args.call_ms, args.dial_status, args.noise_events_per_s)
+        await server.start()
+        try:
+            while True:
+                await asyncio.sleep(args.stats_interval_s)
+                logger.info(f"[AmiStub] {len(server._sessions)} sessions, stats: {server.stats}")
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+# load_testing/audiosocket_call_generator.py
+"""Fake Asterisk: opens N concurrent AudioSocket sessions against AudioSocketServer for soak tests.
+
+Each session sends the TYPE_UUID frame, streams 20 ms PCM16 frames on a real-time clock
+(alternating speech-level noise and silence so server VAD produces turns) and reads the
+outbound stream, measuring handshake time, inter-frame jitter, late frames and playback
+underruns. With --server-pid the server's CPU use is sampled from /proc for a per-call figure.
+
+Usage: python load_testing/audiosocket_call_generator.py --calls 50 --duration-s 60 --seed-db [--server-pid 1234]
+Pair with load_testing/realtime_stub_server.py (OPENAI_REALTIME_URL) to keep the test offline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import struct
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from audio_processing_service.audio_socket_handler import (
+    TYPE_UUID, TYPE_AUDIO, TYPE_HANGUP, TARGET_ASTERISK_CHUNK_SIZE_BYTES
+)
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+FRAME_INTERVAL_S = 0.020
+SAMPLES_PER_FRAME = TARGET_ASTERISK_CHUNK_SIZE_BYTES // 2
+# An inter-arrival gap longer than this counts as a late outbound frame
+LATE_FRAME_THRESHOLD_S = 0.030
+LOADTEST_USERNAME = "loadtest"
+
+
+class SessionResult:
+    """Measurements for one fake call."""
+
+    def __init__(self, index: int, asterisk_uuid: str):
+        self.index = index
+        self.asterisk_uuid = asterisk_uuid
+        self.call_id: Optional[int] = None
+        self.connect_ms: Optional[float] = None
+        self.handshake_ms: Optional[float] = None   # UUID frame sent -> first outbound frame (DB lookup + handler registration)
+        self.first_audio_ms: Optional[float] = None  # UUID frame sent -> first non-silent outbound frame
+        self.frames_sent = 0
+        self.max_send_lateness_ms = 0.0
+        self.frames_received = 0
+        self.audio_frames_received = 0
+        self.late_frames = 0
+        self.underruns = 0               # Short silent gaps inside AI speech (playback buffer ran dry)
+        self.interarrival_ms: List[float] = []
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        jitter = np.abs(np.array(self.interarrival_ms) - FRAME_INTERVAL_S * 1000) if self.interarrival_ms else np.zeros(1)
+        return {
+            "index": self.index, "asterisk_uuid": self.asterisk_uuid, "call_id": self.call_id,
+            "connect_ms": self.connect_ms, "handshake_ms": self.handshake_ms, "first_audio_ms": self.first_audio_ms,
+            "frames_sent": self.frames_sent, "frames_received": self.frames_received,
+            "audio_frames_received": self.audio_frames_received, "late_frames": self.late_frames,
+            "underruns": self.underruns, "max_send_lateness_ms": round(self.max_send_lateness_ms, 2),
+            "jitter_mean_ms": round(float(jitter.mean()), 3), "jitter_p99_ms": round(float(np.percentile(jitter, 99)), 3),
+            "jitter_max_ms": round(float(jitter.max()), 3), "error": self.error,
+        }
+
+
+def make_caller_frames(talk_ms: int, pause_ms: int, amplitude: int, seed: int) -> List[bytes]:
+    """One talk/pause cycle of caller audio as ready-to-send AudioSocket frames (header included)."""
+    rng = np.random.default_rng(seed)
+    talk_frames = max(1, talk_ms // 20)
+    pause_frames = max(0, pause_ms // 20)
+    header = struct.pack("!BH", TYPE_AUDIO, TARGET_ASTERISK_CHUNK_SIZE_BYTES)
+    frames = []
+    for _ in range(talk_frames):
+        pcm = np.clip(rng.normal(0, amplitude, SAMPLES_PER_FRAME), -32768, 32767).astype(np.int16)
+        frames.append(header + pcm.tobytes())
+    silence = header + bytes(TARGET_ASTERISK_CHUNK_SIZE_BYTES)
+    frames.extend([silence] * pause_frames)
+    return frames
+
+
+def seed_call_rows(count: int) -> List[tuple]:
+    """Creates a load-test task and `count` calls rows with fresh call_uuids. Returns [(call_id, uuid)]."""
+    from database import db_manager
+    from database.models import CampaignCreate, TaskCreate, CallCreate, CallStatus
+    from datetime import datetime
+
+    db_manager.initialize_database()
+    user = db_manager.get_or_create_user(LOADTEST_USERNAME)
+    if not user:
+        raise RuntimeError("Could not create load-test user")
+    campaign = db_manager.create_campaign(CampaignCreate(
+        user_id=user.id, batch_id=f"loadtest-{uuid.uuid4().hex[:8]}",
+        user_goal_description="AudioSocket soak test"))
+    if not campaign:
+        raise RuntimeError("Could not create load-test campaign")
+    now = datetime.now()
+    task_id = db_manager.create_task(TaskCreate(
+        campaign_id=campaign.id, user_id=user.id,
+        user_task_description="AudioSocket soak test call",
+        generated_agent_prompt="You are a load-test agent. Answer briefly.",
+        phone_number="0000000000", initial_schedule_time=now, next_action_time=now))
+    if not task_id:
+        raise RuntimeError("Could not create load-test task")
+
+    rows = []
+    for attempt in range(1, count + 1):
+        call = db_manager.create_call_attempt(CallCreate(task_id=task_id, attempt_number=attempt,
+                                                         prompt_used="load test", status=CallStatus.ANSWERED))
+        if not call:
+            raise RuntimeError("Could not create load-test call row")
+        asterisk_uuid = str(uuid.uuid4())
+        db_manager.update_call_status(call.id, CallStatus.ANSWERED, call_uuid=asterisk_uuid)
+        rows.append((call.id, asterisk_uuid))
+    logger.info(f"[CallGenerator] Seeded {count} calls rows for task {task_id} (campaign {campaign.id}).")
+    return rows
+
+
+def finish_seeded_calls(call_ids: List[int]):
+    """Marks seeded calls finished so they don't count as active calls afterwards."""
+    from database import db_manager
+    from database.models import CallStatus
+    for call_id in call_ids:
+        db_manager.update_call_status(call_id, CallStatus.COMPLETED_USER_HANGUP, hangup_cause="load test finished")
+
+
+class ProcessCpuSampler:
+    """Reads utime+stime of a process from /proc/<pid>/stat (Linux only)."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks_per_s = os.sysconf("SC_CLK_TCK")
+
+    def cpu_seconds(self) -> float:
+        with open(f"/proc/{self.pid}/stat") as f:
+            # Fields after the parenthesised command name; utime and stime are fields 14 and 15
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / self._ticks_per_s
+
+
+async def trigger_ai_handshake(asterisk_uuid: str):
+    """Publishes the same command CallAttemptHandler sends on answer, so the AI speaks first."""
+    from common.data_models import RedisAIHandshakeCommand
+    redis_client = _shared_redis_client()
+    command = RedisAIHandshakeCommand(asterisk_call_uuid=asterisk_uuid)
+    await redis_client.publish_command(f"audiosocket_server_commands:{asterisk_uuid}", command.model_dump())
+
+
+_redis_client = None
+
+def _shared_redis_client():
+    global _redis_client
+    if _redis_client is None:
+        from common.redis_client import RedisClient
+        _redis_client = RedisClient()
+    return _redis_client
+
+
+async def run_session(result: SessionResult, host: str, port: int, duration_s: float,
+                      caller_frames: List[bytes], underrun_max_gap_frames: int, trigger_ai: bool):
+    loop = asyncio.get_running_loop()
+    t0 = loop.time()
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError as e:
+        result.error = f"connect failed: {e}"
+        return
+    result.connect_ms = (loop.time() - t0) * 1000
+
+    uuid_sent_at = loop.time()
+    writer.write(struct.pack("!BH", TYPE_UUID, 16) + uuid.UUID(result.asterisk_uuid).bytes)
+    await writer.drain()
+
+    stop = asyncio.Event()
+
+    async def receive():
+        last_arrival = None
+        was_audio = False
+        silent_run = 0
+        handshake_seen = False
+        while not stop.is_set():
+            try:
+                header = await reader.readexactly(3)
+                length = struct.unpack("!H", header[1:3])[0]
+                payload = await reader.readexactly(length) if length else b""
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            now = loop.time()
+            if header[0] != TYPE_AUDIO:
+                continue
+            if not handshake_seen:
+                handshake_seen = True
+                result.handshake_ms = (now - uuid_sent_at) * 1000
+                if trigger_ai:
+                    loop.create_task(trigger_ai_handshake(result.asterisk_uuid))
+            result.frames_received += 1
+            if last_arrival is not None:
+                gap = now - last_arrival
+                result.interarrival_ms.append(gap * 1000)
+                if gap > LATE_FRAME_THRESHOLD_S:
+                    result.late_frames += 1
+            last_arrival = now
+
+            is_audio = payload.count(0) != len(payload)
+            if is_audio:
+                result.audio_frames_received += 1
+                if result.first_audio_ms is None:
+                    result.first_audio_ms = (now - uuid_sent_at) * 1000
+                if was_audio and 0 < silent_run <= underrun_max_gap_frames:
+                    result.underruns += 1
+                was_audio = True
+                silent_run = 0
+            elif was_audio:
+                silent_run += 1
+                if silent_run > underrun_max_gap_frames:
+                    was_audio = False  # End of the AI turn, not an underrun
+
+    receive_task = asyncio.create_task(receive())
+    try:
+        # Caller audio on an absolute 20 ms clock, like Asterisk's media thread
+        start = loop.time()
+        frames_total = int(duration_s / FRAME_INTERVAL_S)
+        for i in range(frames_total):
+            if receive_task.done():
+                result.error = result.error or "server closed the connection"
+                break
+            deadline = start + i * FRAME_INTERVAL_S
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                result.max_send_lateness_ms = max(result.max_send_lateness_ms, -delay * 1000)
+            writer.write(caller_frames[i % len(caller_frames)])
+            result.frames_sent += 1
+        writer.write(struct.pack("!BH", TYPE_HANGUP, 0))
+        await writer.drain()
+    except ConnectionError as e:
+        result.error = f"send failed: {e}"
+    finally:
+        await asyncio.sleep(0.2)
+        stop.set()
+        receive_task.cancel()
+        try:
+            await receive_task
+        except asyncio.CancelledError:
+            pass
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def summarize(results: List[SessionResult], wall_s: float, server_cpu_s: Optional[float], generator_cpu_s: float) -> dict:
+    ok = [r for r in results if r.error is None and r.handshake_ms is not None]
+    all_gaps = np.concatenate([np.array(r.interarrival_ms) for r in ok if r.interarrival_ms]) if ok else np.zeros(0)
+    jitter = np.abs(all_gaps - FRAME_INTERVAL_S * 1000) if all_gaps.size else np.zeros(1)
+    handshakes = np.array([r.handshake_ms for r in ok]) if ok else np.zeros(1)
+    summary = {
+        "calls": len(results),
+        "calls_ok": len(ok),
+        "calls_failed": len(results) - len(ok),
+        "handshake_ms_p50": round(float(np.percentile(handshakes, 50)), 1),
+        "handshake_ms_p95": round(float(np.percentile(handshakes, 95)), 1),
+        "handshake_ms_max": round(float(handshakes.max()), 1),
+        "frames_received": int(sum(r.frames_received for r in results)),
+        "late_frames": int(sum(r.late_frames for r in results)),
+        "underruns": int(sum(r.underruns for r in results)),
+        "jitter_ms_mean": round(float(jitter.mean()), 3),
+        "jitter_ms_p99": round(float(np.percentile(jitter, 99)), 3),
+        "jitter_ms_max": round(float(jitter.max()), 3),
+        "generator_max_send_lateness_ms": round(max((r.max_send_lateness_ms for r in results), default=0.0), 2),
+        "generator_cpu_percent": round(100 * generator_cpu_s / wall_s, 1),
+    }
+    if server_cpu_s is not None:
+        summary["server_cpu_percent"] = round(100 * server_cpu_s / wall_s, 1)
+        summary["server_cpu_ms_per_call_second"] = round(1000 * server_cpu_s / max(1, len(ok)) / wall_s, 3)
+    return summary
+
+
+async def run_load(args) -> dict:
+    if args.seed_db:
+        seeded = await asyncio.get_running_loop().run_in_executor(None, seed_call_rows, args.calls)
+    else:
+        seeded = [(None, str(uuid.uuid4())) for _ in range(args.calls)]
+    results = []
+    for index, (call_id, asterisk_uuid) in enumerate(seeded):
+        result = SessionResult(index, asterisk_uuid)
+        result.call_id = call_id
+        results.append(result)
+
+    cpu_sampler = ProcessCpuSampler(args.server_pid) if args.server_pid else None
+    server_cpu_start = cpu_sampler.cpu_seconds() if cpu_sampler else None
+    generator_cpu_start = time.process_time()
+    wall_start = time.monotonic()
+
+    caller_frames = make_caller_frames(args.talk_ms, args.pause_ms, args.amplitude, seed=1)
+    tasks = []
+    for result in results:
+        # Offset each call's talk/pause cycle so turns don't line up across calls
+        offset = (result.index * 7) % len(caller_frames)
+        frames = caller_frames[offset:] + caller_frames[:offset]
+        tasks.append(asyncio.create_task(run_session(result, args.host, args.port, args.duration_s, frames,
+                                                     args.underrun_max_gap_frames, args.trigger_ai)))
+        if args.ramp_s:
+            await asyncio.sleep(args.ramp_s / args.calls)
+    await asyncio.gather(*tasks)
+
+    wall_s = time.monotonic() - wall_start
+    server_cpu_s = cpu_sampler.cpu_seconds() - server_cpu_start if cpu_sampler else None
+    summary = summarize(results, wall_s, server_cpu_s, time.process_time() - generator_cpu_start)
+
+    if args.seed_db:
+        await asyncio.get_running_loop().run_in_executor(None, finish_seeded_calls, [r.call_id for r in results])
+    if _redis_client is not None:
+        await _redis_client.close_async_client()
+    return {"summary": summary, "sessions": [r.to_dict() for r in results]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Open N concurrent fake Asterisk AudioSocket calls against AudioSocketServer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=app_config.AUDIOSOCKET_PORT)
+    parser.add_argument("--calls", type=int, default=10)
+    parser.add_argument("--duration-s", type=float, default=30.0, help="Length of each call")
+    parser.add_argument("--ramp-s", type=float, default=5.0, help="Spread call starts over this many seconds")
+    parser.add_argument("--talk-ms", type=int, default=1500, help="Caller speech burst length")
+    parser.add_argument("--pause-ms", type=int, default=4000, help="Caller silence between bursts")
+    parser.add_argument("--amplitude", type=int, default=3000, help="Caller speech noise level (PCM16 std dev)")
+    parser.add_argument("--underrun-max-gap-frames", type=int, default=5,
+                        help="Silent gaps up to this many frames inside AI speech count as underruns")
+    parser.add_argument("--seed-db", action="store_true", help="Create matching calls rows so the server's UUID lookup succeeds")
+    parser.add_argument("--trigger-ai", action="store_true", help="Publish the AI handshake over Redis once each call is up")
+    parser.add_argument("--server-pid", type=int, help="Server process to sample CPU from (/proc)")
+    parser.add_argument("--json-out", type=Path, help="Write summary and per-session results as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args))
+    for key, value in report["summary"].items():
+        print(f"{key:<34} {value}")
+    failures = [s for s in report["sessions"] if s["error"]]
+    for session in failures[:10]:
+        print(f"session {session['index']} ({session['asterisk_uuid']}): {session['error']}")
+    if args.json_out:
+        args.json_out.write_text(json.dumps(report, indent=2))
+        print(f"Wrote per-session results to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,401 @@
+# load_testing/realtime_stub_server.py
+"""Local stand-in for the OpenAI Realtime websocket API, for offline load and latency testing.
+
+Implements the part of the protocol OpenAIRealtimeClient uses: session.created/update,
+input_audio_buffer.append with a simple energy-based server VAD, response.create,
+audio deltas paced at real-time rate, transcripts and function-call events. Latency,
+jitter, error and disconnect injection are configurable per server.
+
+Usage: python load_testing/realtime_stub_server.py [--port 8765] [--latency-ms 300] [--jitter-ms 20]
+Then point the app at it with OPENAI_REALTIME_URL=ws://127.0.0.1:8765/v1/realtime
+(OPENAI_API_KEY must still be set to any non-empty value).
+"""
+import argparse
+import asyncio
+import base64
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import websockets
+import websockets.exceptions
+
+# --- Path Setup ---
+_project_root = Path(__file__).resolve().parent.parent
+if str(_project_root) not in sys.path:
+    sys.path.insert(0, str(_project_root))
+# --- End Path Setup ---
+
+from config.app_config import app_config
+from common.logger_setup import setup_logger
+from audio_processing_service.g711 import ulaw_decode, ulaw_encode
+
+logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
+
+# Sample rate and bytes per sample for each Realtime audio format
+AUDIO_FORMATS = {"pcm16": (24000, 2), "g711_ulaw": (8000, 1)}
+STUB_TONE_HZ = 440.0
+STUB_TONE_AMPLITUDE = 6000
+STUB_TRANSCRIPT_WORDS = "this is the local realtime stub speaking so the audio pipeline can be measured offline".split()
+
+
+def _new_id(prefix: str) -> str:
+    return f"{prefix}_{uuid.uuid4().hex[:20]}"
+
+
+def _dumps(event: dict) -> str:
+    return json.dumps(event, separators=(",", ":"))
+
+
+class RealtimeStubServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765,
+                 response_audio_s: float = 3.0,
+                 delta_ms: int = 100,
+                 latency_ms: float = 300.0,
+                 jitter_ms: float = 0.0,
+                 error_rate: float = 0.0,
+                 disconnect_rate: float = 0.0,
+                 function_call_every: int = 0,
+                 function_name: str = "end_call",
+                 function_arguments: Optional[dict] = None,
+                 vad_threshold_rms: float = 500.0,
+                 seed: Optional[int] = None):
+        self.host = host
+        self.port = port
+        self.response_audio_s = response_audio_s
+        self.delta_ms = delta_ms
+        self.latency_ms = latency_ms              # Delay from response trigger to the first event (time to first audio)
+        self.jitter_ms = jitter_ms                # Random extra delay (0..jitter) added to each audio delta
+        self.error_rate = error_rate              # Probability a response is answered with an error event instead
+        self.disconnect_rate = disconnect_rate    # Probability the socket is dropped in the middle of a response
+        self.function_call_every = function_call_every  # Every Nth response per session ends with a function call (0 = never)
+        self.function_name = function_name
+        self.function_arguments = function_arguments or {
+            "final_message": "Thank you for your time. Goodbye.",
+            "reason": "Load test call complete",
+            "outcome": "success",
+        }
+        self.vad_threshold_rms = vad_threshold_rms
+        self._random = random.Random(seed)
+        self._server = None
+        self._tone_cache: Dict[str, bytes] = {}
+        self.stats: Dict[str, int] = {
+            "connections": 0,
+            "active_sessions": 0,
+            "responses": 0,
+            "cancelled_responses": 0,
+            "injected_errors": 0,
+            "injected_disconnects": 0,
+            "function_calls": 0,
+            "audio_bytes_in": 0,
+            "audio_bytes_out": 0,
+        }
+
+    async def start(self):
+        self._server = await websockets.serve(self._handle_connection, self.host, self.port, max_size=None)
+        logger.info(f"[RealtimeStub] Listening on ws://{self.host}:{self.port}/v1/realtime")
+
+    async def stop(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        logger.info(f"[RealtimeStub] Stopped. Stats: {self.stats}")
+
+    def tone_chunk(self, audio_format: str) -> bytes:
+        """One delta's worth of audio (a steady tone) in the session's output format, built once per format."""
+        chunk = self._tone_cache.get(audio_format)
+        if chunk is None:
+            sample_rate, _ = AUDIO_FORMATS[audio_format]
+            t = np.arange(sample_rate * self.delta_ms // 1000) / sample_rate
+            pcm = (STUB_TONE_AMPLITUDE * np.sin(2 * np.pi * STUB_TONE_HZ * t)).astype(np.int16)
+            chunk = ulaw_encode(pcm).tobytes() if audio_format == "g711_ulaw" else pcm.tobytes()
+            self._tone_cache[audio_format] = chunk
+        return chunk
+
+    async def _handle_connection(self, websocket, path=None):
+        session = _StubSession(self, websocket)
+        self.stats["connections"] += 1
+        self.stats["active_sessions"] += 1
+        try:
+            await session.run()
+        except websockets.exceptions.ConnectionClosed:
+            pass
+        finally:
+            session.cancel_response()
+            self.stats["active_sessions"] -= 1
+            logger.debug(f"[RealtimeStub:{session.session_id}] Session closed after {session.responses} responses")
+
+
+class _StubSession:
+    """Protocol state for one websocket connection."""
+
+    def __init__(self, server: RealtimeStubServer, websocket):
+        self.server = server
+        self.websocket = websocket
+        self.session_id = _new_id("sess")
+        self.config: dict = {
+            "id": self.session_id,
+            "object": "realtime.session",
+            "modalities": ["audio", "text"],
+            "input_audio_format": "pcm16",
+            "output_audio_format": "pcm16",
+            "turn_detection": {"type": "server_vad", "silence_duration_ms": 500, "prefix_padding_ms": 300},
+            "tools": [],
+        }
+        self.responses = 0
+        self._response_task: Optional[asyncio.Task] = None
+        # Server VAD state, in milliseconds of received input audio
+        self._input_ms = 0.0
+        self._speaking = False
+        self._speech_start_ms = 0.0
+        self._last_voice_ms = 0.0
+        self._item_id: Optional[str] = None
+
+    async def send(self, event: dict):
+        event.setdefault("event_id", _new_id("event"))
+        await self.websocket.send(_dumps(event))
+
+    async def run(self):
+        await self.send({"type": "session.created", "session": self.config})
+        async for message in self.websocket:
+            event = json.loads(message)
+            event_type = event.get("type")
+            if event_type == "input_audio_buffer.append":
+                await self._on_audio_append(event.get("audio", ""))
+            elif event_type == "session.update":
+                self.config.update(event.get("session", {}))
+                await self.send({"type": "session.updated", "session": self.config})
+            elif event_type == "response.create":
+                await self._start_response()
+            elif event_type == "response.cancel":
+                await self._cancel_active_response()
+            elif event_type == "conversation.item.create":
+                item = dict(event.get("item", {}))
+                item.setdefault("id", _new_id("item"))
+                await self.send({"type": "conversation.item.created", "previous_item_id": None, "item": item})
+            elif event_type == "input_audio_buffer.commit":
+                await self._commit_input(speech_end_ms=self._input_ms)
+            elif event_type == "input_audio_buffer.clear":
+                self._speaking = False
+                await self.send({"type": "input_audio_buffer.cleared"})
+            else:
+                await self.send({"type": "error", "error": {"type": "invalid_request_error", "code": "unknown_event",
+                                                           "message": f"Stub does not implement '{event_type}'"}})
+
+    # --- Input audio and server VAD ---
+
+    async def _on_audio_append(self, audio_b64: str):
+        audio = base64.b64decode(audio_b64)
+        self.server.stats["audio_bytes_in"] += len(audio)
+        input_format = self.config.get("input_audio_format", "pcm16")
+        sample_rate, sample_width = AUDIO_FORMATS.get(input_format, AUDIO_FORMATS["pcm16"])
+        if input_format == "g711_ulaw":
+            samples = ulaw_decode(audio)
+        else:
+            samples = np.frombuffer(audio, dtype=np.int16)
+        if samples.size == 0:
+            return
+        chunk_ms = 1000.0 * samples.size / sample_rate
+        rms = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+        chunk_start_ms = self._input_ms
+        self._input_ms += chunk_ms
+
+        turn_detection = self.config.get("turn_detection") or {}
+        if turn_detection.get("type") != "server_vad":
+            return
+        if rms >= self.server.vad_threshold_rms:
+            self._last_voice_ms = self._input_ms
+            if not self._speaking:
+                self._speaking = True
+                self._speech_start_ms = chunk_start_ms
+                self._item_id = _new_id("item")
+                await self.send({"type": "input_audio_buffer.speech_started", "audio_start_ms": int(chunk_start_ms), "item_id": self._item_id})
+                # Barge-in: caller speech interrupts the AI turn, as with the real API
+                await self._cancel_active_response()
+        elif self._speaking and self._input_ms - self._last_voice_ms >= turn_detection.get("silence_duration_ms", 500):
+            await self._commit_input(speech_end_ms=self._last_voice_ms)
+            await self._start_response()
+
+    async def _commit_input(self, speech_end_ms: float):
+        item_id = self._item_id or _new_id("item")
+        self._speaking = False
+        self._item_id = None
+        await self.send({"type": "input_audio_buffer.speech_stopped", "audio_end_ms": int(speech_end_ms), "item_id": item_id})
+        await self.send({"type": "input_audio_buffer.committed", "previous_item_id": None, "item_id": item_id})
+        await self.send({"type": "conversation.item.created", "previous_item_id": None,
+                         "item": {"id": item_id, "object": "realtime.item", "type": "message", "role": "user", "content": [{"type": "input_audio"}]}})
+        spoken_ms = int(speech_end_ms - self._speech_start_ms)
+        await self.send({"type": "conversation.item.input_audio_transcription.completed", "item_id": item_id,
+                         "content_index": 0, "transcript": f"[stub] caller speech, {spoken_ms} ms"})
+
+    # --- Responses ---
+
+    async def _start_response(self):
+        if self._response_task and not self._response_task.done():
+            await self.send({"type": "error", "error": {"type": "invalid_request_error", "code": "conversation_already_has_active_response",
+                                                       "message": "Conversation already has an active response"}})
+            return
+        self._response_task = asyncio.create_task(self._stream_response())
+
+    async def _cancel_active_response(self):
+        if self._response_task and not self._response_task.done():
+            self._response_task.cancel()
+            self.server.stats["cancelled_responses"] += 1
+
+    def cancel_response(self):
+        if self._response_task and not self._response_task.done():
+            self._response_task.cancel()
+
+    async def _stream_response(self):
+        server = self.server
+        self.responses += 1
+        server.stats["responses"] += 1
+        response_id = _new_id("resp")
+        item_id = _new_id("item")
+        status = "completed"
+        try:
+            await asyncio.sleep(server.latency_ms / 1000.0)
+
+            if server.error_rate and server._random.random() < server.error_rate:
+                server.stats["injected_errors"] += 1
+                status = "failed"
+                await self.send({"type": "error", "error": {"type": "server_error", "code": "stub_injected_error",
+                                                           "message": "Injected by realtime_stub_server"}})
+                return
+
+            await self.send({"type": "response.created", "response": {"id": response_id, "object": "realtime.response", "status": "in_progress", "output": []}})
+            await self.send({"type": "response.output_item.added", "response_id": response_id, "output_index": 0,
+                             "item": {"id": item_id, "object": "realtime.item", "type": "message", "role": "assistant", "content": []}})
+            await self.send({"type": "response.content_part.added", "response_id": response_id, "item_id": item_id,
+                             "output_index": 0, "content_index": 0, "part": {"type": "audio", "transcript": ""}})
+
+            output_format = self.config.get("output_audio_format", "pcm16")
+            delta_b64 = base64.b64encode(server.tone_chunk(output_format)).decode("ascii")
+            delta_bytes = len(server.tone_chunk(output_format))
+            num_deltas = max(1, int(server.response_audio_s * 1000 / server.delta_ms))
+            words_per_delta = max(1, len(STUB_TRANSCRIPT_WORDS) // num_deltas)
+            disconnect_at = server._random.randrange(num_deltas) if server.disconnect_rate and server._random.random() < server.disconnect_rate else -1
+            transcript = []
+
+            # Paced against absolute deadlines so the stream runs at real-time rate regardless of send cost
+            start = time.monotonic()
+            for i in range(num_deltas):
+                deadline = start + i * server.delta_ms / 1000.0
+                if server.jitter_ms:
+                    deadline += server._random.uniform(0.0, server.jitter_ms) / 1000.0
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if i == disconnect_at:
+                    server.stats["injected_disconnects"] += 1
+                    await self.websocket.close(code=1011, reason="Injected by realtime_stub_server")
+                    return
+                await self.send({"type": "response.audio.delta", "response_id": response_id, "item_id": item_id,
+                                 "output_index": 0, "content_index": 0, "delta": delta_b64})
+                server.stats["audio_bytes_out"] += delta_bytes
+                words = STUB_TRANSCRIPT_WORDS[i * words_per_delta:(i + 1) * words_per_delta]
+                if words:
+                    text = " ".join(words) + " "
+                    transcript.append(text)
+                    await self.send({"type": "response.audio_transcript.delta", "response_id": response_id, "item_id": item_id,
+                                     "output_index": 0, "content_index": 0, "delta": text})
+
+            full_transcript = "".join(transcript).strip()
+            await self.send({"type": "response.audio.done", "response_id": response_id, "item_id": item_id, "output_index": 0, "content_index": 0})
+            await self.send({"type": "response.audio_transcript.done", "response_id": response_id, "item_id": item_id,
+                             "output_index": 0, "content_index": 0, "transcript": full_transcript})
+            await self.send({"type": "response.content_part.done", "response_id": response_id, "item_id": item_id,
+                             "output_index": 0, "content_index": 0, "part": {"type": "audio", "transcript": full_transcript}})
+            await self.send({"type": "response.output_item.done", "response_id": response_id, "output_index": 0,
+                             "item": {"id": item_id, "object": "realtime.item", "type": "message", "role": "assistant", "status": "completed"}})
+
+            if server.function_call_every and self.responses % server.function_call_every == 0:
+                await self._send_function_call(response_id)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            if status == "cancelled" or not self.websocket_closed():
+                try:
+                    await self.send({"type": "response.done", "response": {"id": response_id, "object": "realtime.response", "status": status}})
+                    if status == "completed":
+                        await self.send({"type": "rate_limits.updated", "rate_limits": [
+                            {"name": "requests", "limit": 10000, "remaining": 9999, "reset_seconds": 0.006},
+                            {"name": "tokens", "limit": 2000000, "remaining": 1999000, "reset_seconds": 0.03}]})
+                except websockets.exceptions.ConnectionClosed:
+                    pass
+
+    async def _send_function_call(self, response_id: str):
+        server = self.server
+        server.stats["function_calls"] += 1
+        item_id = _new_id("item")
+        call_id = _new_id("call")
+        arguments = json.dumps(server.function_arguments)
+        await self.send({"type": "response.output_item.added", "response_id": response_id, "output_index": 1,
+                         "item": {"id": item_id, "object": "realtime.item", "type": "function_call", "status": "in_progress",
+                                  "name": server.function_name, "call_id": call_id, "arguments": ""}})
+        await self.send({"type": "response.function_call_arguments.delta", "response_id": response_id, "item_id": item_id,
+                         "output_index": 1, "call_id": call_id, "delta": arguments})
+        await self.send({"type": "response.function_call_arguments.done", "response_id": response_id, "item_id": item_id,
+                         "output_index": 1, "call_id": call_id, "name": server.function_name, "arguments": arguments})
+        await self.send({"type": "response.output_item.done", "response_id": response_id, "output_index": 1,
+                         "item": {"id": item_id, "object": "realtime.item", "type": "function_call", "status": "completed",
+                                  "name": server.function_name, "call_id": call_id, "arguments": arguments}})
+
+    def websocket_closed(self) -> bool:
+        # websockets >= 14 exposes `state`; the legacy protocol has `closed`
+        closed = getattr(self.websocket, "closed", None)
+        if closed is not None:
+            return bool(closed)
+        return self.websocket.state.name in ("CLOSING", "CLOSED")
+
+
+async def _run_until_interrupted(server: RealtimeStubServer, stats_interval_s: float):
+    await server.start()
+    try:
+        while True:
+            await asyncio.sleep(stats_interval_s)
+            logger.info(f"[RealtimeStub] Stats: {server.stats}")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OpenAI Realtime stand-in for offline load/latency tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--response-audio-s", type=float, default=3.0, help="Seconds of audio per AI response")
+    parser.add_argument("--delta-ms", type=int, default=100, help="Audio per response.audio.delta event")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Delay before each response starts")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay per audio delta")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses replaced by an error event")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0, help="Fraction of responses that drop the socket midway")
+    parser.add_argument("--function-call-every", type=int, default=0, help="Every Nth response per session ends with a function call")
+    parser.add_argument("--function-name", default="end_call")
+    parser.add_argument("--function-arguments", type=json.loads, default=None, help="JSON arguments for the function call")
+    parser.add_argument("--vad-threshold-rms", type=float, default=500.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--stats-interval-s", type=float, default=30.0)
+    args = parser.parse_args()
+
+    server = RealtimeStubServer(host=args.host, port=args.port,
+                                response_audio_s=args.response_audio_s, delta_ms=args.delta_ms,
+                                latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                                error_rate=args.error_rate, disconnect_rate=args.disconnect_rate,
+                                function_call_every=args.function_call_every, function_name=args.function_name,
+                                function_arguments=args.function_arguments,
+                                vad_threshold_rms=args.vad_threshold_rms, seed=args.seed)
+    try:
+        asyncio.run(_run_until_interrupted(server, args.stats_interval_s))
+    except KeyboardInterrupt:
+        print("\nRealtime stub stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,11 +20,13 @@ logger = setup_logger("MainApp", level_str=app_config.LOG_LEVEL)
 
 # Import other components needed for services
 from database.db_manager import initialize_database
+from database.db_writer import db_writer
 from common.redis_client import RedisClient
 from call_processor_service.asterisk_ami_client import AsteriskAmiClient
 from call_processor_service.call_initiator_svc import CallInitiatorService
 from task_manager.task_scheduler_svc import TaskSchedulerService
 from audio_processing_service.audio_socket_server import AudioSocketServer # Added
+from audio_processing_service.realtime_session_pool import realtime_session_pool
 from task_manager.orchestrator_svc import OrchestratorService  # Added for HITL
 # --- Global Service Instances ---
 # These will be initialized by start_background_services
@@ -141,10 +143,12 @@ async def actual_shutdown_services():
         except Exception as e:
             logger.error(f"actual_shutdown_services: Error stopping AudioSocketServer: {e}", exc_info=True)
             
+    await realtime_session_pool.close_all()
     if ami_client:
         await ami_client.close()
     if redis_client:
         await redis_client.close_async_client()
+    await db_writer.stop() # Flush queued status/transcript writes
     logger.info("actual_shutdown_services: Background services shutdown process initiated.")
     await asyncio.sleep(1) # Shorter sleep, gather in lifespan will wait for task.
     logger.info("actual_shutdown_services: Background services shutdown complete.")
@@ -13,6 +13,7 @@ if str(_project_root) not in sys.path:
 
 from common.logger_setup import setup_logger
 from common.redis_client import RedisClient
+from common.scheduler_events import scheduler_events, EVENT_TASK_SCHEDULED
 from database.db_manager import (
     get_call_by_id, get_task_by_id, update_task_status, 
     get_db_connection, update_call_status
@@ -78,7 +79,8 @@ class PostCallAnalyzerService:
         try:
             # Subscribe to call completion events
             pattern = "call_completed:*"
-            await self.redis_client.subscribe_to_channel(pattern, self._handle_call_completion)
+            # Server-wide pattern: every completed call is analysed in its own task, not queued behind the dispatcher's workers
+            await self.redis_client.subscribe_to_channel(pattern, self._handle_call_completion, ordered=False)
             
         except asyncio.CancelledError:
             logger.info("Post-call analyzer listener cancelled")
@@ -252,6 +254,7 @@ class PostCallAnalyzerService:
                 ))
                 
                 conn.commit()
+                await scheduler_events.notify(EVENT_TASK_SCHEDULED, next_retry_time, redis_client=self.redis_client)
                 
                 await self._log_task_event(
                     task.id,
@@ -18,6 +18,7 @@ from database.models import CampaignCreate, TaskCreate, Campaign, TaskStatus
 from common.logger_setup import setup_logger
 from common.redis_client import RedisClient
 from common.data_models import RedisRequestUserInfoCommand
+from common.scheduler_events import scheduler_events, EVENT_TASKS_CREATED, EVENT_TASK_SCHEDULED
 
 logger = setup_logger(__name__)
 
@@ -162,6 +163,7 @@ class OrchestratorService:
                     # Check if it's the success structure from our _schedule_call_batch tool
                     elif "status_message" in parsed_data and "campaign_id" in parsed_data: 
                         logger.info(f"User ID {self.user_id}: Orchestration successful. Payload: {parsed_data}")
+                        await scheduler_events.notify(EVENT_TASKS_CREATED, redis_client=self.redis_client) # New tasks are due now
                         return {
                             "status": "success", 
                             "message": parsed_data['status_message'],
@@ -226,7 +228,8 @@ class OrchestratorService:
         try:
             # Use the existing subscribe_to_channel method
             pattern = "call_commands:*"
-            await self.redis_client.subscribe_to_channel(pattern, self._redis_message_callback)
+            # Server-wide pattern: commands for different calls must not wait on each other or be dropped on overflow
+            await self.redis_client.subscribe_to_channel(pattern, self._redis_message_callback, ordered=False)
                     
         except asyncio.CancelledError:
             logger.info(f"HITL listener cancelled for user {self.user_id}")
@@ -455,11 +458,13 @@ class OrchestratorService:
                     
                     # Schedule new call with the provided information
                     from database.db_manager import update_task_status
+                    next_action_time = datetime.now() + timedelta(minutes=1)  # Schedule for 1 minute from now
                     update_task_status(
                         task_id=task_id,
                         status=TaskStatus.PENDING,
-                        next_action_time=datetime.now() + timedelta(minutes=1)  # Schedule for 1 minute from now
+                        next_action_time=next_action_time
                     )
+                    await scheduler_events.notify(EVENT_TASK_SCHEDULED, next_action_time, redis_client=self.redis_client)
                     
                     logger.info(f"Task creator response received after timeout for task {task_id}, new call scheduled")
                 
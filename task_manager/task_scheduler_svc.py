@@ -1,10 +1,11 @@
 # task_manager/task_scheduler_svc.py
 
 import asyncio
+import heapq
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Set
 
 # --- Path Setup ---
 _project_root = Path(__file__).resolve().parent.parent
@@ -14,19 +15,61 @@ if str(_project_root) not in sys.path:
 
 from config.app_config import app_config
 from database import db_manager # db_manager itself
+from database.db_writer import db_writer
 from database.models import Task, TaskStatus
 from common.logger_setup import setup_logger
+from common.scheduler_events import scheduler_events, TASK_SCHEDULER_EVENTS_CHANNEL
 from call_processor_service.call_initiator_svc import CallInitiatorService
 
 logger = setup_logger(__name__, level_str=app_config.LOG_LEVEL)
 
+UPCOMING_DUE_TIMES_LIMIT = 32 # next_action_time values loaded into the timer heap per refresh
+
 class TaskSchedulerService:
+    """
+    Claims due tasks whenever there is something to do rather than on a fixed poll.
+
+    The loop sleeps until the earliest time in a min-heap of upcoming next_action_time values
+    (refreshed from the idx_tasks_due index after every cycle), or until scheduler_events wakes it:
+    a call ended (a slot is free) or a task was created or rescheduled, in this process or another
+    one via the Redis channel. TASK_SCHEDULER_POLL_INTERVAL_S only caps the sleep, as a safety net
+    for changes nobody signalled.
+    """
     def __init__(self, call_initiator_service: CallInitiatorService):
         self.call_initiator_service = call_initiator_service
         self.poll_interval_s: int = app_config.TASK_SCHEDULER_POLL_INTERVAL_S
         self.is_running = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None # Store the loop
-        logger.info(f"TaskSchedulerService initialized. Poll interval: {self.poll_interval_s}s")
+        self._wake_event: Optional[asyncio.Event] = None
+        self._due_times: List[datetime] = [] # Min-heap of upcoming next_action_time values
+        self._signalled_due_times: Set[datetime] = set() # Pushed by notify() and not yet seen in a DB refresh
+        self._events_listener_task: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {
+            "cycles": 0,
+            "event_wakeups": 0,
+            "timer_wakeups": 0,
+            "safety_polls": 0,
+            "tasks_claimed": 0,
+        }
+        logger.info(f"TaskSchedulerService initialized. Safety-net poll interval: {self.poll_interval_s}s")
+
+    def notify(self, reason: str, next_action_time: Optional[datetime] = None):
+        """scheduler_events listener: run a cycle now, or by `next_action_time` if that is in the future."""
+        if next_action_time and next_action_time > datetime.now():
+            heapq.heappush(self._due_times, next_action_time)
+            self._signalled_due_times.add(next_action_time)
+            if self._due_times[0] is not next_action_time:
+                return # Already waking up earlier than that
+        logger.debug(f"TaskSchedulerService woken: {reason}")
+        if self._wake_event:
+            self._wake_event.set()
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "upcoming_due_times": len(self._due_times),
+            "next_due_time": self._due_times[0].isoformat() if self._due_times else None,
+        }
 
     async def _process_due_tasks(self):
         logger.debug("Polling for due tasks...")
@@ -34,62 +77,24 @@ class TaskSchedulerService:
             self._loop = asyncio.get_running_loop()
 
         try:
-            # Run the synchronous db_manager.get_due_tasks in an executor
-            due_tasks: List[Task] = await self._loop.run_in_executor(
-                None, # Uses the default ThreadPoolExecutor
-                db_manager.get_due_tasks, # The function to call
-                None, # arg1 for get_due_tasks (user_id)
-                app_config.MAX_CONCURRENT_CALLS * 2 # arg2 for get_due_tasks (max_tasks)
-            )
-
-            if not due_tasks:
+            free_slots = await self.call_initiator_service.get_available_call_slots()
+            if free_slots <= 0:
+                logger.debug("CallInitiatorService at capacity. Not claiming tasks this cycle.")
+                return
+
+            # One statement moves up to free_slots due tasks to QUEUED_FOR_CALL (DND numbers are cancelled in
+            # the same transaction), so nothing else can pick the same task and no per-task DB hops are needed
+            claimed_tasks: List[Task] = await db_writer.submit(db_manager.claim_due_tasks, free_slots)
+
+            if not claimed_tasks:
                 logger.debug("No due tasks found.")
                 return
 
-            logger.info(f"Found {len(due_tasks)} candidate due tasks to process.")
+            logger.info(f"Claimed {len(claimed_tasks)} due tasks for {free_slots} free call slots.")
+            self.stats["tasks_claimed"] += len(claimed_tasks)
 
-            for task in due_tasks:
-                if not await self.call_initiator_service.can_initiate_new_call():
-                    logger.info(f"CallInitiatorService at capacity. Will retry task ID {task.id} in next poll cycle.")
-                    break 
-                
-                logger.info(f"Processing task ID: {task.id} for User ID: {task.user_id} (Campaign ID: {task.campaign_id})")
-
-                # Run synchronous db_manager.is_on_dnd_list in executor
-                is_dnd = await self._loop.run_in_executor(
-                    None,
-                    db_manager.is_on_dnd_list,
-                    task.phone_number,
-                    task.user_id
-                )
-
-                if is_dnd:
-                    logger.info(f"Task ID: {task.id} - Phone {task.phone_number} on DND for user {task.user_id}. Cancelling.")
-                    # Run synchronous db_manager.update_task_status in executor
-                    await self._loop.run_in_executor(
-                        None,
-                        db_manager.update_task_status, # Function
-                        task.id,                      # arg1: task_id
-                        TaskStatus.CANCELLED_DND,     # arg2: status
-                        None,                         # arg3: next_action_time (default None)
-                        "Cancelled: Phone number on DND list." # arg4: overall_conclusion
-                        # increment_attempt_count is False by default
-                    )
-                    continue
-
-                # Run synchronous db_manager.update_task_status in executor
-                status_updated = await self._loop.run_in_executor(
-                    None,
-                    db_manager.update_task_status,
-                    task.id,
-                    TaskStatus.QUEUED_FOR_CALL
-                )
-
-                if not status_updated:
-                    logger.warning(f"Task ID: {task.id} - Failed to update status to '{TaskStatus.QUEUED_FOR_CALL.value}'. Skipping this cycle.")
-                    continue
-                
-                logger.info(f"Task ID: {task.id} - Status updated to '{TaskStatus.QUEUED_FOR_CALL.value}'. Dispatching to CallInitiatorService.")
+            for task in claimed_tasks:
+                logger.info(f"Task ID: {task.id} - Dispatching to CallInitiatorService (User ID: {task.user_id}, Campaign ID: {task.campaign_id}).")
                 
                 initiation_started = await self.call_initiator_service.initiate_call_for_task(task)
                 
@@ -97,9 +102,7 @@ class TaskSchedulerService:
                     logger.info(f"Task ID: {task.id} - Call initiation process started by CallInitiatorService.")
                 else:
                     logger.warning(f"Task ID: {task.id} - CallInitiatorService did not start initiation. Reverting status.")
-                    # Run synchronous db_manager.update_task_status in executor
-                    await self._loop.run_in_executor(
-                        None,
+                    await db_writer.submit(
                         db_manager.update_task_status,
                         task.id,
                         TaskStatus.PENDING # Revert to PENDING
@@ -108,22 +111,70 @@ class TaskSchedulerService:
         except Exception as e:
             logger.error(f"Error during task processing in TaskSchedulerService: {e}", exc_info=True)
 
+    async def _refresh_due_times(self):
+        upcoming = await self._loop.run_in_executor(None, db_manager.get_upcoming_task_due_times, UPCOMING_DUE_TIMES_LIMIT)
+        now = datetime.now()
+        # The heap is rebuilt from the DB each time; only signalled times the query did not return
+        # (e.g. written by another process after the read) are carried over, so it stays deduplicated
+        upcoming_set = set(upcoming)
+        self._signalled_due_times = {due for due in self._signalled_due_times if due > now and due not in upcoming_set}
+        self._due_times = list(upcoming_set | self._signalled_due_times)
+        heapq.heapify(self._due_times)
+
+    async def _wait_for_next_cycle(self):
+        now = datetime.now()
+        while self._due_times and self._due_times[0] <= now:
+            heapq.heappop(self._due_times)
+        timeout_s = float(self.poll_interval_s)
+        timer_due = bool(self._due_times) and (self._due_times[0] - now).total_seconds() < timeout_s
+        if timer_due:
+            timeout_s = max(0.0, (self._due_times[0] - now).total_seconds())
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=timeout_s)
+            self.stats["event_wakeups"] += 1
+        except asyncio.TimeoutError:
+            self.stats["timer_wakeups" if timer_due else "safety_polls"] += 1
+
+    async def _listen_for_remote_events(self):
+        redis_client = self.call_initiator_service.redis_client
+        try:
+            await redis_client.subscribe_to_channel(TASK_SCHEDULER_EVENTS_CHANNEL, scheduler_events.handle_redis_message)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"TaskSchedulerService: Redis listener for {TASK_SCHEDULER_EVENTS_CHANNEL} failed: {e}. Relying on local events and polling.", exc_info=True)
+
     async def run_scheduler_loop(self):
         self.is_running = True
         self._loop = asyncio.get_running_loop() # Get loop when scheduler starts
+        self._wake_event = asyncio.Event()
+        scheduler_events.add_listener(self.notify)
+        if self.call_initiator_service.redis_client:
+            self._events_listener_task = asyncio.create_task(self._listen_for_remote_events())
         logger.info("TaskSchedulerService loop started.")
         await asyncio.sleep(5) 
-        while self.is_running:
-            try:
-                await self._process_due_tasks()
-            except Exception as e:
-                logger.error(f"Critical error in TaskSchedulerService loop: {e}", exc_info=True)
-                await asyncio.sleep(self.poll_interval_s * 2)
-            
-            if self.is_running:
-                await asyncio.sleep(self.poll_interval_s)
+        try:
+            while self.is_running:
+                # Cleared before the cycle so an event that arrives while it runs triggers another one
+                self._wake_event.clear()
+                try:
+                    self.stats["cycles"] += 1
+                    await self._process_due_tasks()
+                    await self._refresh_due_times()
+                except Exception as e:
+                    logger.error(f"Critical error in TaskSchedulerService loop: {e}", exc_info=True)
+                    await asyncio.sleep(self.poll_interval_s * 2)
+
+                if self.is_running:
+                    await self._wait_for_next_cycle()
+        finally:
+            scheduler_events.remove_listener(self.notify)
+            if self._events_listener_task and not self._events_listener_task.done():
+                self._events_listener_task.cancel()
         logger.info("TaskSchedulerService loop stopped.")
 
     def stop_scheduler_loop(self):
         logger.info("TaskSchedulerService stop requested.")
-        self.is_running = False
\ No newline at end of file
+        self.is_running = False
+        if self._wake_event:
+            self._wake_event.set()
@@ -0,0 +1,48 @@
+# tests/test_call_rate_limiter.py
+import asyncio
+
+from call_processor_service.call_rate_limiter import CallRateLimiter
+
+
+def test_acquire_serves_waiters_in_arrival_order():
+    limiter = CallRateLimiter(limits={"trunk": (50.0, 1), "campaign": (0.0, 0.0), "user": (0.0, 0.0)})
+    served = []
+
+    async def call(index: int):
+        await limiter.acquire("PJSIP/trunk", campaign_id=1, user_id=1)
+        served.append(index)
+
+    async def run():
+        tasks = []
+        for index in range(6):
+            tasks.append(asyncio.create_task(call(index)))
+            await asyncio.sleep(0) # Each caller joins the queue before the next one arrives
+        await asyncio.gather(*tasks)
+
+    asyncio.run(run())
+    assert served == list(range(6))
+    assert limiter.stats["acquired"] == 6
+    assert limiter.stats["delayed"] == 5
+
+
+def test_cancelled_waiter_passes_the_turn_on():
+    limiter = CallRateLimiter(limits={"trunk": (20.0, 1), "campaign": (20.0, 1), "user": (0.0, 0.0)})
+    served = []
+
+    async def call(index: int, campaign_id: int):
+        await limiter.acquire("PJSIP/trunk", campaign_id=campaign_id)
+        served.append(index)
+
+    async def run():
+        await limiter.acquire("PJSIP/trunk", campaign_id=1) # Empties the trunk bucket
+        first = asyncio.create_task(call(1, 1))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(call(2, 2))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.wait_for(second, timeout=1.0)
+        buckets = limiter.get_stats()["buckets"]
+        assert all(bucket["waiting"] == 0 for bucket in buckets)
+
+    asyncio.run(run())
+    assert served == [2]
@@ -0,0 +1,41 @@
+# tests/test_g711.py
+import warnings
+
+import numpy as np
+import pytest
+
+from audio_processing_service.g711 import ULAW_DECODE_TABLE, ULAW_ENCODE_TABLE, ulaw_decode, ulaw_encode
+
+# (int16 sample, μ-law code) pairs from the G.711 reference encoder (audioop.lin2ulaw), including
+# the negative values just below each step that rounding toward zero used to encode one code off
+ULAW_REFERENCE = [
+    (0, 0xFF), (1, 0xFF), (3, 0xFF), (4, 0xFE), (100, 0xF2), (1000, 0xCE), (4095, 0xAF), (8000, 0xA0),
+    (16383, 0x8F), (32635, 0x80), (32767, 0x80), (-1, 0x7E), (-2, 0x7E), (-3, 0x7E), (-4, 0x7E),
+    (-5, 0x7E), (-9, 0x7D), (-11, 0x7D), (-17, 0x7C), (-25, 0x7B), (-100, 0x72), (-1000, 0x4E),
+    (-4096, 0x2F), (-8000, 0x20), (-16384, 0x0F), (-28539, 0x03), (-29561, 0x02), (-30585, 0x01),
+    (-31611, 0x00), (-32635, 0x00), (-32768, 0x00),
+]
+
+
+def test_ulaw_encode_matches_reference_table():
+    samples = np.array([sample for sample, _ in ULAW_REFERENCE], dtype=np.int16)
+    expected = np.array([code for _, code in ULAW_REFERENCE], dtype=np.uint8)
+    assert np.array_equal(ulaw_encode(samples), expected)
+
+
+def test_ulaw_round_trip_is_stable():
+    decoded = ulaw_decode(bytes(range(256)))
+    # Every decoded level encodes back to a code that decodes to the same level
+    assert np.array_equal(ulaw_decode(ulaw_encode(decoded).tobytes()), decoded)
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16)
+    once = ulaw_decode(ulaw_encode(samples).tobytes())
+    assert np.array_equal(ulaw_decode(ulaw_encode(once).tobytes()), once)
+
+
+def test_ulaw_tables_are_bit_exact_with_audioop():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        audioop = pytest.importorskip("audioop") # Removed from the standard library in Python 3.13
+    samples = np.arange(65536, dtype=np.uint16).view(np.int16)
+    assert np.array_equal(ULAW_ENCODE_TABLE, np.frombuffer(audioop.lin2ulaw(samples.tobytes(), 2), dtype=np.uint8))
+    assert np.array_equal(ULAW_DECODE_TABLE, np.frombuffer(audioop.ulaw2lin(bytes(range(256)), 2), dtype=np.int16))
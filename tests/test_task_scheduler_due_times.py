@@ -0,0 +1,27 @@
+# tests/test_task_scheduler_due_times.py
+import asyncio
+from datetime import datetime, timedelta
+
+from task_manager import task_scheduler_svc
+from task_manager.task_scheduler_svc import TaskSchedulerService, UPCOMING_DUE_TIMES_LIMIT
+
+
+def test_refresh_due_times_stays_bounded(monkeypatch):
+    base = datetime.now() + timedelta(hours=1)
+    upcoming = [base + timedelta(minutes=i) for i in range(UPCOMING_DUE_TIMES_LIMIT)]
+    monkeypatch.setattr(task_scheduler_svc.db_manager, "get_upcoming_task_due_times", lambda limit, after=None: list(upcoming))
+
+    scheduler = TaskSchedulerService(call_initiator_service=None)
+    signalled = base + timedelta(days=1) # Not (yet) returned by the DB query
+    scheduler.notify("task_scheduled", signalled)
+    scheduler.notify("task_scheduled", upcoming[0])
+
+    async def refresh_many():
+        scheduler._loop = asyncio.get_running_loop()
+        for _ in range(10):
+            await scheduler._refresh_due_times()
+
+    asyncio.run(refresh_many())
+    assert len(scheduler._due_times) == UPCOMING_DUE_TIMES_LIMIT + 1
+    assert sorted(scheduler._due_times) == sorted(upcoming + [signalled])
+    assert scheduler.get_stats()["upcoming_due_times"] == UPCOMING_DUE_TIMES_LIMIT + 1
@@ -21,6 +21,7 @@ from database.models import TaskStatus
 from common.data_models import ChatInteractionRequest, CampaignExecutionRequest # These are the key Pydantic models
 from common.logger_setup import setup_logger
 from llm_integrations.openai_audio_client import OpenAIAudioClient
+from call_processor_service.call_rate_limiter import call_rate_limiter
 
 logger = setup_logger(__name__) # Sets up a logger specific to this routes_api module
 router = APIRouter()
@@ -252,6 +253,31 @@ async def get_all_users():
         logger.error(f"Error getting users: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@router.get("/call_rate_limits")
+async def get_call_rate_limits():
+    """Configured call pacing limits, token bucket levels and how many calls are waiting for a token."""
+    return {"success": True, "call_rate_limits": call_rate_limiter.get_stats()}
+
+@router.get("/ami_pool")
+async def get_ami_pool():
+    """AMI connection pool health: per-session state, Ping round trip and outstanding actions (queue depth)."""
+    import main # The running services live in main.py's module globals
+    if main.ami_client is None:
+        raise HTTPException(status_code=503, detail="AMI client not started")
+    return {"success": True, "ami_pool": main.ami_client.get_stats()}
+
+@router.get("/redis_stats")
+async def get_redis_stats():
+    """Redis connection health (heartbeat round trip, failures, reconnects) and per-subscription dispatch queues."""
+    import main # The running services live in main.py's module globals
+    if main.redis_client is None:
+        raise HTTPException(status_code=503, detail="Redis client not started")
+    return {
+        "success": True,
+        "health": main.redis_client.get_health_stats(),
+        "subscriptions": main.redis_client.get_subscription_stats(),
+    }
+
 @router.get("/tasks")
 async def get_tasks(
     user_id: Optional[int] = Query(None, description="User ID to filter tasks"),